@@ -0,0 +1,72 @@
+"""
+compares html_to_text with the previous regex based remove_html_tags on sectionData payloads.
+
+usage:
+    python -m benchmarks.html_to_text_benchmark                      # built-in sample payload
+    python -m benchmarks.html_to_text_benchmark --articles articles.json --limit 50
+        # fetches the real sectionData of the first 50 saved articles from the gov.il content API.
+"""
+import argparse
+import json
+import logging
+import re
+import timeit
+from scrapers.news.news_data.data_fetcher import DataFetcher
+from utils import html_to_text
+
+SAMPLE_SECTION_DATA = (
+    '<div class="rich-text"><p dir="ltr">The Ministry of Health announces&nbsp;updated guidelines for the '
+    '&quot;Green Pass&quot; program&#8203;.</p><p><strong>Main points:</strong></p><ul><li>Applies from '
+    '01.01.2024&nbsp;&ndash; until further notice</li><li>Details at <a href="https://www.gov.il">gov.il</a>'
+    '</li></ul><table><tr><th>Region</th><th>Status</th></tr><tr><td>North</td><td>Open</td></tr></table>'
+    '<style>.rich-text p { margin: 0; }</style><script>window.dataLayer = window.dataLayer || [];</script>'
+    '<p>For more information:<br/>call *5400</p></div>'
+) * 20
+
+
+def regex_remove_html_tags(html_content):
+    """the previous implementation of utils.remove_html_tags."""
+    return re.sub(r'<[^>]+>', '', html_content)
+
+
+def load_payloads(articles_file, limit):
+    """fetches the raw sectionData of the saved articles."""
+    with open(articles_file, 'r', encoding='utf-8') as f:
+        articles = json.load(f)[:limit]
+
+    data_fetcher = DataFetcher(logging.getLogger(__name__))
+    payloads = []
+    for article in articles:
+        content = data_fetcher.fetch_article_content(article['url'])
+        html_contents = content.get('contentMain', {}).get('htmlContents', []) if content else []
+        if html_contents and html_contents[0].get('sectionData'):
+            payloads.append(html_contents[0]['sectionData'])
+
+    return payloads
+
+
+def run(payloads, repeat):
+    total_bytes = sum(len(payload) for payload in payloads)
+    print(f"{len(payloads)} payloads, {total_bytes / 1024:.1f} KB, {repeat} rounds")
+
+    for name, function in (("regex", regex_remove_html_tags), ("html_to_text", html_to_text)):
+        seconds = min(timeit.repeat(lambda: [function(payload) for payload in payloads], number=1, repeat=repeat))
+        print(f"{name:>14}: {seconds * 1000:8.2f} ms  {total_bytes / seconds / 1024 / 1024:8.2f} MB/s")
+
+    print("\nregex output sample:\n" + regex_remove_html_tags(payloads[0])[:300])
+    print("\nhtml_to_text output sample:\n" + html_to_text(payloads[0])[:300])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", help="articles.json file whose urls are used to fetch real payloads.")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.articles, args.limit) if args.articles else [SAMPLE_SECTION_DATA]
+    run(payloads, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
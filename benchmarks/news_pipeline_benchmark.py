@@ -0,0 +1,129 @@
+"""
+end-to-end throughput benchmark of the NewsSiteScraper data path against the local replay server.
+
+usage:
+    python -m benchmarks.news_pipeline_benchmark --synthetic 500 --latency 0.05 --jitter 0.02
+    python -m benchmarks.news_pipeline_benchmark --fixtures fixtures.json --stream --storage-format jsonl
+
+reports articles/sec, p50/p99 request latency (requests engine) and the peak RSS of the scraper process.
+the replay server runs in its own process, so its memory is not part of the peak RSS.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+import requests
+from benchmarks.replay_server import serve, synthetic_fixtures, pipeline_pointed_to
+from scrapers.news.gov_news_scraper import NewsSiteScraper
+
+
+def timed_requests_get(latencies):
+    """wraps requests.get so the latency of every request is collected."""
+    original_get = requests.get
+
+    def get(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_get(*args, **kwargs)
+
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    return original_get, get
+
+
+def percentile(values, percent):
+    if not values:
+        return float("nan")
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def run_benchmark(fixtures, latency=0.0, jitter=0.0, error_rate=0.0, **scraper_options):
+    """
+    runs the news pipeline against a replay server process.
+
+    :param scraper_options: keyword arguments of NewsSiteScraper (async_fetch, stream, storage_format, ...).
+    :return: dictionary of the measured results.
+    """
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(fixtures, 0, latency, jitter, error_rate, ready),
+                                     daemon=True)
+    server.start()
+    server_url = ready.get(timeout=30)
+
+    latencies = []
+    original_get, requests.get = timed_requests_get(latencies)
+    working_directory = os.getcwd()
+
+    try:
+        with tempfile.TemporaryDirectory() as directory, pipeline_pointed_to(server_url):
+            # the scraper writes its data files relative to the working directory.
+            os.chdir(directory)
+            scraper = NewsSiteScraper(server_url, **scraper_options)
+
+            start = time.perf_counter()
+            scraper.fetch_data()
+            elapsed = time.perf_counter() - start
+
+            saved = len(scraper.data_processor.data_saver.load_existing_data())
+            scraper.close_driver()
+
+    finally:
+        os.chdir(working_directory)
+        requests.get = original_get
+        server.terminate()
+
+    return {
+        'articles': saved,
+        'seconds': elapsed,
+        'articles_per_second': saved / elapsed if elapsed else float("nan"),
+        'requests': len(latencies),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        # ru_maxrss is in kilobytes on Linux.
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixtures", help="fixtures file recorded with benchmarks.replay_server record.")
+    source.add_argument("--synthetic", type=int, default=200, help="number of synthetic articles.")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--async-fetch", action="store_true")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--storage-format", default="json", choices=("json", "jsonl", "sqlite"))
+    parser.add_argument("--adaptive-limit", action="store_true")
+    parser.add_argument("--resilient", action="store_true")
+    parser.add_argument("--transform-processes", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        with open(args.fixtures, 'r', encoding='utf-8') as f:
+            fixtures = json.load(f)
+    else:
+        fixtures = synthetic_fixtures(args.synthetic)
+
+    results = run_benchmark(
+        fixtures, args.latency, args.jitter, args.error_rate,
+        async_fetch=args.async_fetch, stream=args.stream, storage_format=args.storage_format,
+        adaptive_limit=args.adaptive_limit, resilient=args.resilient, transform_processes=args.transform_processes
+    )
+
+    print(f"articles saved : {results['articles']} in {results['seconds']:.2f}s")
+    print(f"throughput     : {results['articles_per_second']:.1f} articles/sec")
+    print(f"requests       : {results['requests']} (p50 {results['p50_ms']:.1f} ms, p99 {results['p99_ms']:.1f} ms)")
+    print(f"peak RSS       : {results['peak_rss_mb']:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+record/replay stand-in for the gov.il news APIs.
+
+fixtures are a json file with the recorded listing and article contents:
+    {"listing": [raw GetResults items...], "contents": {article name: content-pages response}, "page_size_param": ...}
+
+usage:
+    python -m benchmarks.replay_server record fixtures.json --pages 20     # capture real responses
+    python -m benchmarks.replay_server serve fixtures.json --port 8000 --latency 0.05 --jitter 0.02 --error-rate 0.01
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from scrapers.news.news_data.data_fetcher import DataFetcher
+from scrapers.news.news_data.data_processor import DataProcessor
+
+LISTING_PATH = "/CollectorsWebApi/api/DataCollector/GetResults"
+CONTENT_PATH = "/ContentPageWebApi/api/content-pages/"
+
+
+def record_fixtures(file_name, pages=10, page_size=10):
+    """captures the first listing pages of the real API and the content of every listed article."""
+    data_fetcher = DataFetcher(logging.getLogger(__name__))
+    listing = []
+    for page in range(pages):
+        response = data_fetcher.fetch_articles(f"{DataProcessor.BASE_URL}&skip={page * page_size}&culture=en")
+        if not response or not response.get('results'):
+            break
+        listing.extend(response['results'])
+
+    contents = {}
+    for item in listing:
+        content = data_fetcher.fetch_article_content(item['url'])
+        if content:
+            contents[item['url'].split('/')[-1]] = content
+
+    with open(file_name, 'w', encoding='utf-8') as f:
+        json.dump({'listing': listing, 'contents': contents, 'page_size_param': None}, f, ensure_ascii=False)
+
+    print(f"recorded {len(listing)} articles and {len(contents)} contents to {file_name}")
+
+
+def synthetic_fixtures(total_articles=200, paragraphs=20, page_size_param="limit"):
+    """builds fixtures shaped like the real API, for machines that never had network access."""
+    listing, contents = [], {}
+    for index in range(total_articles):
+        name = f"synthetic-article-{index}"
+        listing.append({
+            'title': f"Synthetic article {index}",
+            'url': f"https://www.gov.il/en/departments/news/{name}",
+            'description': f"Description of synthetic article {index}",
+            'tags': {
+                'metaData': {
+                    'Publish Date': [{'title': f"{index % 28 + 1:02d}.{index % 12 + 1:02d}.2024"}],
+                    'Ministry': [{'title': f"Ministry {index % 7}"}]
+                },
+                'promotedMetaData': {'Topic': [{'title': f"Topic {index % 5}"}]}
+            }
+        })
+        section_data = "".join(f"<p>Paragraph {p} of article {index} &amp; more <b>text</b>.</p>"
+                               for p in range(paragraphs))
+        contents[name] = {'contentMain': {'htmlContents': [{'sectionData': section_data}]}}
+
+    return {'listing': listing, 'contents': contents, 'page_size_param': page_size_param}
+
+
+class ReplayServer:
+    """
+    local HTTP server that replays fixtures with configurable latency, jitter and error rate.
+
+    listing pages are cut from the recorded listing with the skip (and, if recorded, page size) parameters,
+    so any pagination the fetcher chooses is served consistently.
+    """
+    def __init__(self, fixtures: dict, port=0, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def _handler_class(self):
+        replay = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = replay.respond(self.path)
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b""
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return ReplayHandler
+
+    def respond(self, path):
+        """returns the (status code, json body) of a request path, after the simulated latency."""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            failed = self.random.random() < self.error_rate
+
+        time.sleep(delay)
+        if failed:
+            return 503, None
+
+        parts = urlsplit(path)
+        if parts.path == LISTING_PATH:
+            return 200, self.listing_page(parse_qs(parts.query))
+
+        if parts.path.startswith(CONTENT_PATH):
+            content = self.fixtures['contents'].get(parts.path[len(CONTENT_PATH):])
+            return (200, content) if content else (404, None)
+
+        return 404, None
+
+    def listing_page(self, query: dict):
+        listing = self.fixtures['listing']
+        skip = int(query.get('skip', ['0'])[0])
+        page_size_param = self.fixtures.get('page_size_param')
+        page_size = int(query[page_size_param][0]) if page_size_param in query else DataFetcher.DEFAULT_PAGE_SIZE
+
+        return {'total': len(listing), 'results': listing[skip:skip + page_size]}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextmanager
+def pipeline_pointed_to(base_url):
+    """points the news pipeline urls at a replay server and restores them afterwards."""
+    saved = (DataProcessor.FIRST_PAGE_URL, DataProcessor.BASE_URL, DataFetcher.CONTENT_API_URL)
+    DataProcessor.FIRST_PAGE_URL = f"{base_url}{LISTING_PATH}?CollectorType=news&&culture=en"
+    DataProcessor.BASE_URL = f"{base_url}{LISTING_PATH}?CollectorType=news"
+    DataFetcher.CONTENT_API_URL = f"{base_url}{CONTENT_PATH}{{}}?culture=en"
+    try:
+        yield
+
+    finally:
+        DataProcessor.FIRST_PAGE_URL, DataProcessor.BASE_URL, DataFetcher.CONTENT_API_URL = saved
+
+
+def serve(fixtures, port, latency, jitter, error_rate, ready=None):
+    """runs a replay server until the process is stopped, ready (a queue) receives its url."""
+    server = ReplayServer(fixtures, port, latency, jitter, error_rate)
+    if ready is not None:
+        ready.put(server.url)
+    server.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="capture real API responses into a fixtures file.")
+    record_parser.add_argument("file_name")
+    record_parser.add_argument("--pages", type=int, default=10)
+
+    serve_parser = subparsers.add_parser("serve", help="serve a fixtures file.")
+    serve_parser.add_argument("file_name")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--latency", type=float, default=0.0)
+    serve_parser.add_argument("--jitter", type=float, default=0.0)
+    serve_parser.add_argument("--error-rate", type=float, default=0.0)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record_fixtures(args.file_name, args.pages)
+        return
+
+    with open(args.file_name, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+
+    print(f"serving {args.file_name} on http://127.0.0.1:{args.port}")
+    serve(fixtures, args.port, args.latency, args.jitter, args.error_rate)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+import threading
+from fnmatch import fnmatch
+import trio
+from selenium import webdriver
+
+# CDP resource types we never read.
+BLOCKED_RESOURCE_TYPES = ("Image", "Font", "Media")
+
+# trackers, ads and third-party widgets.
+BLOCKED_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "connect.facebook.com", "hotjar.com", "clarity.ms", "analytics.tiktok.com",
+    "fonts.googleapis.com", "fonts.gstatic.com"
+)
+
+
+class ResourceBlocker:
+    """
+    fails the requests of the blocked resource types of a profile through CDP Fetch interception,
+    requests to the allowed urls of the profile continue.
+
+    execute_cdp_cmd cannot receive CDP events, so the Fetch.requestPaused events of the current tab are handled
+    on a bidi_connection in a background thread. the thread ends on stop() or when the browser quits.
+    """
+    def __init__(self, driver, profile, logger=None):
+        self.driver = driver
+        self.profile = profile
+        self.logger = logger
+        self._ready = threading.Event()
+        self._error = None
+        self._cancel_scope = None
+        self._trio_token = None
+        self._thread = None
+
+    def start(self, timeout=10):
+        """starts the interception and waits until it is enabled, raises if it could not be enabled."""
+        self._thread = threading.Thread(target=self._run, name="ResourceBlocker", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise TimeoutError("request interception was not enabled in time")
+        if self._error:
+            raise self._error
+
+        return self
+
+    def stop(self):
+        """stops the interception, requests of the tab are no longer paused."""
+        if self._thread and self._thread.is_alive() and self._cancel_scope:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._trio_token)
+
+            except trio.RunFinishedError:
+                pass
+
+            self._thread.join()
+
+    def _run(self):
+        try:
+            trio.run(self.intercept)
+
+        except Exception as e:
+            # the connection is closed when the browser quits, that only matters before interception started.
+            self._error = e
+            if self.logger and self._ready.is_set():
+                self.logger.info(f"request interception stopped: {e}")
+
+        finally:
+            self._ready.set()
+
+    async def intercept(self):
+        self._trio_token = trio.lowlevel.current_trio_token()
+        with trio.CancelScope() as self._cancel_scope:
+            async with self.driver.bidi_connection() as connection:
+                session, devtools = connection.session, connection.devtools
+                # listen before enabling, so no paused request is missed.
+                paused_requests = session.listen(devtools.fetch.RequestPaused, buffer_size=1000)
+                await session.execute(devtools.fetch.enable(patterns=[
+                    devtools.fetch.RequestPattern(url_pattern="*", resource_type=devtools.network.ResourceType(kind))
+                    for kind in self.profile.blocked_resource_types
+                ]))
+                self._ready.set()
+
+                async for event in paused_requests:
+                    if self.profile.is_allowed(event.request.url):
+                        await session.execute(devtools.fetch.continue_request(request_id=event.request_id))
+                    else:
+                        await session.execute(devtools.fetch.fail_request(
+                            request_id=event.request_id, error_reason=devtools.network.ErrorReason.BLOCKED_BY_CLIENT
+                        ))
+
+
+class BrowserProfile:
+    """
+    chrome settings of a SeleniumScraper, selected per scraper with its BROWSER_PROFILE class attribute.
+
+    tracker domains are blocked through CDP Network.setBlockedURLs. resource types are blocked by a
+    ResourceBlocker, which lets the requests to the allowed urls through, e.g. the product images a scraper reads.
+    """
+    def __init__(self, name, arguments=(), headless=False, page_load_strategy="normal", blocked_urls=(),
+                 blocked_resource_types=(), allowed_urls=()):
+        """
+        :param arguments: chrome command line arguments.
+        :param page_load_strategy: "normal" waits for the load event, "eager" returns at DOMContentLoaded.
+        :param blocked_urls: url patterns with * wildcards that the browser does not request.
+        :param blocked_resource_types: CDP resource types (e.g. "Image") that the browser does not load.
+        :param allowed_urls: url patterns that must keep loading, e.g. resources the scraper selectors depend on.
+        """
+        self.name = name
+        self.arguments = list(arguments)
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.blocked_urls = list(blocked_urls)
+        self.blocked_resource_types = list(blocked_resource_types)
+        self.allowed_urls = list(allowed_urls)
+
+    @classmethod
+    def performance(cls, allowed_urls=()):
+        """headless, eager profile that blocks images, fonts, media and third-party trackers."""
+        return cls(
+            "performance",
+            arguments=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--window-size=1920,1080",
+                       "--disable-extensions", "--mute-audio"],
+            headless=True,
+            page_load_strategy="eager",
+            blocked_urls=[f"*{domain}*" for domain in BLOCKED_DOMAINS],
+            blocked_resource_types=BLOCKED_RESOURCE_TYPES,
+            allowed_urls=allowed_urls
+        )
+
+    def is_allowed(self, url):
+        return any(fnmatch(url, pattern) for pattern in self.allowed_urls)
+
+    def effective_blocked_urls(self):
+        """
+        returns the blocked url patterns, setBlockedURLs has no exceptions, so a (domain) pattern that matches
+        an allowed url is left out.
+        """
+        return [pattern for pattern in self.blocked_urls
+                if not any(fnmatch(allowed, pattern) for allowed in self.allowed_urls)]
+
+    def options(self):
+        """returns the ChromeOptions of the profile."""
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        for argument in self.arguments:
+            options.add_argument(argument)
+
+        options.page_load_strategy = self.page_load_strategy
+        return options
+
+    def apply(self, driver, logger=None):
+        """
+        applies the settings that need a running browser to its current tab, called after the driver is created
+        and again after the browser switched to a new tab.
+        """
+        blocked_urls = self.effective_blocked_urls()
+        if blocked_urls:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+
+        if self.blocked_resource_types:
+            previous_blocker = getattr(driver, "resource_blocker", None)
+            if previous_blocker:
+                previous_blocker.stop()
+
+            try:
+                driver.resource_blocker = ResourceBlocker(driver, self, logger).start()
+
+            except Exception as e:
+                # the pages still load, only slower, with the blocked resource types.
+                driver.resource_blocker = None
+                if logger:
+                    logger.warning(f"failed to block the {self.blocked_resource_types} requests: {e}")
+
+
+DEFAULT_PROFILE = BrowserProfile(
+    "default", arguments=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--start-maximized"]
+)
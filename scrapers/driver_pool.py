@@ -0,0 +1,245 @@
+import concurrent.futures
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class DriverPool:
+    """
+    fixed size pool of WebDriver instances that lets several threads browse in parallel.
+
+    drivers are created lazily by create_driver (e.g. SeleniumScraper.create_driver) and leased one
+    thread at a time. a driver that crashed can be replaced so the pool keeps its size.
+    """
+    def __init__(self, create_driver, size, logger):
+        """
+        :param create_driver: function that returns a new WebDriver.
+        :param size: number of drivers in the pool.
+        """
+        self.create_driver = create_driver
+        self.size = size
+        self.logger = logger
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._all = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """returns an idle driver, creating one if the pool is not full, otherwise waits for one."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+
+            except queue.Empty:
+                with self._lock:
+                    create = self._created < self.size
+                    if create:
+                        self._created += 1
+
+                driver = self._create() if create else self._idle.get()
+
+            # None marks a slot that was given back, the next round creates a driver for it.
+            if driver is not None:
+                return driver
+
+    def _create(self):
+        try:
+            driver = self.create_driver()
+
+        except Exception:
+            self._free_slot()
+            raise
+
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def _free_slot(self):
+        """gives back the slot of a driver that could not be created, and wakes a thread waiting for a driver."""
+        with self._lock:
+            self._created -= 1
+        self._idle.put(None)
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self):
+        """leases a driver for the duration of a with block."""
+        driver = self.acquire()
+        try:
+            yield driver
+
+        finally:
+            self.release(driver)
+
+    def replace(self, driver):
+        """
+        quits a broken driver and returns a new one in its place.
+        if the new driver cannot be created, its slot is given back to the pool and the error is raised.
+        """
+        self._quit(driver)
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+
+        return self._create()
+
+    def close(self):
+        """quits all the drivers of the pool."""
+        with self._lock:
+            drivers, self._all = self._all, []
+            self._created = 0
+
+        for driver in drivers:
+            self._quit(driver)
+
+        self._idle = queue.LifoQueue()
+        self.logger.info(f"driver pool closed, {len(drivers)} drivers quit.")
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+
+        except Exception as e:
+            self.logger.error(f"failed to quit driver: {e}")
+
+
+class BrowserPool(DriverPool):
+    """
+    long-lived DriverPool of pre-launched browsers, shared by scraper instances.
+
+    a leased browser is health checked before it is handed out, and returned to the pool with a clean state:
+    cookies and storage are cleared and the page is replaced by a fresh tab.
+    the pages a browser loads are counted on its driver.get, to limit the memory that long running chrome
+    processes gather: every recycle_after pages a browser that is still leased moves to a fresh tab,
+    and a released browser that loaded recycle_after pages is quit and launched again.
+    """
+    def __init__(self, create_driver, size, logger, recycle_after=50, prepare_driver=None):
+        """
+        :param recycle_after: number of pages after which a browser is launched again.
+        :param prepare_driver: function applied to a browser after it moved to a fresh tab,
+            e.g. to apply the CDP settings of its BrowserProfile again, which are set per tab.
+        """
+        super().__init__(create_driver, size, logger)
+        self.recycle_after = recycle_after
+        self.prepare_driver = prepare_driver
+        self._pages = {}
+
+    def warm_up(self, count=None):
+        """launches up to count browsers (the pool size by default) concurrently, so leases do not wait for them."""
+        count = min(count or self.size, self.size)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=count) as executor:
+            drivers = list(executor.map(lambda _: self.acquire(), range(count)))
+
+        for driver in drivers:
+            self._idle.put(driver)
+
+        self.logger.info(f"browser pool warmed up with {len(drivers)} browsers.")
+
+    def acquire(self):
+        """returns an idle browser that responds, a browser that does not respond is replaced."""
+        driver = super().acquire()
+        if not self.is_healthy(driver):
+            self.logger.warning("pooled browser is not responding, replacing it.")
+            driver = self.replace(driver)
+
+        return driver
+
+    def _create(self):
+        driver = super()._create()
+        self._count_pages(driver)
+        return driver
+
+    def _count_pages(self, driver):
+        """wraps driver.get to count the pages the browser loads, so a crawl that holds one lease is counted too."""
+        navigate = driver.get
+
+        def get(url):
+            with self._lock:
+                pages = self._pages.get(driver, 0)
+                self._pages[driver] = pages + 1
+
+            if pages and pages % self.recycle_after == 0:
+                self.logger.info(f"browser loaded {pages} pages, moving it to a fresh tab.")
+                self.fresh_tab(driver)
+
+            return navigate(url)
+
+        driver.get = get
+
+    def pages_of(self, driver):
+        with self._lock:
+            return self._pages.get(driver, 0)
+
+    def release(self, driver):
+        """resets the browser and returns it to the pool, or recycles it if it loaded recycle_after pages."""
+        try:
+            if self.pages_of(driver) >= self.recycle_after:
+                self.logger.info(f"recycling browser after {self.pages_of(driver)} pages.")
+                driver = self.replace(driver)
+            else:
+                try:
+                    self.reset(driver)
+
+                except Exception as e:
+                    self.logger.error(f"failed to reset browser, replacing it: {e}")
+                    driver = self.replace(driver)
+
+        except Exception as e:
+            # replace already gave the slot back, the next acquire launches a browser for it.
+            self.logger.error(f"failed to launch a browser in place of a released one: {e}")
+            return
+
+        super().release(driver)
+
+    def replace(self, driver):
+        with self._lock:
+            self._pages.pop(driver, None)
+
+        return super().replace(driver)
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._pages = {}
+
+    @staticmethod
+    def is_healthy(driver):
+        try:
+            driver.window_handles
+            return True
+
+        except Exception:
+            return False
+
+    def reset(self, driver):
+        """clears cookies and storage of the browser and leaves it on a single fresh tab."""
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+        except Exception:
+            # pages like about:blank have no storage.
+            pass
+
+        try:
+            # clears the cookies of all domains, delete_all_cookies only clears the current one.
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+        except Exception:
+            driver.delete_all_cookies()
+
+        self.fresh_tab(driver)
+
+    def fresh_tab(self, driver):
+        """replaces all the tabs of the browser by a new one, which gets a new renderer process."""
+        old_handles = driver.window_handles
+        driver.switch_to.new_window("tab")
+        fresh_handle = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+
+        driver.switch_to.window(fresh_handle)
+        if self.prepare_driver:
+            self.prepare_driver(driver)
@@ -1,26 +1,94 @@
-from scrapers.scraper_interface import SeleniumScraper
+from scrapers.scraper_interface import RequestsScraper
 from scrapers.news.news_data.data_fetcher import DataFetcher
+from scrapers.news.news_data.async_data_fetcher import AsyncDataFetcher
 from scrapers.news.news_data.data_saver import DataSaver
 from scrapers.news.news_data.data_processor import DataProcessor
+from scrapers.news.news_data.sync_state import SyncState
+from scrapers.news.news_data.response_cache import ResponseCache
+from scrapers.news.news_data.rate_limiter import AdaptiveRateLimiter
+from scrapers.news.news_data.resilience import Resilience, DeadLetterQueue
+from scrapers.news.news_data.article_transformer import ArticleTransformer
+from storage.jsonl_storage import JsonlArticleStorage
+from storage.sqlite_storage import SqliteArticleStorage
+from storage.crawl_journal import CrawlJournal
 from logger.scraper_logger import Logger
 
 
-class NewsSiteScraper(SeleniumScraper):
+class NewsSiteScraper(RequestsScraper):
     """
-    NewsSiteScraper uses Selenium to scrape news_data from a news website.
+    NewsSiteScraper scrapes news_data from the gov.il news collector.
+
+    all the data comes from the gov.il JSON APIs, so the scraper is built on RequestsScraper
+    and never launches a browser.
     """
     LOG_NAME = "NewsSiteScraper"
     LOG_FILE = "logs/news_site_scraper.log"
+    # listing pages change all the time and are always revalidated, article content is served for a day.
+    CACHE_TTL_OVERRIDES = {
+        "CollectorsWebApi": 0,
+        "ContentPageWebApi": 24 * 60 * 60
+    }
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, async_fetch: bool = False, storage_format: str = "json", incremental: bool = False,
+                 cache_dir: str = None, stream: bool = False, adaptive_limit: bool = False,
+                 resilient: bool = False, transform_processes: int = 0,
+                 resume: bool = False):
+        """
+        :param async_fetch: fetch the APIs with the aiohttp based AsyncDataFetcher instead of requests,
+                            cache_dir, adaptive_limit and the retries of resilient do not apply to it.
+        :param storage_format: "json" rewrites articles.json, "jsonl" appends to articles.jsonl,
+                               "sqlite" upserts into articles.db.
+        :param incremental: only fetch the articles published since the last run (delta sync).
+        :param cache_dir: directory of the on-disk response cache used by DataFetcher, None disables it.
+        :param stream: save articles while the pages are still being fetched.
+        :param adaptive_limit: let an AdaptiveRateLimiter decide how many DataFetcher requests run concurrently.
+        :param resilient: retry failed DataFetcher requests with backoff, fail fast while gov.il is down and keep
+                          failed pages and articles in news_dead_letters.json for the next run.
+        :param transform_processes: number of processes that parse the fetched articles, 0 parses in the
+                                    fetching threads.
+        :param resume: continue the last full crawl from its checkpoint journal if it was interrupted.
+        """
         super().__init__(url)
         # override the logger with a new instance for this class.
         self.logger = Logger.get_logger(self.LOG_NAME, self.LOG_FILE)
-        data_fetcher = DataFetcher(self.logger)
-        data_saver = DataSaver('articles.json', self.logger)
+        cache = ResponseCache(cache_dir, self.logger, ttl_overrides=self.CACHE_TTL_OVERRIDES) \
+            if cache_dir and not async_fetch else None
+        limiter = AdaptiveRateLimiter(self.logger) if adaptive_limit and not async_fetch else None
+
+        dead_letters = None
+        resilience = None
+        if resilient:
+            dead_letters = DeadLetterQueue('news_dead_letters.json', self.logger)
+            resilience = Resilience(self.logger, dead_letters=dead_letters)
+
+        if async_fetch:
+            # the response cache, the adaptive limiter and the retries are DataFetcher features, the connector
+            # limits of AsyncDataFetcher cap its concurrency. failed articles still go to the dead letters.
+            ignored = [name for name, enabled in (("cache_dir", cache_dir), ("adaptive_limit", adaptive_limit),
+                                                  ("resilient retries", resilient)) if enabled]
+            if ignored:
+                self.logger.warning(f"{', '.join(ignored)} not supported with async_fetch, ignored.")
+            data_fetcher = AsyncDataFetcher(self.logger)
+        else:
+            # the pooled keep-alive session of the scraper, closed by close_driver.
+            data_fetcher = DataFetcher(self.logger, cache=cache, limiter=limiter, resilience=resilience,
+                                       session=self.session, timeout=self.timeout)
+        storage = None
+        if storage_format == "jsonl":
+            storage = JsonlArticleStorage('articles.jsonl', self.logger)
+        elif storage_format == "sqlite":
+            storage = SqliteArticleStorage('articles.db', self.logger)
+        transformer = ArticleTransformer(self.logger, processes=transform_processes) if transform_processes else None
+        data_saver = DataSaver('articles.json', self.logger, data_fetcher=data_fetcher, storage=storage,
+                               dead_letters=dead_letters, transformer=transformer,
+                               journal=CrawlJournal('news_crawl.journal', self.logger))
 
         # creating a DataProcessor instance and passing dependencies
-        self.data_processor = DataProcessor(data_fetcher, data_saver, self.logger)
+        self.incremental = incremental
+        self.stream = stream
+        self.resume = resume
+        sync_state = SyncState('news_sync_state.json', self.logger)
+        self.data_processor = DataProcessor(data_fetcher, data_saver, self.logger, sync_state=sync_state)
 
     def get_title(self):
         return super().get_title()
@@ -28,7 +96,19 @@ class NewsSiteScraper(SeleniumScraper):
     def get_element(self, by: str, value: str):
         return super().get_element(by, value)
 
+    def close_driver(self):
+        super().close_driver()
+        if isinstance(self.data_processor.data_fetcher, AsyncDataFetcher):
+            self.data_processor.data_fetcher.close()
+
+        if self.data_processor.data_saver.storage:
+            self.data_processor.data_saver.storage.close()
+
+        if self.data_processor.data_saver.transformer:
+            self.data_processor.data_saver.transformer.close()
+
     def fetch_data(self):
         # processing the relevant news_data using DataProcessor class.
         self.logger.info("news scraper starts processing data from the site.")
-        self.data_processor.process_news_data()
+        self.data_processor.process_news_data(incremental=self.incremental, stream=self.stream,
+                                              resume=self.resume)
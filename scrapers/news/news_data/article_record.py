@@ -0,0 +1,68 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+# tag vocabulary: every distinct tuple of tag values is kept once and shared by all the records that use it.
+_tag_values = {}
+
+
+def intern_values(values):
+    """returns the shared tuple of interned strings equal to the given values."""
+    values = tuple(sys.intern(value) if isinstance(value, str) else value for value in values)
+    return _tag_values.setdefault(values, values)
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """
+    compact in-memory representation of a saved article.
+
+    the record has no per-instance __dict__, and tag names, tag values and publish dates are interned,
+    so the ministry / topic strings that repeat across thousands of articles are stored once.
+    to_dict returns exactly the dictionary that from_dict received.
+    """
+    FIELDS = ('title', 'url', 'publish_date', 'description', 'tags', 'article_content')
+
+    title: str
+    url: str
+    publish_date: Optional[str]
+    description: Optional[str]
+    # tuple of (tag name, tuple of tag values), keeps the order of the tags dictionary.
+    tags: tuple
+    article_content: Optional[str]
+    # keys that are not part of the article layout, kept for lossless conversion.
+    extra: Optional[dict] = None
+
+    @classmethod
+    def from_dict(cls, article: dict):
+        tags = tuple((sys.intern(name), intern_values(values)) for name, values in (article.get('tags') or {}).items())
+        publish_date = article.get('publish_date')
+        extra = {key: value for key, value in article.items() if key not in cls.FIELDS}
+
+        return cls(
+            title=article.get('title'),
+            url=article.get('url'),
+            publish_date=sys.intern(publish_date) if publish_date else publish_date,
+            description=article.get('description'),
+            tags=tags,
+            article_content=article.get('article_content'),
+            extra=extra or None
+        )
+
+    def to_dict(self):
+        article = {
+            'title': self.title,
+            'url': self.url,
+            'publish_date': self.publish_date,
+            'description': self.description,
+            'tags': {name: list(values) for name, values in self.tags},
+            'article_content': self.article_content
+        }
+        if self.extra:
+            article.update(self.extra)
+
+        return article
+
+    @classmethod
+    def from_dicts(cls, articles: list):
+        return [cls.from_dict(article) for article in articles]
@@ -0,0 +1,113 @@
+import concurrent.futures
+import multiprocessing
+from utils import remove_html_tags
+
+
+def extract_tags(tags):
+    """
+    extracting tags news_data from article.
+    :param tags: a Dict of dictionaries.
+
+    :return: organized dictionary for easy storage in a Json file.
+    """
+    tag_data = {}
+    if 'metaData' in tags:
+        for tag_name, tag_list in tags['metaData'].items():
+            tag_data[tag_name] = [tag['title'] for tag in tag_list]
+
+    if 'promotedMetaData' in tags:
+        for tag_name, tag_list in tags['promotedMetaData'].items():
+            tag_data[tag_name] = [tag['title'] for tag in tag_list]
+
+    return tag_data
+
+
+def build_article(item: dict, article_content):
+    """
+    builds the saved article from a raw listing item and its clean content.
+    """
+    return {
+        'title': item['title'],
+        'url': item['url'],
+        'publish_date': item['tags']['metaData']['Publish Date'][0]['title'] if
+        'Publish Date' in item['tags']['metaData'] else None,
+        'description': item['description'],
+        'tags': extract_tags(item['tags']),
+        'article_content': article_content
+    }
+
+
+def transform_article(payload):
+    """
+    turns a (raw listing item, content-pages response) pair into a saved article.
+    runs in the worker processes of ArticleTransformer, so it must stay a picklable module level function.
+
+    :return: (article, None), or (None, error) if the item is malformed.
+    """
+    item, article_response = payload
+    try:
+        section_data = article_response.get("contentMain", {}).get('htmlContents', [])[0].get('sectionData', None)
+        article_content = remove_html_tags(section_data)
+
+    except (IndexError, AttributeError, TypeError):
+        article_content = None
+
+    try:
+        return build_article(item, article_content), None
+
+    except Exception as e:
+        return None, e
+
+
+class ArticleTransformer:
+    """
+    ArticleTransformer runs the CPU bound part of saving articles (html cleanup, tag extraction
+    and building the article dictionary) in a process pool, so the fetching threads never wait for parsing.
+    """
+    def __init__(self, logger, processes=None, chunksize=8, start_method=None):
+        """
+        :param processes: number of worker processes, the number of CPUs by default.
+        :param chunksize: number of payloads sent to a worker process at once.
+        :param start_method: multiprocessing start method of the workers, "forkserver" where available.
+            the pool starts while fetch threads hold logging and IO locks, a forked worker could inherit them locked.
+        """
+        self.logger = logger
+        self.processes = processes
+        self.chunksize = chunksize
+        self.start_method = start_method or (
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        self.executor = None
+
+    def transform_batch(self, payloads: list, on_error=None):
+        """
+        transforms a batch of (item, article_response) pairs in the process pool.
+
+        :param on_error: function called with (item, error) for every item that could not be transformed,
+            e.g. DataSaver.add_dead_letter.
+        :return: list of articles in the order of the payloads, None for malformed items.
+        """
+        if self.executor is None:
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context(self.start_method)
+            )
+
+        articles = []
+        for (item, _), (article, error) in zip(payloads, self.executor.map(transform_article, payloads,
+                                                                           chunksize=self.chunksize)):
+            if error is not None:
+                self.logger.error(f"Error processing article {item.get('url')}: {error}")
+                if on_error:
+                    on_error(item, error)
+            articles.append(article)
+
+        failed = articles.count(None)
+        if failed:
+            self.logger.error(f"{failed} articles of the batch could not be transformed.")
+
+        return articles
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
@@ -0,0 +1,164 @@
+import asyncio
+import itertools
+import threading
+from collections import deque
+import aiohttp
+from .data_fetcher import DataFetcher
+
+
+class AsyncDataFetcher:
+    """
+    AsyncDataFetcher is a drop-in replacement for DataFetcher that runs on aiohttp.
+
+    all requests go through one ClientSession with a pooled keep-alive connector, so DNS lookups,
+    TLS handshakes and connections are shared between the listing and the content endpoints.
+    the event loop runs in a background thread, which lets the synchronous methods keep the
+    DataFetcher api while callers from several threads share the same connection pool.
+    """
+    def __init__(self, logger, limit=100, limit_per_host=10, keepalive_timeout=30, timeout=30):
+        """
+        :param limit: max number of open connections in the pool.
+        :param limit_per_host: max number of concurrent connections to the same host.
+        :param keepalive_timeout: seconds an idle connection is kept alive.
+        :param timeout: total timeout of a single request in seconds.
+        """
+        self.logger = logger
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        # base url -> (page size parameter, page size) found by discover_page_size.
+        self.page_sizes = {}
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="AsyncDataFetcher", daemon=True)
+        self._thread.start()
+        self.session = self._run(self._create_session())
+
+    async def _create_session(self):
+        """creates the shared session, must run inside the fetcher event loop."""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    def _run(self, coroutine):
+        """runs a coroutine on the fetcher event loop and waits for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def fetch_articles_async(self, api_url: str, headers: dict = None):
+        """
+        Fetch news_data from the given API URL with optional headers.
+
+        :return: JSON news_data if the request is successful, None otherwise.
+        """
+        try:
+            async with self.session.get(api_url, headers=headers) as response:
+                if response.status == 200:
+                    return await response.json(content_type=None)
+
+                self.logger.error(f"Error: Received status code {response.status} from {api_url}")
+                return None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Request failed: {api_url}, error: {e}")
+            return None
+
+    async def fetch_article_content_async(self, article_url):
+        """
+        Fetch article content using the internal API URL.
+        """
+        return await self.fetch_articles_async(DataFetcher.content_api_url(article_url))
+
+    async def fetch_article_contents_async(self, article_urls):
+        """
+        Fetch the content of many articles concurrently, at most limit_per_host requests are in flight.
+
+        :return: list of responses in the order of article_urls, None for the articles that failed.
+        """
+        semaphore = asyncio.Semaphore(self.limit_per_host)
+
+        async def fetch(article_url):
+            async with semaphore:
+                return await self.fetch_article_content_async(article_url)
+
+        return await asyncio.gather(*(fetch(article_url) for article_url in article_urls))
+
+    async def fetch_paginated_articles_async(self, base_url, total_articles, interval=10, start=None,
+                                             page_size_param=None):
+        """
+        Fetch all pages after the first one concurrently,
+        the connector limit_per_host caps how many of them are in flight.
+        """
+        pages_to_fetch = DataFetcher.paginated_urls(base_url, total_articles, interval, start, page_size_param)
+        responses = await asyncio.gather(*(self.fetch_articles_async(url) for url in pages_to_fetch))
+
+        articles = []
+        for response in responses:
+            if response:
+                articles.extend(response.get('results', []))
+
+        return {
+            'total': total_articles,
+            'results': articles
+        }
+
+    def fetch_articles(self, api_url: str, headers: dict = None):
+        return self._run(self.fetch_articles_async(api_url, headers))
+
+    def fetch_page(self, api_url: str):
+        return self.fetch_articles(api_url)
+
+    def fetch_article_content(self, article_url):
+        return self._run(self.fetch_article_content_async(article_url))
+
+    def fetch_article_contents(self, article_urls):
+        return self._run(self.fetch_article_contents_async(article_urls))
+
+    def fetch_paginated_articles(self, base_url, total_articles, interval=10, start=None, page_size_param=None):
+        return self._run(self.fetch_paginated_articles_async(base_url, total_articles, interval, start,
+                                                             page_size_param))
+
+    def discover_page_size(self, base_url):
+        """see DataFetcher.discover_page_size."""
+        if base_url in self.page_sizes:
+            return (*self.page_sizes[base_url], None)
+
+        page_size_param, page_size, first_page = DataFetcher.probe_page_size(base_url, self.fetch_articles)
+        self.page_sizes[base_url] = (page_size_param, page_size)
+        return page_size_param, page_size, first_page
+
+    def iter_paginated_articles(self, base_url, total_articles, interval=10, max_in_flight=4, start=None,
+                                page_size_param=None):
+        """
+        streaming version of fetch_paginated_articles, see DataFetcher.iter_paginated_articles.
+
+        :return: generator of article lists, one list per page.
+        """
+        pages_to_fetch = iter(DataFetcher.paginated_urls(base_url, total_articles, interval, start, page_size_param))
+        in_flight = deque(asyncio.run_coroutine_threadsafe(self.fetch_articles_async(url), self.loop)
+                          for url in itertools.islice(pages_to_fetch, max_in_flight))
+
+        while in_flight:
+            response = in_flight.popleft().result()
+
+            next_url = next(pages_to_fetch, None)
+            if next_url:
+                in_flight.append(asyncio.run_coroutine_threadsafe(self.fetch_articles_async(next_url), self.loop))
+
+            if response:
+                yield response.get('results', [])
+
+    def close(self):
+        """closes the shared session and stops the event loop."""
+        if self.loop.is_closed():
+            return
+
+        self._run(self.session.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.logger.info("async data fetcher closed")
@@ -1,37 +1,60 @@
 import requests
 import concurrent.futures
+import itertools
+import time
+from collections import deque
+from .response_cache import CachedResponse
 
 
 class DataFetcher:
     """
        DataFetcher is responsible for fetching news_data from APIs.
+
+       all requests go through send_request, which uses the optional ResponseCache and AdaptiveRateLimiter
+       of the fetcher. requests are retried and guarded by circuit breakers when the fetcher has a resilience layer.
     """
-    def __init__(self, logger):
+
+    CONTENT_API_URL = "https://www.gov.il/ContentPageWebApi/api/content-pages/{}?culture=en"
+
+    DEFAULT_PAGE_SIZE = 10
+    # query parameters and page sizes tried by discover_page_size, largest first.
+    PAGE_SIZE_PARAMS = ("limit", "take")
+    PAGE_SIZE_CANDIDATES = (100, 50, 20)
+    def __init__(self, logger, cache=None, limiter=None, resilience=None, session=None, timeout=30):
+        """
+        :param cache: on-disk ResponseCache, None disables caching.
+        :param limiter: AdaptiveRateLimiter, None sends requests without a concurrency limit.
+        :param resilience: Resilience layer (retries, circuit breakers, dead letters), None sends every request once.
+        :param session: requests.Session whose keep-alive connections are reused (e.g. the session of a
+                        RequestsScraper), the requests module (a new connection per request) by default.
+        :param timeout: timeout of a single request in seconds.
+        """
         self.logger = logger
+        self.cache = cache
+        self.limiter = limiter
+        self.resilience = resilience
+        self.session = session if session is not None else requests
+        self.timeout = timeout
+        # base url -> (page size parameter, page size) found by discover_page_size.
+        self.page_sizes = {}
 
-    @staticmethod
-    def fetch_paginated_articles(base_url, total_articles, interval=10):
+    def fetch_paginated_articles(self, base_url, total_articles, interval=10, start=None, page_size_param=None):
         """
         Fetch all articles from paginated API responses.
 
         :param total_articles:
         :param base_url: The base API URL for fetching articles.
         :param interval: The number of articles per request.
+        :param start: offset of the first page to fetch, see paginated_urls.
+        :param page_size_param: query parameter that sets the page size, see discover_page_size.
 
         :return: A list containing all articles.
         """
         articles = []
+        pages_to_fetch = self.paginated_urls(base_url, total_articles, interval, start, page_size_param)
 
-        current_page = 1
-        pages_to_fetch = []
-
-        while (current_page * interval) < total_articles:
-            paginated_url = f"{base_url}&skip={(current_page * interval)}&culture=en"
-            pages_to_fetch.append(paginated_url)
-            current_page += 1
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            responses = list(executor.map(DataFetcher.fetch_articles, pages_to_fetch))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers()) as executor:
+            responses = list(executor.map(self.fetch_page, pages_to_fetch))
 
         for response in responses:
             if response:
@@ -42,8 +65,188 @@ class DataFetcher:
             'results': articles
         }
 
+    def iter_paginated_articles(self, base_url, total_articles, interval=10, max_in_flight=4, start=None,
+                                page_size_param=None):
+        """
+        streaming version of fetch_paginated_articles, yields the articles of each page as soon as it arrives.
+
+        at most max_in_flight pages are requested ahead of the consumer, a new page is requested only
+        after the consumer took the oldest one, so a slow consumer slows down the fetching (backpressure).
+        pages are yielded in order.
+
+        :return: generator of article lists, one list per page.
+        """
+        pages_to_fetch = iter(self.paginated_urls(base_url, total_articles, interval, start, page_size_param))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            in_flight = deque(executor.submit(self.fetch_page, url)
+                              for url in itertools.islice(pages_to_fetch, max_in_flight))
+
+            while in_flight:
+                response = in_flight.popleft().result()
+
+                next_url = next(pages_to_fetch, None)
+                if next_url:
+                    in_flight.append(executor.submit(self.fetch_page, next_url))
+
+                if response:
+                    yield response.get('results', [])
+
     @staticmethod
-    def fetch_articles(api_url: str, headers: dict = None):
+    def paginated_urls(base_url, total_articles, interval=10, start=None, page_size_param=None):
+        """
+        builds the urls of all pages after the first one.
+
+        :param start: offset of the first page, by default one page (the first page is fetched separately).
+                      must be set when the first page was fetched with a different page size.
+        :param page_size_param: query parameter that sets the page size, None keeps the API default.
+
+        :return: A list of paginated API urls.
+        """
+        skip = interval if start is None else start
+        page_size = f"&{page_size_param}={interval}" if page_size_param else ""
+        pages_to_fetch = []
+
+        while skip < total_articles:
+            paginated_url = f"{base_url}&skip={skip}{page_size}&culture=en"
+            pages_to_fetch.append(paginated_url)
+            skip += interval
+
+        return pages_to_fetch
+
+    def discover_page_size(self, base_url):
+        """
+        returns the largest page size the collector API honours, probed once per base url and fetcher.
+
+        :return: tuple of (page size parameter or None, page size, first page). the first page is the response
+                 of the winning probe (the page at skip=0 with that size), None if no probe was sent or won.
+        """
+        if base_url in self.page_sizes:
+            return (*self.page_sizes[base_url], None)
+
+        page_size_param, page_size, first_page = self.probe_page_size(base_url, self.fetch_articles)
+        self.page_sizes[base_url] = (page_size_param, page_size)
+        return page_size_param, page_size, first_page
+
+    @staticmethod
+    def probe_page_size(base_url, fetch):
+        """
+        probes the largest page size the collector API honours.
+
+        the sizes of PAGE_SIZE_CANDIDATES are tried for every parameter of PAGE_SIZE_PARAMS, largest first.
+        the first probe that returns more results than the default page size wins. a parameter whose probe
+        returns the default page size is ignored by the API, so its smaller sizes are not tried.
+        if the API ignores all of them, the default page size is used.
+
+        :param fetch: function used to fetch the probes, e.g. fetch_articles of a fetcher.
+        :return: tuple of (page size parameter or None, page size, response of the winning probe or None).
+        """
+        for page_size_param in DataFetcher.PAGE_SIZE_PARAMS:
+            for page_size in DataFetcher.PAGE_SIZE_CANDIDATES:
+                response = fetch(DataFetcher.first_page_url(base_url, page_size_param, page_size))
+                if not response:
+                    # the API may reject a size it does not support, try a smaller one.
+                    continue
+
+                results = response.get('results', [])
+                if len(results) > DataFetcher.DEFAULT_PAGE_SIZE:
+                    # the API may cap the page size below the requested one, use what it returned.
+                    return page_size_param, len(results), response
+
+                break
+
+        return None, DataFetcher.DEFAULT_PAGE_SIZE, None
+
+    @staticmethod
+    def first_page_url(base_url, page_size_param, page_size):
+        """returns the url of the first listing page with the given page size."""
+        return f"{base_url}&skip=0&{page_size_param}={page_size}&culture=en"
+
+    @staticmethod
+    def content_api_url(article_url):
+        """
+        returns the content-pages API url of the given article url.
+        """
+        article_name = article_url.split('/')[-1]  # Extract the article name from the URL.
+        return DataFetcher.CONTENT_API_URL.format(article_name)
+
+    def max_workers(self):
+        """returns the thread pool size for concurrent requests, the limiter decides how many of them run."""
+        return self.limiter.max_limit if self.limiter else None
+
+    def get(self, api_url: str, headers: dict = None):
+        """
+        sends a GET request, with retries and a circuit breaker if a resilience layer is configured.
+        """
+        resilience = self.resilience
+        if resilience is None:
+            return self.get_once(api_url, headers=headers)
+
+        return resilience.call(api_url, lambda: self.get_once(api_url, headers=headers))
+
+    def get_once(self, api_url: str, headers: dict = None):
+        """
+        sends a single GET request, through the adaptive limiter if one is configured.
+        """
+        limiter = self.limiter
+        if limiter is None:
+            return self.session.get(api_url, headers=headers, timeout=self.timeout)
+
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = self.session.get(api_url, headers=headers, timeout=self.timeout)
+
+        except requests.RequestException:
+            limiter.release(time.monotonic() - start)
+            raise
+
+        limiter.release(time.monotonic() - start, response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    def send_request(self, api_url: str, headers: dict = None):
+        """
+        sends a GET request through the response cache, if one is configured.
+
+        fresh cache entries are returned without a request, stale entries are revalidated
+        with a conditional GET and returned again when the server answers 304.
+
+        :return: requests.Response or CachedResponse.
+        """
+        cache = self.cache
+        if cache is None:
+            return self.get(api_url, headers=headers)
+
+        entry = cache.get(api_url)
+        if entry and cache.is_fresh(api_url, entry):
+            return CachedResponse(entry)
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(cache.conditional_headers(entry))
+
+        response = self.get(api_url, headers=request_headers)
+        if response.status_code == 304 and entry:
+            return cache.revalidated(api_url, entry)
+
+        if response.status_code == 200:
+            return cache.store(api_url, response)
+
+        return response
+
+    def fetch_page(self, api_url: str):
+        """
+        fetch a single listing page, a page that failed is added to the dead letters of the resilience layer.
+        """
+        response = self.fetch_articles(api_url)
+
+        resilience = self.resilience
+        if response is None and resilience and resilience.dead_letters is not None:
+            resilience.dead_letters.add("page", api_url, "listing page could not be fetched")
+
+        return response
+
+    def fetch_articles(self, api_url: str, headers: dict = None):
         """
         Fetch news_data from the given API URL with optional headers.
 
@@ -54,7 +257,7 @@ class DataFetcher:
 
         try:
             # Send the GET request using the requests library
-            response = requests.get(api_url, headers=headers)
+            response = self.send_request(api_url, headers=headers)
 
             # Check if the response status code is 200
             # if status code is 200 -> extract the article news_data from response.
@@ -69,17 +272,16 @@ class DataFetcher:
             print(f"Request failed: {str(e)}")
             return None
 
-    @staticmethod
-    def fetch_article_content(article_url):
+    def fetch_article_content(self, article_url):
         """
         Fetch article content using the internal API URL.
         """
         article_name = article_url.split('/')[-1]  # Extract the article name from the URL.
-        api_url = f"https://www.gov.il/ContentPageWebApi/api/content-pages/{article_name}?culture=en"
+        api_url = self.content_api_url(article_url)
 
         try:
             # Fetch the content news_data using the API
-            response = requests.get(api_url)
+            response = self.send_request(api_url)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -1,6 +1,7 @@
 from scrapers.news.news_data.data_fetcher import DataFetcher
 from scrapers.news.news_data.data_saver import DataSaver
-import re
+from scrapers.news.news_data.sync_state import SyncState
+from utils import html_to_text
 
 
 class DataProcessor:
@@ -10,39 +11,236 @@ class DataProcessor:
     this class uses DataFetcher to fetch articles from the API,
     and uses DataSaver to saves data in chunks to optimize performance.
     """
-    def __init__(self, data_fetcher: DataFetcher, data_saver: DataSaver, logger):
+    FIRST_PAGE_URL = "https://www.gov.il/CollectorsWebApi/api/DataCollector/GetResults?CollectorType=news&&culture=en"
+    BASE_URL = "https://www.gov.il/CollectorsWebApi/api/DataCollector/GetResults?CollectorType=news"
+    # journal page id recorded after the whole listing was fetched.
+    LISTING_COMPLETE = "listing-complete"
+
+    def __init__(self, data_fetcher: DataFetcher, data_saver: DataSaver, logger, sync_state: SyncState = None):
         self.data_fetcher = data_fetcher
         self.data_saver = data_saver
         self.logger = logger
+        self.sync_state = sync_state
+
+    def process_news_data(self, incremental: bool = False, stream: bool = False, discover_page_size: bool = True,
+                          resume: bool = False):
+        """
+        fetches all news articles and saves the new ones.
+
+        :param incremental: only walk the newest pages until reaching articles that are already saved,
+                            see sync_news_data.
+        :param stream: save the pages while they are fetched instead of collecting all of them first.
+        :param discover_page_size: paginate with the largest page size the API honours instead of 10.
+        :param resume: continue the crawl recorded in the journal of the data saver, if it was interrupted.
+        """
+        self.retry_dead_letters()
+
+        if incremental:
+            return self.sync_news_data()
+
+        journal = self.data_saver.journal
+        if resume and journal:
+            state = journal.load()
+            if not state.is_empty:
+                return self.resume_news_data(state, stream, discover_page_size)
+
+        if journal:
+            journal.start()
 
-    def process_news_data(self):
         try:
-            # get first page articles.
-            response_data = self.data_fetcher.fetch_articles(
-                api_url="https://www.gov.il/CollectorsWebApi/api/DataCollector/GetResults?CollectorType=news&&culture"
-                        "=en")
+            # get first page articles, with the page size the remaining pages use.
+            response_data, page_size_param, page_size = self.fetch_first_page(discover_page_size)
             # save first page articles.
             if response_data:
+                if journal:
+                    journal.record_page(self.FIRST_PAGE_URL, response_data.get("results"))
+
                 self.data_saver.save_data_in_chunks(response_data.get("results"))
                 self.logger.info("articles in first page have been successfully saved.")
 
-            # get all pages articles
-            base_url = "https://www.gov.il/CollectorsWebApi/api/DataCollector/GetResults?CollectorType=news"
+            # the remaining pages start right after the articles of the first page.
+            pagination = {
+                'interval': page_size,
+                'start': len(response_data.get('results', [])),
+                'page_size_param': page_size_param
+            }
+            self.logger.info(f"paginating with {page_size} articles per page.")
+
+            if stream:
+                # pages flow straight into the saver, chunks of 50 are saved as soon as they are complete.
+                pages = self.data_fetcher.iter_paginated_articles(self.BASE_URL, response_data.get('total'),
+                                                                  **pagination)
+                self.data_saver.save_stream(self.journaled_pages(pages), chunk_size=50)
+                self.finish_journal()
+                return
 
             # get all articles from paginated pages.
-            paginated_articles = self.data_fetcher.fetch_paginated_articles(base_url, response_data.get('total'))
+            paginated_articles = self.data_fetcher.fetch_paginated_articles(self.BASE_URL, response_data.get('total'),
+                                                                            **pagination)
+
+            if journal:
+                journal.record_page(self.BASE_URL, paginated_articles.get("results"))
+                journal.record_page(self.LISTING_COMPLETE, [])
 
             # save the remaining articles in chunks of 50.
             if paginated_articles:
                 self.data_saver.save_data_in_chunks(paginated_articles.get("results"), chunk_size=50)
 
+            self.finish_journal()
+
         except Exception as ex:
             print(f"Error processing news data: {ex}")
 
+    def fetch_first_page(self, discover_page_size: bool = True):
+        """
+        fetches the first listing page, with the largest page size the API honours if discover_page_size is set.
+
+        the page size found by a previous run is taken from the sync state, it is probed again only if the API
+        does not honour it anymore. when the page size is probed, the winning probe is the first page.
+
+        :return: tuple of (first page response, page size parameter or None, page size).
+        """
+        if not discover_page_size:
+            return self.data_fetcher.fetch_articles(api_url=self.FIRST_PAGE_URL), None, DataFetcher.DEFAULT_PAGE_SIZE
+
+        stored = self.sync_state.page_size_of(self.BASE_URL) if self.sync_state else None
+        if stored:
+            page_size_param, page_size = stored
+            if page_size_param is None:
+                return self.data_fetcher.fetch_articles(api_url=self.FIRST_PAGE_URL), None, page_size
+
+            response_data = self.data_fetcher.fetch_articles(
+                api_url=DataFetcher.first_page_url(self.BASE_URL, page_size_param, page_size)
+            )
+            results = response_data.get('results', []) if response_data else []
+            if response_data and len(results) >= min(page_size, response_data.get('total', 0)):
+                return response_data, page_size_param, page_size
+
+            self.logger.warning(f"stored page size {page_size_param}={page_size} is not honoured, probing again.")
+            self.sync_state.forget_page_size(self.BASE_URL)
+
+        page_size_param, page_size, response_data = self.data_fetcher.discover_page_size(self.BASE_URL)
+        if self.sync_state:
+            self.sync_state.save_page_size(self.BASE_URL, page_size_param, page_size)
+
+        if response_data is None:
+            first_page_url = DataFetcher.first_page_url(self.BASE_URL, page_size_param, page_size) \
+                if page_size_param else self.FIRST_PAGE_URL
+            response_data = self.data_fetcher.fetch_articles(api_url=first_page_url)
+
+        return response_data, page_size_param, page_size
+
+    def journaled_pages(self, pages):
+        """records every streamed page in the journal before passing it on to the saver."""
+        journal = self.data_saver.journal
+        for index, page in enumerate(pages):
+            if journal:
+                journal.record_page(f"{self.BASE_URL}#page-{index}", page)
+            yield page
+
+        if journal:
+            journal.record_page(self.LISTING_COMPLETE, [])
+
+    def finish_journal(self):
+        if self.data_saver.journal:
+            self.data_saver.journal.finish()
+
+    def resume_news_data(self, state, stream: bool = False, discover_page_size: bool = True):
+        """
+        continues an interrupted crawl: saves the listed articles that were not processed yet,
+        and fetches the listing again only if it was not complete (saved articles are skipped by the saver).
+        """
+        pending = state.pending('url')
+        self.logger.info(f"resuming crawl, {len(state.pages)} pages fetched, {len(state.done)} articles processed, "
+                         f"{len(pending)} articles pending.")
+
+        try:
+            self.data_saver.save_data_in_chunks(pending, chunk_size=50)
+
+        except Exception as ex:
+            self.logger.error(f"Error resuming news data: {ex}")
+            return
+
+        if self.LISTING_COMPLETE in state.pages:
+            self.finish_journal()
+            return
+
+        self.process_news_data(stream=stream, discover_page_size=discover_page_size)
+
+    def retry_dead_letters(self):
+        """
+        re-queues the pages and articles that failed in previous runs,
+        items that fail again go back to the dead letters.
+        """
+        dead_letters = self.data_saver.dead_letters
+        if not dead_letters:
+            return
+
+        pages = dead_letters.drain("page")
+        articles = dead_letters.drain("article")
+        self.logger.info(f"retrying {len(pages)} pages and {len(articles)} articles from dead letters.")
+
+        for page_url in pages:
+            response_data = self.data_fetcher.fetch_page(page_url)
+            if response_data:
+                articles.extend(response_data.get('results', []))
+
+        if articles:
+            self.data_saver.save_data_in_chunks(articles, journaled=False)
+
+    def sync_news_data(self, interval=10):
+        """
+        delta sync: walks the pages newest-first and stops at the first page that contains only
+        articles that are already saved (or that are all older than the sync watermark).
+        only the new articles are saved, and the watermark is moved to the newest publish date.
+
+        :param interval: The number of articles per page.
+        :return: list of the new raw articles.
+        """
+        saved_urls = self.data_saver.saved_urls()
+        new_items = []
+        skip = 0
+
+        try:
+            while True:
+                api_url = self.FIRST_PAGE_URL if skip == 0 else f"{self.BASE_URL}&skip={skip}&culture=en"
+                response_data = self.data_fetcher.fetch_articles(api_url=api_url)
+                results = response_data.get('results') if response_data else None
+                if not results:
+                    break
+
+                fresh_items = [item for item in results if item['url'] not in saved_urls]
+                new_items.extend(fresh_items)
+
+                if not fresh_items:
+                    self.logger.info(f"page with skip={skip} is already saved, stopping sync.")
+                    break
+
+                if self.sync_state and all(map(self.sync_state.is_older_than_watermark, fresh_items)):
+                    self.logger.info(f"page with skip={skip} is older than the watermark, stopping sync.")
+                    break
+
+                skip += interval
+                if skip >= response_data.get('total', 0):
+                    break
+
+            if new_items:
+                # a sync never starts or finishes the crawl journal, so it does not write to it either.
+                self.data_saver.save_data_in_chunks(new_items, journaled=False)
+
+            if self.sync_state:
+                self.sync_state.update(new_items)
+
+            self.logger.info(f"sync finished, {len(new_items)} new articles found.")
+
+        except Exception as ex:
+            self.logger.error(f"Error syncing news data: {ex}")
+
+        return new_items
+
     @staticmethod
     def remove_html_tags(html_content):
         """
         Removes HTML tags from the given content and returns the plain text.
         """
-        clean_text = re.sub(r'<[^>]+>', '', html_content)  # Regular expression to remove HTML tags
-        return clean_text
+        return html_to_text(html_content)
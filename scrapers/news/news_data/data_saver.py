@@ -1,12 +1,29 @@
 import json
+import concurrent.futures
 from .data_fetcher import DataFetcher
+from .article_transformer import extract_tags, build_article
+from .article_record import ArticleRecord
 from utils import remove_html_tags
 
 
 class DataSaver:
-    def __init__(self, file_name, logger):
+    def __init__(self, file_name, logger, data_fetcher=None, workers=8, storage=None, dead_letters=None,
+                 transformer=None, journal=None):
         self.file_name = file_name
         self.logger = logger
+        # optional CrawlJournal, the urls of every saved chunk are recorded there as processed.
+        self.journal = journal
+        # optional ArticleTransformer, when set the worker threads only fetch and parsing runs in its process pool.
+        self.transformer = transformer
+        # optional DeadLetterQueue, articles that could not be processed are kept there for the next run.
+        self.dead_letters = dead_letters
+        # optional append-only storage (e.g. JsonlArticleStorage), used instead of rewriting file_name.
+        self.storage = storage
+        # number of articles whose content is fetched and parsed concurrently.
+        self.workers = workers
+        # any object with a fetch_article_content method (DataFetcher / AsyncDataFetcher), a fetcher that also has
+        # fetch_article_contents (AsyncDataFetcher) gets the contents of a whole chunk in one call.
+        self.data_fetcher = data_fetcher if data_fetcher else DataFetcher(logger)
 
     @staticmethod
     def extract_tags(tags):
@@ -16,16 +33,7 @@ class DataSaver:
 
         :return: organized dictionary for easy storage in a Json file.
         """
-        tag_data = {}
-        if 'metaData' in tags:
-            for tag_name, tag_list in tags['metaData'].items():
-                tag_data[tag_name] = [tag['title'] for tag in tag_list]
-
-        if 'promotedMetaData' in tags:
-            for tag_name, tag_list in tags['promotedMetaData'].items():
-                tag_data[tag_name] = [tag['title'] for tag in tag_list]
-
-        return tag_data
+        return extract_tags(tags)
 
     def extract_section_data(self, article_content):
         """
@@ -44,6 +52,9 @@ class DataSaver:
 
     def load_existing_data(self):
         """Loads existing news_data from the JSON file."""
+        if self.storage:
+            return self.storage.load_all()
+
         try:
             with open(self.file_name, 'r', encoding='utf-8') as f:
                 return json.load(f)
@@ -53,25 +64,27 @@ class DataSaver:
             self.logger.warning("file not exist, returns empty list.")
             return []
 
-    def get_json_format_response(self, item: dict):
-        article_response = DataFetcher.fetch_article_content(item.get("url"))
+    def fetch_article_response(self, item: dict):
+        """returns the content-pages response of an article, raises ValueError if there is no content."""
+        article_response = self.data_fetcher.fetch_article_content(item.get("url"))
 
         if article_response is None:
             self.logger.error(f"No content in: {item.get('url')}")
             raise ValueError(f"No content returned for {item.get('url')}")
 
+        return article_response
+
+    def load_records(self):
+        """Loads existing news_data as compact ArticleRecord objects, for keeping large corpora in memory."""
+        return ArticleRecord.from_dicts(self.load_existing_data())
+
+    def get_json_format_response(self, item: dict, article_response=None):
+        if article_response is None:
+            article_response = self.fetch_article_response(item)
+
         article_content = DataSaver.extract_section_data(self, article_content=article_response)
 
-        article = {
-            'title': item['title'],
-            'url': item['url'],
-            'publish_date': item['tags']['metaData']['Publish Date'][0]['title'] if
-            'Publish Date' in item['tags']['metaData'] else None,
-            'description': item['description'],
-            'tags': self.extract_tags(item['tags']),
-            'article_content': article_content
-        }
-        return article
+        return build_article(item, article_content)
 
     def load_articles_from_file(self):
         """
@@ -79,6 +92,9 @@ class DataSaver:
         if the file exist -> return list of all file news_data.
         if file not exist -> return empty list.
         """
+        if self.storage:
+            return self.storage.load_all()
+
         try:
             # Try to open the existing file to append news_data.
             with open(self.file_name, 'r', encoding='utf-8') as f:
@@ -102,46 +118,176 @@ class DataSaver:
 
         return [article[key] for article in articles]
 
-    def save_data_in_chunks(self, data, chunk_size=100):
+    def get_article_or_none(self, item: dict, article_response=None):
+        """
+        wraps get_json_format_response for the worker threads,
+        logs the error and returns None if the article could not be processed.
+
+        when a transformer is set only the content is fetched, and an (item, article_response) pair is returned.
+
+        :param article_response: the content response of the article, if it was already fetched.
+        """
+        try:
+            if self.transformer:
+                return item, article_response if article_response is not None else self.fetch_article_response(item)
+
+            # get article in json format for easy save in json file.
+            return self.get_json_format_response(item, article_response)
+
+        except ValueError as ex:
+            self.logger.error(f"Value error: {ex}")
+            self.add_dead_letter(item, ex)
+
+        except Exception as e:
+            self.logger.error(f"Error processing article {item.get('url')}: {e}")
+            self.add_dead_letter(item, e)
+
+        return None
+
+    def get_articles_or_none(self, items):
+        """
+        batch version of get_article_or_none, the contents of all the items are fetched with one
+        fetch_article_contents call, which runs the requests concurrently on the fetcher event loop.
+
+        :return: list in the order of items, None for the articles that could not be processed.
+        """
+        try:
+            article_responses = self.data_fetcher.fetch_article_contents([item.get("url") for item in items])
+
+        except Exception as e:
+            self.logger.error(f"Error fetching the contents of {len(items)} articles: {e}")
+            article_responses = [None] * len(items)
+
+        articles = []
+        for item, article_response in zip(items, article_responses):
+            if article_response is None:
+                error = ValueError(f"No content returned for {item.get('url')}")
+                self.logger.error(f"Value error: {error}")
+                self.add_dead_letter(item, error)
+                articles.append(None)
+            else:
+                articles.append(self.get_article_or_none(item, article_response))
+
+        return articles
+
+    def add_dead_letter(self, item: dict, error: Exception):
+        if self.dead_letters is not None:
+            self.dead_letters.add("article", item, str(error))
+
+    def saved_urls(self):
+        """
+        returns a container of all saved urls that supports fast "in" checks.
+        """
+        if self.storage:
+            return self.storage
+
+        return set(self.extract_values_from_json('url'))
+
+    def save_data_in_chunks(self, data, chunk_size=100, workers=None, journaled=True):
         """
         the function receives a list of articles and saves the relevant parameters in a json file.
 
         function steps:
             1. check of file already exist, if not exist, create new file.
             2. checks if urls exist to prevent double saving in the json file.
-            3. save files in chunks to improve performance.
+            3. fetches the content of each chunk concurrently, while the next chunk is already being fetched
+               the current one is written to the file.
+            4. save files in chunks to improve performance.
+
+        articles are saved in the same order as in data, regardless of which request finished first.
 
         :param data: A dictionary that contains a list of articles.
         :param chunk_size: 100 by default.
+        :param workers: number of concurrent content requests, self.workers by default.
+        :param journaled: record the saved urls in the journal, only the chunks of a full crawl are journaled.
         :return:
         """
-        # check if file exist.
-        articles = self.load_articles_from_file()
+        # check if file exist, the storage index answers membership checks without loading anything.
+        articles = [] if self.storage else self.load_articles_from_file()
 
-        # create a list of existing URLs to prevent duplicates.
-        existing_urls = [article['url'] for article in articles]
+        # create a set of existing URLs to prevent duplicates.
+        existing_urls = {article['url'] for article in articles}
 
-        # Save news_data in chunks to improve performance
+        # split the new articles into chunks, skipping urls that already exist.
+        chunks = []
         for i in range(0, len(data), chunk_size):
-            chunk = data[i:i + chunk_size]
-
-            for item in chunk:
+            chunk = []
+            for item in data[i:i + chunk_size]:
                 # checking if the article already exists by URL
-                if item['url'] not in existing_urls:
-                    try:
-                        # get article in json format for easy save in json file.
-                        article = self.get_json_format_response(item)
+                if item['url'] not in existing_urls and not (self.storage and self.storage.contains(item['url'])):
+                    existing_urls.add(item['url'])
+                    chunk.append(item)
+
+            chunks.append(chunk)
+
+        batch = hasattr(self.data_fetcher, "fetch_article_contents")
+
+        def submit(executor, chunk):
+            """returns futures of article lists, a batch fetcher gets the whole chunk in one call."""
+            if batch:
+                return [executor.submit(self.get_articles_or_none, chunk)]
+
+            return [executor.submit(lambda item: [self.get_article_or_none(item)], item) for item in chunk]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers or self.workers) as executor:
+            # the producer stays one chunk ahead of the consumer.
+            pending = submit(executor, chunks[0]) if chunks else []
+
+            for index in range(len(chunks)):
+                current = pending
+                if index + 1 < len(chunks):
+                    pending = submit(executor, chunks[index + 1])
+
+                # futures are consumed in submission order to keep the output deterministic.
+                new_articles = [article for future in current for article in future.result() if article]
+
+                if self.transformer:
+                    # parsing runs in the process pool while the worker threads already fetch the next chunk.
+                    # malformed items go to the dead letters, like in the in-process path.
+                    new_articles = [article for article in self.transformer.transform_batch(
+                        new_articles, on_error=self.add_dead_letter
+                    ) if article]
+
+                if self.storage:
+                    # append only the new articles of this chunk.
+                    self.storage.add_many(new_articles)
+                else:
+                    articles.extend(new_articles)
+
+                    # Saving news_data to JSON file in chunks.
+                    with open(self.file_name, 'w', encoding='utf-8') as f:
+                        json.dump(articles, f, ensure_ascii=False, indent=4)
+                        self.logger.info("news_data chunk saved successfully in json file.")
+
+                if self.journal and journaled:
+                    # articles that failed stay pending, so a resumed crawl retries them.
+                    self.journal.record_done([article['url'] for article in new_articles])
+
+    def save_stream(self, pages, chunk_size=100, workers=None):
+        """
+        saves articles from a stream of pages (e.g. DataFetcher.iter_paginated_articles) as they arrive.
+
+        articles are buffered only until a full chunk is collected, so with a storage the memory is bounded
+        by chunk_size and not by the size of the archive.
+
+        :param pages: iterable of article lists.
+        :param chunk_size: number of articles saved together.
+        :param workers: number of concurrent content requests, self.workers by default.
+        :return: number of articles received from the stream.
+        """
+        buffer = []
+        received = 0
 
-                        articles.append(article)
-                        existing_urls.append(item['url'])
+        for page in pages:
+            buffer.extend(page)
+            received += len(page)
 
-                    except ValueError as ex:
-                        self.logger.error(f"Value error: {ex}")
+            while len(buffer) >= chunk_size:
+                self.save_data_in_chunks(buffer[:chunk_size], chunk_size=chunk_size, workers=workers)
+                del buffer[:chunk_size]
 
-                    except Exception as e:
-                        self.logger.error(f"Error processing article {item.get('url')}: {e}")
+        if buffer:
+            self.save_data_in_chunks(buffer, chunk_size=chunk_size, workers=workers)
 
-            # Saving news_data to JSON file in chunks.
-            with open(self.file_name, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=4)
-                self.logger.info("news_data chunk saved successfully in json file.")
+        self.logger.info(f"stream finished, {received} articles received.")
+        return received
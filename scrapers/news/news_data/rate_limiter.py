@@ -0,0 +1,118 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class AdaptiveRateLimiter:
+    """
+    AdaptiveRateLimiter caps the number of concurrent API requests with an AIMD scheme.
+
+    - additive increase: while the smoothed latency stays close to the best latency seen so far,
+      the limit grows by about one request per round of completed requests.
+    - multiplicative decrease: on throttling (429/503), server errors or request failures the limit is cut
+      by backoff_factor, at most once per latency window so a burst of failures is one signal.
+    - Retry-After headers pause all new requests until the given time.
+    """
+    THROTTLE_STATUS_CODES = {429, 503}
+
+    def __init__(self, logger=None, initial_limit=4, min_limit=1, max_limit=32, latency_tolerance=1.5,
+                 backoff_factor=0.5, smoothing=0.2):
+        """
+        :param initial_limit: concurrency limit at start.
+        :param min_limit: the limit never drops below this value.
+        :param max_limit: the limit never grows above this value.
+        :param latency_tolerance: latency growth (relative to the best latency) that stops the increase.
+        :param backoff_factor: the limit is multiplied by this value on throttling or errors.
+        :param smoothing: weight of the newest latency in the moving average.
+        """
+        self.logger = logger
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_factor = backoff_factor
+        self.smoothing = smoothing
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._latency = None
+        self._best_latency = None
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """the current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        """blocks until a request may be sent."""
+        with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self._in_flight >= self.limit:
+                    self._condition.wait()
+                else:
+                    self._in_flight += 1
+                    return
+
+    def release(self, latency: float, status_code: int = None, retry_after: str = None):
+        """
+        reports the result of a request and frees its slot.
+
+        :param latency: seconds the request took.
+        :param status_code: response status code, None if the request failed without a response.
+        :param retry_after: value of the Retry-After header, if any.
+        """
+        with self._condition:
+            self._in_flight -= 1
+
+            if retry_after:
+                self._pause(retry_after)
+
+            if status_code is None or status_code in self.THROTTLE_STATUS_CODES or status_code >= 500:
+                self._decrease()
+            else:
+                self._observe_latency(latency)
+
+            self._condition.notify_all()
+
+    def _observe_latency(self, latency):
+        self._latency = latency if self._latency is None else \
+            self.smoothing * latency + (1 - self.smoothing) * self._latency
+        self._best_latency = self._latency if self._best_latency is None else min(self._best_latency, self._latency)
+
+        if self._latency <= self._best_latency * self.latency_tolerance:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < (self._latency or 0):
+            return
+
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * self.backoff_factor)
+        if self.logger:
+            self.logger.warning(f"upstream throttling or errors, concurrency limit decreased to {self.limit}")
+
+    def _pause(self, retry_after):
+        """Retry-After is either a number of seconds or an HTTP date."""
+        try:
+            seconds = float(retry_after)
+
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+
+            except (TypeError, ValueError):
+                return
+
+        self._paused_until = max(self._paused_until, time.monotonic() + max(seconds, 0))
+        if self.logger:
+            self.logger.warning(f"Retry-After received, pausing requests for {seconds:.1f} seconds")
@@ -0,0 +1,186 @@
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    """raised instead of sending a request while the circuit of its endpoint is open."""
+    pass
+
+
+class RetryPolicy:
+    """
+    exponential backoff with full jitter: the n-th retry waits a random time between 0 and base_delay * 2^n.
+    """
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """returns the seconds to wait before the given retry (0 for the first retry)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def should_retry(self, response):
+        return response.status_code in self.RETRY_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    fails fast while an endpoint is down.
+
+    after failure_threshold consecutive failures the circuit opens and requests are rejected.
+    after reset_timeout seconds one trial request is let through (half-open),
+    its success closes the circuit and its failure opens it again.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """returns True if a request may be sent."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # let a single trial request through.
+                self.state = self.HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class DeadLetterQueue:
+    """
+    persistent list of items that failed permanently (pages, articles),
+    they are re-queued by the next run with drain().
+    """
+    def __init__(self, file_name, logger):
+        self.file_name = file_name
+        self.logger = logger
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.file_name, 'r', encoding='utf-8') as f:
+                self.items = json.load(f)
+
+        except FileNotFoundError:
+            self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, kind: str, value, reason: str = None):
+        """
+        :param kind: type of the failed item, e.g. "page" or "article".
+        :param value: data needed to retry the item (a url or a raw article).
+        :param reason: error description.
+        """
+        with self._lock:
+            self.items.append({'kind': kind, 'value': value, 'reason': reason})
+            self._save()
+
+        self.logger.warning(f"{kind} added to dead letters: {reason}")
+
+    def drain(self, kind: str = None):
+        """removes and returns the values of the items of the given kind (all kinds by default)."""
+        with self._lock:
+            drained = [item['value'] for item in self.items if kind is None or item['kind'] == kind]
+            self.items = [item for item in self.items if kind is not None and item['kind'] != kind]
+            self._save()
+
+        return drained
+
+    def _save(self):
+        with open(self.file_name, 'w', encoding='utf-8') as f:
+            json.dump(self.items, f, ensure_ascii=False, indent=4)
+
+
+class Resilience:
+    """
+    shared resilience layer of the fetch layer: jittered exponential retries, one circuit breaker per endpoint
+    and a dead-letter queue for the items that failed after all retries.
+    """
+    def __init__(self, logger, retry_policy: RetryPolicy = None, dead_letters: DeadLetterQueue = None,
+                 failure_threshold=5, reset_timeout=60.0):
+        self.logger = logger
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
+        self.dead_letters = dead_letters
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_of(url):
+        """the endpoint of a url is its host and first path segment, e.g. www.gov.il/ContentPageWebApi."""
+        parts = urlsplit(url)
+        return f"{parts.netloc}/{parts.path.strip('/').split('/')[0]}"
+
+    def breaker_for(self, url):
+        endpoint = self.endpoint_of(url)
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+
+            return self.breakers[endpoint]
+
+    def call(self, url, send):
+        """
+        calls send() until it returns a response that should not be retried, or the attempts run out.
+
+        :param url: url of the request, selects the circuit breaker.
+        :param send: function that sends the request and returns a response.
+        :return: the last response, raises the last exception if no response was received.
+        """
+        breaker = self.breaker_for(url)
+
+        for attempt in range(self.retry_policy.max_attempts):
+            if attempt:
+                time.sleep(self.retry_policy.delay(attempt - 1))
+
+            if not breaker.allow():
+                raise CircuitOpenError(f"circuit of {self.endpoint_of(url)} is open, {url} was not sent")
+
+            try:
+                response = send()
+
+            except requests.RequestException as e:
+                breaker.record_failure()
+                self.logger.warning(f"attempt {attempt + 1} of {url} failed: {e}")
+                if attempt + 1 == self.retry_policy.max_attempts:
+                    raise
+                continue
+
+            if not self.retry_policy.should_retry(response):
+                breaker.record_success()
+                return response
+
+            breaker.record_failure()
+            self.logger.warning(f"attempt {attempt + 1} of {url} returned {response.status_code}")
+
+        return response
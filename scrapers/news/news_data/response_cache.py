@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResponse:
+    """
+    minimal response object returned for cache hits, it has the parts of requests.Response that DataFetcher uses.
+    """
+    def __init__(self, entry: dict):
+        self.status_code = 200
+        self.headers = entry.get('headers', {})
+        self.from_cache = True
+        self._body = entry['body']
+
+    def json(self):
+        return self._body
+
+
+class ResponseCache:
+    """
+    on-disk cache of JSON API responses keyed by url.
+
+    every entry keeps the ETag / Last-Modified validators of the response, so stale entries are
+    revalidated with a conditional GET and a 304 answer costs no payload.
+    the total size of the cache directory is bounded, the least recently used entries are evicted first.
+    """
+    VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+    def __init__(self, directory, logger, max_bytes=100 * 1024 * 1024, default_ttl=0, ttl_overrides: dict = None):
+        """
+        :param directory: cache directory, created if it does not exist.
+        :param max_bytes: max total size of the cached entries.
+        :param default_ttl: seconds an entry is served without revalidation.
+        :param ttl_overrides: maps a url substring (e.g. an endpoint path) to its own ttl in seconds.
+        """
+        self.directory = directory
+        self.logger = logger
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_overrides = ttl_overrides or {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # key -> entry size, ordered from least to most recently used (file mtime is the access time).
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".json"):
+                stat = os.stat(os.path.join(self.directory, file_name))
+                entries.append((stat.st_mtime, file_name[:-len(".json")], stat.st_size))
+
+        self._entries = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._total_bytes = sum(self._entries.values())
+
+    @staticmethod
+    def key_of(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def ttl_for(self, url):
+        """returns the ttl of the first override whose pattern appears in the url, default_ttl otherwise."""
+        for pattern, ttl in self.ttl_overrides.items():
+            if pattern in url:
+                return ttl
+
+        return self.default_ttl
+
+    def get(self, url):
+        """returns the cached entry of the url, or None if it is not cached."""
+        key = self.key_of(url)
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+
+            except (OSError, json.JSONDecodeError) as e:
+                self.logger.warning(f"dropping unreadable cache entry of {url}: {e}")
+                self._remove(key)
+                return None
+
+            self._mark_used(key)
+            return entry
+
+    def is_fresh(self, url, entry: dict):
+        """returns True if the entry can be served without asking the server."""
+        return time.time() - entry['stored_at'] < self.ttl_for(url)
+
+    @staticmethod
+    def conditional_headers(entry: dict):
+        """returns the If-None-Match / If-Modified-Since headers of a cached entry."""
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        return headers
+
+    def store(self, url, response):
+        """
+        stores a 200 response and evicts least recently used entries above max_bytes.
+
+        :return: CachedResponse with the parsed body, so the body is parsed only once.
+        """
+        entry = {
+            'url': url,
+            'stored_at': time.time(),
+            'headers': {name: response.headers[name] for name in self.VALIDATOR_HEADERS if name in response.headers},
+            'body': response.json()
+        }
+        self._write(self.key_of(url), entry)
+        return CachedResponse(entry)
+
+    def revalidated(self, url, entry: dict):
+        """
+        called when the server answered 304, restarts the ttl of the entry.
+
+        :return: CachedResponse of the entry.
+        """
+        entry['stored_at'] = time.time()
+        self._write(self.key_of(url), entry)
+        return CachedResponse(entry)
+
+    def _write(self, key, entry):
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        temp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+
+        with self._lock:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+
+            self._total_bytes += len(data) - self._entries.get(key, 0)
+            self._entries[key] = len(data)
+            self._entries.move_to_end(key)
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+
+    def _mark_used(self, key):
+        self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+
+        except OSError:
+            pass
+
+    def _remove(self, key):
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+
+        except OSError:
+            pass
@@ -0,0 +1,83 @@
+import json
+from datetime import datetime
+from utils import parse_date
+
+
+class SyncState:
+    """
+    SyncState keeps the watermark of the incremental news sync in a small json file.
+
+    the watermark is the newest publish date that was saved by the last sync,
+    together with the time of that run. the page sizes found by DataFetcher.discover_page_size are kept
+    in the same file, so the next runs do not probe the API again.
+    """
+    def __init__(self, file_name, logger):
+        self.file_name = file_name
+        self.logger = logger
+        self.last_publish_date = None
+        self.last_run = None
+        # base url -> [page size parameter or None, page size].
+        self.page_sizes = {}
+        self.load()
+
+    @staticmethod
+    def parse_date(value):
+        """parses a publish date string, returns None if the format is unknown."""
+        return parse_date(value)
+
+    @staticmethod
+    def publish_date_of(item: dict):
+        """returns the parsed publish date of a raw API item, None if it has no valid date."""
+        publish_dates = item.get('tags', {}).get('metaData', {}).get('Publish Date', [])
+        return SyncState.parse_date(publish_dates[0].get('title')) if publish_dates else None
+
+    def load(self):
+        """loads the watermark from the state file, if the file exists."""
+        try:
+            with open(self.file_name, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+        except FileNotFoundError:
+            self.logger.warning("sync state file not exist, starting without a watermark.")
+            return
+
+        self.last_publish_date = datetime.fromisoformat(state['last_publish_date']) \
+            if state.get('last_publish_date') else None
+        self.last_run = state.get('last_run')
+        self.page_sizes = state.get('page_sizes', {})
+
+    def update(self, items: list):
+        """moves the watermark forward to the newest publish date of the given items and saves it."""
+        publish_dates = [date for date in map(self.publish_date_of, items) if date]
+        if publish_dates and (self.last_publish_date is None or max(publish_dates) > self.last_publish_date):
+            self.last_publish_date = max(publish_dates)
+
+        self.last_run = datetime.now().isoformat(timespec="seconds")
+        self.save()
+
+    def page_size_of(self, base_url):
+        """returns the stored (page size parameter, page size) of a base url, None if it was never discovered."""
+        page_size = self.page_sizes.get(base_url)
+        return tuple(page_size) if page_size else None
+
+    def save_page_size(self, base_url, page_size_param, page_size):
+        """stores the discovered page size of a base url and saves the state file."""
+        self.page_sizes[base_url] = [page_size_param, page_size]
+        self.save()
+
+    def forget_page_size(self, base_url):
+        self.page_sizes.pop(base_url, None)
+        self.save()
+
+    def save(self):
+        with open(self.file_name, 'w', encoding='utf-8') as f:
+            json.dump({
+                'last_publish_date': self.last_publish_date.isoformat() if self.last_publish_date else None,
+                'last_run': self.last_run,
+                'page_sizes': self.page_sizes
+            }, f, ensure_ascii=False, indent=4)
+
+    def is_older_than_watermark(self, item: dict):
+        """returns True only if the item has a publish date that is older than the watermark."""
+        publish_date = self.publish_date_of(item)
+        return bool(self.last_publish_date and publish_date and publish_date < self.last_publish_date)
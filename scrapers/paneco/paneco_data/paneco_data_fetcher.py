@@ -1,12 +1,72 @@
+import concurrent.futures
+import json
+import math
+import re
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
+import requests
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
+from utils import parse_html
+
+# extracts the raw fields of all the product nodes in a single WebDriver round-trip, mapped by product_from_row.
+EXTRACT_PRODUCTS_SCRIPT = """
+const text = (root, selector) => {
+    const element = root ? root.querySelector(selector) : null;
+    return element ? element.innerText.trim() : null;
+};
+return Array.from(document.querySelectorAll(arguments[0])).map(product => {
+    const link = product.querySelector('a');
+    return {
+        name: text(product, 'strong.product-item-name a'),
+        regular_price: text(product.querySelector('.price-wrapper'), '.price'),
+        discounted_price: text(product.querySelector('.special-price .price-wrapper'), '.price'),
+        volume: text(product, 'span.unit'),
+        internal_link: link ? link.href : null
+    };
+});
+"""
 
 
 class PanecoDataFetcher:
-    def __init__(self, scraper, logger):
+    HTTP_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; scraping_assignment)"}
+    HTTP_TIMEOUT = 20
+
+    def __init__(self, scraper, logger, bulk_extraction=True, driver_pool=None, retries=2, http_details=False,
+                 http_workers=8, session=None, http_listing=False):
+        """
+        :param bulk_extraction: extract all listing products with one execute_script call,
+                                per-element WebDriver calls are used only if it fails.
+        :param driver_pool: optional DriverPool, product detail pages are scraped in parallel on its drivers.
+        :param retries: number of retries of a product detail page in the driver pool.
+        :param http_details: fetch product detail pages with plain http requests and parse the server rendered
+                             html, the browser is used only for the pages that could not be parsed.
+        :param http_workers: number of concurrent http requests of product detail pages.
+        :param session: optional requests.Session, a pooled session is created when http_details or
+                        http_listing is set.
+        :param http_listing: request the listing pages (?p=N) directly and in parallel instead of scrolling
+                             the infinite scroll in the browser, scrolling is used only if it fails.
+        """
         self.scraper = scraper
         self.logger = logger
+        self.bulk_extraction = bulk_extraction
+        self.driver_pool = driver_pool
+        self.retries = retries
+        self.http_details = http_details
+        self.http_workers = http_workers
+        self.http_listing = http_listing
+        self.session = session if session or not (http_details or http_listing) else self.create_session(http_workers)
+
+    @classmethod
+    def create_session(cls, pool_size):
+        """returns a requests session that keeps up to pool_size connections alive."""
+        session = requests.Session()
+        session.headers.update(cls.HTTP_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     @staticmethod
     def get_text_by_css(product, css_selector):
@@ -35,7 +95,7 @@ class PanecoDataFetcher:
         regular_price_element = wrapper_element.find_element(By.CLASS_NAME, "price")
         regular_price = regular_price_element.text.strip()
 
-        discounted_price = "not exist"
+        discounted_price = None
         try:
             discount_wrapper = product.find_element(By.CLASS_NAME, "special-price")
             price_wrapper = discount_wrapper.find_element(By.CLASS_NAME, "price-wrapper")
@@ -48,26 +108,153 @@ class PanecoDataFetcher:
         internal_link = self.get_link_by_tag_name(product)
 
         self.logger.info(f"all product: {name} data was successfully extracted.")
-        return {
-            "Name": name,
-            "Regular Price": regular_price,
-            "Discounted Price": discounted_price,
-            "Volume": volume,
+        return self.product_from_row({
+            "name": name,
+            "regular_price": regular_price,
+            "discounted_price": discounted_price,
+            "volume": volume,
             "internal_link": internal_link
+        })
+
+    @staticmethod
+    def product_from_row(row):
+        """
+        maps the raw fields of a listing product to the saved product dictionary, shared by extract_product_data,
+        extract_products_bulk and extract_product_node so all of them save the same keys and defaults.
+
+        :param row: dictionary with name, regular_price, discounted_price, volume and internal_link,
+                    a missing field is None.
+        """
+        return {
+            "Name": row.get("name") or "N/A",
+            "Regular Price": row.get("regular_price") or "N/A",
+            "Discounted Price": row.get("discounted_price") or "not exist",
+            "Volume": row.get("volume") or "N/A",
+            "internal_link": row.get("internal_link")
         }
 
-    def fetch_internal_product_info(self, product_url):
+    def extract_products_bulk(self, css_selector="li.item.product"):
+        """
+        extracts the data of all products with a single execute_script round-trip to the driver.
+
+        :return: list of product dictionaries with the same fields as extract_product_data.
+        """
+        rows = self.scraper.driver.execute_script(EXTRACT_PRODUCTS_SCRIPT, css_selector)
+
+        products = [self.product_from_row(row) for row in rows]
+
+        self.logger.info(f"{len(products)} products were successfully extracted in bulk.")
+        return products
+
+    @classmethod
+    def extract_product_node(cls, product, base_url):
+        """
+        extracts the fields of extract_product_data from a li.item.product node of parse_html.
+        """
+        def text(node, selector):
+            element = node.select_one(selector) if node else None
+            return element.text().strip() if element else None
+
+        link = product.select_one("a")
+        return cls.product_from_row({
+            "name": text(product, "strong.product-item-name a"),
+            "regular_price": text(product.select_one(".price-wrapper"), ".price"),
+            "discounted_price": text(product.select_one(".special-price .price-wrapper"), ".price"),
+            "volume": text(product, "span.unit"),
+            "internal_link": urljoin(base_url, link.get("href")) if link and link.get("href") else None
+        })
+
+    @staticmethod
+    def listing_page_url(url, page):
+        """returns the url of a listing page, replacing the p query parameter of url."""
+        parts = urlparse(url)
+        query = [(key, value) for key, value in parse_qsl(parts.query) if key != "p"]
+        query.append(("p", str(page)))
+        return urlunparse(parts._replace(query=urlencode(query)))
+
+    @staticmethod
+    def get_last_page(document, page_size):
+        """
+        returns the number of listing pages from the pager links, or from the "items x-y of total" toolbar.
+
+        :return: the last page number, or None if the page has neither of them.
+        """
+        pages = [int(number) for link in document.select(".pages a")
+                 for number in re.findall(r'[?&]p=(\d+)', link.get("href", ""))]
+        if pages:
+            return max(pages)
+
+        numbers = [number.text().strip() for number in document.select(".toolbar-amount .toolbar-number")]
+        if numbers and numbers[-1].isdigit() and page_size:
+            return math.ceil(int(numbers[-1]) / page_size)
+
+        return None
+
+    def fetch_listing_page(self, url):
+        """
+        fetches a listing page over http.
+
+        :return: tuple of the parsed document and its products.
+        """
+        response = self.session.get(url, timeout=self.HTTP_TIMEOUT)
+        response.raise_for_status()
+        document = parse_html(response.text)
+        products = [self.extract_product_node(product, url) for product in document.select("li.item.product")]
+        return document, products
+
+    def fetch_listing_over_http(self):
+        """
+        collects the listing by requesting its pages directly, http_workers pages at a time.
+
+        when the number of pages is not known, pages are requested in windows until a page adds no new products,
+        magento returns the last page again for page numbers past the end.
+
+        :return: list of product dictionaries with the same fields as extract_product_data.
+        """
+        base_url = self.scraper.url
+        first_document, products = self.fetch_listing_page(self.listing_page_url(base_url, 1))
+        last_page = self.get_last_page(first_document, len(products))
+        seen_links = {product["internal_link"] for product in products}
+
+        page = 2
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.http_workers) as executor:
+            while products and (last_page is None or page <= last_page):
+                window_end = page + self.http_workers
+                if last_page is not None:
+                    window_end = min(window_end, last_page + 1)
+                urls = [self.listing_page_url(base_url, number) for number in range(page, window_end)]
+
+                exhausted = False
+                for _, page_products in executor.map(self.fetch_listing_page, urls):
+                    new_products = [product for product in page_products if product["internal_link"] not in seen_links]
+                    seen_links.update(product["internal_link"] for product in new_products)
+                    products.extend(new_products)
+                    exhausted = exhausted or not new_products
+
+                if exhausted and last_page is None:
+                    break
+
+                page = window_end
+
+        self.logger.info(f"{len(products)} products were fetched from {page - 1} listing pages over http.")
+        return products
+
+    def fetch_internal_product_info(self, product_url, driver=None):
+        """
+        :param driver: the driver that opens the product page, the scraper driver by default.
+        """
+        driver = driver if driver else self.scraper.driver
 
         # open internal product page.
-        self.scraper.driver.get(product_url)
+        driver.get(product_url)
 
         # get bottle image.
-        WebDriverWait(self.scraper.driver, 10).until(
+        WebDriverWait(driver, 10).until(
             ec.visibility_of_element_located((By.CLASS_NAME, "page-wrapper"))
         )
         try:
             # wait until you find this html class that contains a link to the image.
-            image_element = WebDriverWait(self.scraper.driver, 10).until(
+            image_element = WebDriverWait(driver, 10).until(
                 ec.presence_of_element_located((By.CLASS_NAME, "fotorama__stage__shaft"))
             )
             bottle_image = image_element.find_element(By.TAG_NAME, "img").get_attribute("src")
@@ -76,7 +263,7 @@ class PanecoDataFetcher:
             self.logger.error(f"error {product_url}: {e}")
             bottle_image = "N/A"
 
-        description_elements = self.scraper.driver.find_elements(By.CSS_SELECTOR, "#description")
+        description_elements = driver.find_elements(By.CSS_SELECTOR, "#description")
         if description_elements:
             description = description_elements[0].text.strip()
         else:
@@ -89,6 +276,177 @@ class PanecoDataFetcher:
         self.logger.info(f"all internal product data has been successfully extracted.")
         return additional_data
 
+    @staticmethod
+    def get_gallery_image(document):
+        """
+        returns the main image of the product gallery, magento renders the gallery from a json config
+        inside <script type="text/x-magento-init"> so the image is in the html before any javascript runs.
+        """
+        for script in document.select("script"):
+            if script.get("type") != "text/x-magento-init":
+                continue
+
+            try:
+                config = json.loads("".join(child for child in script.children if isinstance(child, str)))
+            except ValueError:
+                continue
+
+            for widgets in config.values() if isinstance(config, dict) else []:
+                gallery = widgets.get("mage/gallery/gallery") if isinstance(widgets, dict) else None
+                images = gallery.get("data") if isinstance(gallery, dict) else None
+                if images:
+                    main_image = next((image for image in images if image.get("isMain")), images[0])
+                    if main_image.get("img"):
+                        return main_image["img"]
+
+        return None
+
+    def parse_internal_product_info(self, html):
+        """
+        parses the server rendered html of a product page into the fields of fetch_internal_product_info.
+
+        :return: the internal product info, or None if the page does not look like a product page.
+        """
+        document = parse_html(html)
+        if not document.select_one(".page-wrapper"):
+            return None
+
+        description_element = document.select_one("#description")
+        description = description_element.text().strip() if description_element else ""
+
+        bottle_image = self.get_gallery_image(document)
+        if not bottle_image:
+            og_image = next((meta for meta in document.select("meta") if meta.get("property") == "og:image"), None)
+            bottle_image = og_image.get("content") if og_image else None
+
+        if not description and not bottle_image:
+            return None
+
+        return {
+            "description": description or "N/A",
+            "bottle_image": bottle_image or "N/A",
+        }
+
+    def fetch_internal_product_info_http(self, product_url):
+        """
+        fetches a product detail page without a browser.
+
+        :return: the internal product info, or None if the request failed or the page could not be parsed.
+        """
+        try:
+            response = self.session.get(product_url, timeout=self.HTTP_TIMEOUT)
+            response.raise_for_status()
+            internal_info = self.parse_internal_product_info(response.text)
+
+        except Exception as e:
+            self.logger.error(f"http fetch of {product_url} failed: {e}")
+            return None
+
+        if internal_info is None:
+            self.logger.warning(f"could not parse {product_url} without a browser.")
+
+        return internal_info
+
+    def fetch_internal_product_info_with_driver(self, product_url):
+        """fetches a product detail page on the scraper driver, returns None if it failed."""
+        try:
+            return self.fetch_internal_product_info(product_url)
+
+        except Exception as e:
+            self.logger.error(f"failed to fetch {product_url}: {e}")
+            return None
+
+    def fetch_internal_product_info_pooled(self, product_url):
+        """
+        fetches a product detail page on a driver of the pool, retrying up to self.retries times.
+        a driver that stopped responding is replaced before the next attempt.
+
+        :return: the internal product info, or None if all attempts failed.
+        """
+        driver = self.driver_pool.acquire()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    return self.fetch_internal_product_info(product_url, driver)
+
+                except Exception as e:
+                    self.logger.error(f"attempt {attempt + 1} of {product_url} failed: {e}")
+
+                    try:
+                        driver.current_url
+
+                    except Exception:
+                        self.logger.warning("driver is not responding, replacing it.")
+                        try:
+                            driver = self.driver_pool.replace(driver)
+
+                        except Exception as replace_error:
+                            # the old driver was quit and the pool took its slot back, there is nothing to release.
+                            self.logger.error(f"failed to replace driver, giving up {product_url}: {replace_error}")
+                            driver = None
+                            return None
+
+            return None
+
+        finally:
+            if driver is not None:
+                self.driver_pool.release(driver)
+
+    def fetch_internal_products_info(self, product_urls, on_result=None):
+        """
+        fetches the detail pages of many products concurrently.
+
+        with http_details the pages are first fetched with plain http requests, and only the pages
+        that failed are opened in a browser: on the drivers of the pool, or one by one on the scraper driver.
+
+        :param product_urls: product links, duplicates are fetched once.
+        :param on_result: optional callback(product_url, internal_info), called from the calling thread
+                          as soon as each page is done.
+        :return: dictionary of product link -> internal product info (None if it failed).
+        """
+        results = {}
+        pending_urls = list(dict.fromkeys(url for url in product_urls if url))
+
+        def collect(url, internal_info):
+            results[url] = internal_info
+            if on_result:
+                on_result(url, internal_info)
+
+        if self.http_details:
+            failed_urls = []
+            for url, internal_info in self.map_concurrently(self.fetch_internal_product_info_http, pending_urls,
+                                                            self.http_workers):
+                if internal_info is None:
+                    failed_urls.append(url)
+                else:
+                    collect(url, internal_info)
+
+            if failed_urls:
+                self.logger.info(f"{len(failed_urls)} product pages fall back to the browser.")
+            pending_urls = failed_urls
+
+        if self.driver_pool:
+            for url, internal_info in self.map_concurrently(self.fetch_internal_product_info_pooled, pending_urls,
+                                                            self.driver_pool.size):
+                collect(url, internal_info)
+        else:
+            for url in pending_urls:
+                collect(url, self.fetch_internal_product_info_with_driver(url))
+
+        return results
+
+    @staticmethod
+    def map_concurrently(fetch, urls, workers):
+        """yields (url, fetch(url)) pairs in completion order, fetching up to workers urls at the same time."""
+        if not urls:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch, url): url for url in urls}
+
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future.result()
+
     def fetch_data(self):
         """
         retrieves and extracts product data from the paneco web page.
@@ -96,6 +454,15 @@ class PanecoDataFetcher:
         :return: list[dict]: A list of dictionaries, where each dictionary contains
                         the extracted product details (e.g., name, price, volume, link).
         """
+        if self.http_listing:
+            try:
+                products = self.fetch_listing_over_http()
+                if products:
+                    return products
+
+            except Exception as e:
+                self.logger.error(f"http listing failed, falling back to scrolling in the browser: {e}")
+
         # handle pop up message
         self.scraper.handle_popup_message('css', "#dy-over-18yrs-popup")
 
@@ -110,6 +477,15 @@ class PanecoDataFetcher:
             ec.presence_of_all_elements_located((By.CSS_SELECTOR, "li.item.product"))
         )
 
+        if self.bulk_extraction:
+            try:
+                products = self.extract_products_bulk("li.item.product")
+                if products:
+                    return products
+
+            except Exception as e:
+                self.logger.error(f"bulk extraction failed, falling back to per element extraction: {e}")
+
         # Find all elements
         products = self.scraper.get_elements("css", "li.item.product")
 
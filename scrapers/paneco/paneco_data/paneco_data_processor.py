@@ -1,5 +1,6 @@
 from .paneco_data_fetcher import PanecoDataFetcher
 from .paneco_data_saver import PanecoDataSaver
+from .paneco_sync_state import PanecoSyncState
 
 
 class PanecoDataProcessor:
@@ -10,34 +11,172 @@ class PanecoDataProcessor:
     and uses PanecoDataSaver to save the processed data.
     """
 
-    def __init__(self, paneco_data_fetcher: PanecoDataFetcher, paneco_data_saver: PanecoDataSaver, logger):
+    LISTING_PAGE = "listing"
+    # fields of a listing row, a product whose row did not change keeps its stored internal information.
+    LISTING_FIELDS = ("Name", "Regular Price", "Discounted Price", "Volume", "internal_link")
+    INTERNAL_FIELDS = ("description", "bottle_image")
+
+    def __init__(self, paneco_data_fetcher: PanecoDataFetcher, paneco_data_saver: PanecoDataSaver, logger,
+                 journal=None, sync_state: PanecoSyncState = None):
         self.paneco_data_fetcher = paneco_data_fetcher
         self.paneco_data_saver = paneco_data_saver
         self.logger = logger
+        # optional CrawlJournal, records the listing and the internal info of every processed product.
+        self.journal = journal
+        # optional PanecoSyncState, remembers the last full refresh of incremental crawls.
+        self.sync_state = sync_state
 
-    def process_data(self):
+    def fetch_listing(self, resume: bool = False):
         """
-        fetches product data, updates each product with additional internal information, and saves the data
-        in chunks of 10 products at a time.
+        returns the listed products and the internal info of the products that were already processed.
 
-        ensures all products are saved, including any remaining ones at the end.
+        when resuming an interrupted crawl, the listing and the processed products come from the journal,
+        so the browser does not scroll the listing or visit those product pages again.
         """
+        if resume and self.journal:
+            state = self.journal.load()
+            if self.LISTING_PAGE in state.pages:
+                products = state.pages[self.LISTING_PAGE]
+                self.logger.info(f"resuming crawl, {len(state.done)} of {len(products)} products already processed.")
+                return products, state.done
 
         # get list of all bottles in paneco store section.
         products = self.paneco_data_fetcher.fetch_data()
 
+        if self.journal:
+            self.journal.start()
+            self.journal.record_page(self.LISTING_PAGE, products)
+
+        return products, {}
+
+    def unchanged_internal_info(self, products: list):
+        """
+        returns internal_link -> stored internal information of the listed products whose listing row
+        (name, prices, volume, link) is the same as in the stored product.
+        """
+        stored = {product.get('internal_link'): product for product in self.paneco_data_saver.load_data()}
+
+        unchanged = {}
+        for product in products:
+            previous = stored.get(product.get('internal_link'))
+            if not previous or any(previous.get(field) != product.get(field) for field in self.LISTING_FIELDS):
+                continue
+
+            internal_info = {field: previous[field] for field in self.INTERNAL_FIELDS if field in previous}
+            if any(value not in (None, "N/A") for value in internal_info.values()):
+                unchanged[product['internal_link']] = internal_info
+
+        self.logger.info(f"{len(unchanged)} of {len(products)} products did not change, skipping their pages.")
+        return unchanged
+
+    def process_data(self, resume: bool = False, incremental: bool = False, full_refresh_days: int = None):
+        """
+        fetches product data, updates each product with additional internal information, and saves every
+        new chunk of 10 products.
+
+        ensures all products are saved, including any remaining ones at the end.
+
+        :param resume: continue the crawl recorded in the journal, if it was interrupted.
+        :param incremental: visit only the pages of new products and of products whose listing row changed,
+                            the others keep their stored description and bottle image.
+        :param full_refresh_days: with incremental, visit all product pages if the last full refresh is older.
+        """
+        products, processed = self.fetch_listing(resume)
+
+        full_refresh = not incremental or (self.sync_state is not None and
+                                           self.sync_state.is_full_refresh_due(full_refresh_days))
+        if not full_refresh:
+            processed = {**self.unchanged_internal_info(products), **processed}
+
+        if self.paneco_data_fetcher.driver_pool or self.paneco_data_fetcher.http_details:
+            products = self.process_data_in_parallel(products, processed)
+        else:
+            products = self.process_data_sequentially(products, processed)
+
+        # every product page was visited, also by a non incremental run.
+        if full_refresh and self.sync_state:
+            self.sync_state.mark_full_refresh()
+
+        return products
+
+    def process_data_sequentially(self, products: list, processed: dict):
+        """
+        visits the product pages one by one on the scraper driver, skipping the products in processed.
+        """
         # update all products with internal information and save in chunks of 10 products each time.
         for index, product in enumerate(products):
-            internal_info = self.paneco_data_fetcher.fetch_internal_product_info(product.get('internal_link'))
+            link = product.get('internal_link')
+            if link in processed:
+                internal_info = processed[link]
+            else:
+                # a page that fails (e.g. a timeout) gives None instead of aborting the whole run.
+                internal_info = self.paneco_data_fetcher.fetch_internal_product_info_with_driver(link)
+                # products that failed stay pending, so a resumed crawl retries them.
+                if self.journal and internal_info is not None:
+                    self.journal.record_done([link], {link: internal_info})
 
             if internal_info:
                 product.update(internal_info)
 
             if (index + 1) % 10 == 0:
-                self.paneco_data_saver.save_data(products[:index + 1])
+                self.paneco_data_saver.save_chunk(products[index - 9:index + 1])
 
         # saving all unsaved products if the total of all products is not divisible by 10.
         self.paneco_data_saver.save_data(products)
         self.logger.info("all products successfully save in json file.")
 
+        if self.journal:
+            self.journal.finish()
+
+        return products
+
+    def process_data_in_parallel(self, products: list, processed: dict):
+        """
+        fetches the internal information of all products concurrently, over http and / or on the driver pool
+        of the fetcher, and merges the results into the products by internal_link.
+        every 10 completed product pages, the products of those pages are saved.
+        """
+        results = dict(processed)
+        pending_links = [product.get('internal_link') for product in products
+                         if product.get('internal_link') not in processed]
+        chunk = {}
+
+        def on_result(link, internal_info):
+            results[link] = internal_info
+            chunk[link] = internal_info
+            # products that failed stay pending, so a resumed crawl retries them.
+            if self.journal and internal_info is not None:
+                self.journal.record_done([link], {link: internal_info})
+
+            if len(chunk) == 10:
+                self.paneco_data_saver.save_chunk(self.merge_internal_info(products, chunk))
+                chunk.clear()
+
+        self.paneco_data_fetcher.fetch_internal_products_info(pending_links, on_result=on_result)
+
+        # the final save keeps every listed product, also those without a link or internal info.
+        for product in products:
+            internal_info = results.get(product.get('internal_link'))
+            if internal_info:
+                product.update(internal_info)
+
+        self.paneco_data_saver.save_data(products)
+        self.logger.info("all products successfully save in json file.")
+
+        if self.journal:
+            self.journal.finish()
+
         return products
+
+    @staticmethod
+    def merge_internal_info(products: list, results: dict):
+        """returns the products that have a result, updated with their internal information."""
+        merged = []
+        for product in products:
+            link = product.get('internal_link')
+            if link in results:
+                if results[link]:
+                    product.update(results[link])
+                merged.append(product)
+
+        return merged
@@ -1,11 +1,42 @@
 import json
+from scrapers.paneco.paneco_data.product_record import ProductRecord
 
 
 class PanecoDataSaver:
 
-    def __init__(self, file_name, logger):
+    def __init__(self, file_name, logger, storage=None):
         self.file_name = file_name
         self.logger = logger
+        # optional storage (e.g. SqliteProductStorage), used instead of rewriting file_name.
+        self.storage = storage
+
+    def load_data(self):
+        """
+        returns the products of the last run, from the storage or from the json file.
+        """
+        if self.storage:
+            return self.storage.load_all()
+
+        try:
+            with open(self.file_name, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.logger.warning(f"no saved products in {self.file_name}.")
+            return []
+
+    def load_records(self):
+        """loads the products of the last run as compact ProductRecord objects, for keeping large catalogs in memory."""
+        return ProductRecord.from_dicts(self.load_data())
+
+    def save_chunk(self, products: list):
+        """
+        saves a chunk of products during the crawl, only a storage writes them.
+        the json file holds the complete list and is written once by save_data, the progress of an interrupted
+        crawl is kept by the crawl journal.
+        """
+        if self.storage:
+            self.storage.add_many(products)
 
     def save_data(self, products: list):
         """
@@ -14,6 +45,9 @@ class PanecoDataSaver:
 
         :return:
         """
+        if self.storage:
+            self.storage.record_snapshot(products)
+            return
 
         with open(self.file_name, "w", encoding="utf-8") as f:
             json.dump(products, f, ensure_ascii=False, indent=4)
@@ -0,0 +1,46 @@
+import json
+from datetime import datetime, timedelta
+
+
+class PanecoSyncState:
+    """
+    PanecoSyncState keeps the time of the last full paneco crawl in a small json file,
+    so incremental crawls know when the next full refresh of all product pages is due.
+    """
+    def __init__(self, file_name, logger):
+        self.file_name = file_name
+        self.logger = logger
+        self.last_full_refresh = None
+        self.load()
+
+    def load(self):
+        """loads the state file, if the file exists."""
+        try:
+            with open(self.file_name, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+        except FileNotFoundError:
+            self.logger.warning("paneco sync state file not exist, no full refresh was recorded.")
+            return
+
+        self.last_full_refresh = datetime.fromisoformat(state['last_full_refresh']) \
+            if state.get('last_full_refresh') else None
+
+    def is_full_refresh_due(self, full_refresh_days, now: datetime = None):
+        """
+        :param full_refresh_days: days between full refreshes, None never forces one.
+        :return: True if no full refresh was recorded or the last one is older than full_refresh_days.
+        """
+        if full_refresh_days is None:
+            return False
+
+        now = now or datetime.now()
+        return self.last_full_refresh is None or now - self.last_full_refresh >= timedelta(days=full_refresh_days)
+
+    def mark_full_refresh(self, now: datetime = None):
+        """records a completed full crawl and saves the state file."""
+        self.last_full_refresh = now or datetime.now()
+
+        with open(self.file_name, 'w', encoding='utf-8') as f:
+            json.dump({'last_full_refresh': self.last_full_refresh.isoformat(timespec="seconds")}, f,
+                      ensure_ascii=False, indent=4)
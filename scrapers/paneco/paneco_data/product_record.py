@@ -0,0 +1,64 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    """
+    compact in-memory representation of a paneco product.
+
+    the record has no per-instance __dict__ and the fixed json keys are not repeated per product.
+    short repeated values (prices, volumes) are interned.
+    the product keys that from_dict did not receive (e.g. description of a listing row that was not enriched)
+    are kept in missing, so to_dict leaves them out and keeps the keys that were explicitly None.
+    """
+    # json key -> attribute name.
+    KEYS = {
+        "Name": "name",
+        "Regular Price": "regular_price",
+        "Discounted Price": "discounted_price",
+        "Volume": "volume",
+        "internal_link": "internal_link",
+        "description": "description",
+        "bottle_image": "bottle_image",
+    }
+    INTERNED = ("regular_price", "discounted_price", "volume")
+
+    name: Optional[str] = None
+    regular_price: Optional[str] = None
+    discounted_price: Optional[str] = None
+    volume: Optional[str] = None
+    internal_link: Optional[str] = None
+    description: Optional[str] = None
+    bottle_image: Optional[str] = None
+    # keys that are not part of the product layout, kept for lossless conversion.
+    extra: Optional[dict] = None
+    # product keys that were not in the dictionary, None when all of them were.
+    missing: Optional[tuple] = None
+
+    @classmethod
+    def from_dict(cls, product: dict):
+        values = {}
+        for key, attribute in cls.KEYS.items():
+            value = product.get(key)
+            values[attribute] = sys.intern(value) if attribute in cls.INTERNED and isinstance(value, str) else value
+
+        extra = {key: value for key, value in product.items() if key not in cls.KEYS}
+        missing = tuple(key for key in cls.KEYS if key not in product)
+        return cls(**values, extra=extra or None, missing=missing or None)
+
+    def to_dict(self):
+        product = {}
+        for key, attribute in self.KEYS.items():
+            if not self.missing or key not in self.missing:
+                product[key] = getattr(self, attribute)
+
+        if self.extra:
+            product.update(self.extra)
+
+        return product
+
+    @classmethod
+    def from_dicts(cls, products: list):
+        return [cls.from_dict(product) for product in products]
@@ -1,26 +1,105 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 from .paneco_scraper import PanecoScraper
 from .paneco_data.paneco_data_fetcher import PanecoDataFetcher
 from .paneco_data.paneco_data_saver import PanecoDataSaver
 from .paneco_data.paneco_data_processor import PanecoDataProcessor
+from .paneco_data.paneco_sync_state import PanecoSyncState
+from storage.sqlite_storage import SqliteProductStorage, SqliteProductHistoryStorage
+from storage.crawl_journal import CrawlJournal
+from scrapers.driver_pool import DriverPool
+from scrapers.browser_profile import BrowserProfile
 from logger.scraper_logger import Logger
-import time
+
+# counts the XHR / fetch requests in flight in window.__pendingRequests, installed once per page.
+TRACK_PENDING_REQUESTS_SCRIPT = """
+if (window.__pendingRequests === undefined) {
+    window.__pendingRequests = 0;
+    const track = (promise) => {
+        window.__pendingRequests++;
+        return promise.finally(() => window.__pendingRequests--);
+    };
+    const originalFetch = window.fetch;
+    window.fetch = function () { return track(originalFetch.apply(this, arguments)); };
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__pendingRequests++;
+        this.addEventListener('loadend', () => window.__pendingRequests--, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+}
+"""
+
+# scrolls to the bottom and resolves with the number of items as soon as it differs from the previous count,
+# or when idle_timeout passes without new items while no request is in flight.
+# requests that never end (long-polls, beacons) stop extending the wait after maxWait.
+WAIT_FOR_NEW_ITEMS_SCRIPT = """
+const [className, previousCount, idleTimeout, maxWait, done] = arguments;
+const count = () => document.getElementsByClassName(className).length;
+const deadline = Date.now() + maxWait;
+let idleTimer = null;
+const finish = () => {
+    observer.disconnect();
+    clearTimeout(idleTimer);
+    done(count());
+};
+const observer = new MutationObserver(() => {
+    if (count() !== previousCount) finish();
+});
+const armIdleTimer = () => {
+    idleTimer = setTimeout(
+        () => (window.__pendingRequests > 0 && Date.now() < deadline ? armIdleTimer() : finish()),
+        Math.max(Math.min(idleTimeout, deadline - Date.now()), 0)
+    );
+};
+observer.observe(document.body, {childList: true, subtree: true});
+armIdleTimer();
+window.scrollTo(0, document.body.scrollHeight);
+"""
 
 
 class PanecoWhiskeyScraper(PanecoScraper):
 
     LOG_NAME = "PanecoWhiskeyScraper"
     LOG_FILE = "logs/paneco_whiskey_scraper.log"
-
-    def __init__(self, url: str):
+    # product gallery images keep loading, fetch_internal_product_info reads them from the fotorama stage.
+    BROWSER_PROFILE = BrowserProfile.performance(allowed_urls=[
+        f"https://www.paneco.co.il/media/catalog/product/*.{extension}" for extension in ("jpg", "jpeg", "png", "webp")
+    ])
+
+    def __init__(self, url: str, storage_format: str = "json", resume: bool = False, detail_workers: int = 1,
+                 http_details: bool = False, http_listing: bool = False, incremental: bool = False,
+                 full_refresh_days: int = None):
+        """
+        :param storage_format: "json" rewrites whiskey_data.json, "sqlite" upserts into whiskey_data.db,
+                               "history" writes only changed products to whiskey_data.db and keeps price history.
+        :param resume: continue the last crawl from its checkpoint journal if it was interrupted.
+        :param detail_workers: number of browsers that scrape product detail pages in parallel.
+        :param http_details: fetch product detail pages over http, the browser only handles the pages that fail.
+        :param http_listing: request the listing pages directly over http instead of scrolling the browser.
+        :param incremental: visit only the pages of new products and of products whose listing row changed.
+        :param full_refresh_days: with incremental, visit all product pages every full_refresh_days days.
+        """
         super().__init__(url)
 
         self.logger = Logger.get_logger(self.LOG_NAME, self.LOG_FILE)
 
-        self.data_fetcher = PanecoDataFetcher(self, self.logger)
-        self.data_saver = PanecoDataSaver("whiskey_data.json", self.logger)
-        self.data_processor = PanecoDataProcessor(self.data_fetcher, self.data_saver, self.logger)
+        storage = None
+        if storage_format == "sqlite":
+            storage = SqliteProductStorage("whiskey_data.db", self.logger)
+        elif storage_format == "history":
+            storage = SqliteProductHistoryStorage("whiskey_data.db", self.logger)
+        self.driver_pool = DriverPool(self.create_driver, detail_workers, self.logger) if detail_workers > 1 else None
+        self.data_fetcher = PanecoDataFetcher(self, self.logger, driver_pool=self.driver_pool,
+                                              http_details=http_details, http_listing=http_listing)
+        self.data_saver = PanecoDataSaver("whiskey_data.json", self.logger, storage=storage)
+        self.resume = resume
+        self.incremental = incremental
+        self.full_refresh_days = full_refresh_days
+        journal = CrawlJournal("paneco_crawl.journal", self.logger)
+        sync_state = PanecoSyncState("paneco_sync_state.json", self.logger)
+        self.data_processor = PanecoDataProcessor(self.data_fetcher, self.data_saver, self.logger, journal=journal,
+                                                  sync_state=sync_state)
 
     def get_product_name(self):
         """Extracts the product name."""
@@ -42,51 +121,54 @@ class PanecoWhiskeyScraper(PanecoScraper):
         """gets the driver from the grandparent class."""
         return super(PanecoScraper, self).driver
 
-    def scroll_until_all_loaded(self, class_name="amscroll-page", timeout=20, max_scrolls=60):
+    def scroll_until_all_loaded(self, class_name="amscroll-page", timeout=20, max_scrolls=60, idle_timeout=3):
         """
-        Scrolls down until all elements with the specified class are loaded or the page reaches the bottom.
-        Uses WebDriverWait to repeatedly scroll and check if the page height has stopped increasing.
+        Scrolls down until all elements with the specified class are loaded.
+
+        instead of sleeping a fixed time per scroll, every scroll waits in the browser (MutationObserver)
+        until the number of elements changes, and returns as soon as new items are rendered.
+        loading stops when idle_timeout seconds pass without new items and without pending network requests.
 
         :param max_scrolls: number of max scrolls.
         :param class_name: The class name of dynamically loaded elements.
-        :param timeout: Maximum wait time in seconds.
+        :param timeout: Maximum wait time in seconds for a single scroll.
+        :param idle_timeout: seconds without growth after which all items are considered loaded.
         """
+        # the browser may be pooled, its script timeout is restored for the next lease.
+        previous_script_timeout = self.driver.timeouts.script
+        # a scroll resolves before the script timeout even while requests stay pending.
+        max_wait = int(timeout * 1000 * 0.8)
         try:
-            scroll_attempts = 0
-            last_item_count = 0
-
-            while scroll_attempts < max_scrolls:
-                # scrolling down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-
-                time.sleep(3)
-                current_item_count = len(self.driver.find_elements(By.CLASS_NAME, class_name))
-
-                if current_item_count == last_item_count:
+            self.driver.set_script_timeout(timeout)
+            self.driver.execute_script(TRACK_PENDING_REQUESTS_SCRIPT)
+            item_count = len(self.driver.find_elements(By.CLASS_NAME, class_name))
+
+            for _ in range(max_scrolls):
+                new_item_count = self.driver.execute_async_script(
+                    WAIT_FOR_NEW_ITEMS_SCRIPT, class_name, item_count, int(idle_timeout * 1000), max_wait
+                )
+                if new_item_count == item_count:
                     break
 
-                last_item_count = current_item_count
-                scroll_attempts += 1
+                item_count = new_item_count
 
-            self.logger.info(f"Loaded {last_item_count} items with class '{class_name}'.")
+            self.logger.info(f"Loaded {item_count} items with class '{class_name}'.")
 
         except Exception as e:
             self.logger.error(f"an error occurred while scrolling.: {e}")
 
-        try:
-            WebDriverWait(self.driver, timeout).until(lambda driver:
-                                                      driver.execute_script(
-                                                          "window.scrollTo(0, document.body.scrollHeight);") or
-                                                      driver.execute_script("return document.body.scrollHeight") ==
-                                                      driver.execute_script(
-                                                          "return window.innerHeight + window.scrollY")
-                                                      )
-            self.logger.info(f"all elements with class: {class_name} have been successfully loaded.")
-
-        except Exception as e:
-            self.logger.error(f"error occurred while scrolling: {e}")
+        finally:
+            self.driver.set_script_timeout(previous_script_timeout)
 
     def fetch_data(self):
         # processing the relevant paneco data using PanecoDataProcessor class.
         self.logger.info("start processing relevant paneco data using PanecoDataProcessor")
-        self.data_processor.process_data()
+        try:
+            self.data_processor.process_data(resume=self.resume, incremental=self.incremental,
+                                             full_refresh_days=self.full_refresh_days)
+
+        finally:
+            if self.driver_pool:
+                self.driver_pool.close()
+            if self.data_fetcher.session:
+                self.data_fetcher.session.close()
@@ -1,4 +1,10 @@
+import atexit
+import os
+import re
+import threading
 from abc import ABC, abstractmethod
+import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -6,6 +12,27 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 from logger.scraper_logger import Logger
+from scrapers.browser_profile import DEFAULT_PROFILE
+from scrapers.driver_pool import BrowserPool
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def chromedriver_path():
+    """
+    returns the path of the chromedriver binary, resolved once per process.
+
+    CHROMEDRIVER_PATH pins an installed binary and skips webdriver_manager, CHROMEDRIVER_VERSION pins the version
+    that webdriver_manager installs. otherwise webdriver_manager resolves the version that matches chrome.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = os.environ.get("CHROMEDRIVER_PATH") or \
+                                 ChromeDriverManager(driver_version=os.environ.get("CHROMEDRIVER_VERSION")).install()
+
+        return _chromedriver_path
 
 
 class Scraper(ABC):
@@ -54,29 +81,66 @@ class SeleniumScraper(Scraper):
     """
     LOG_NAME = "SeleniumScraper"
     LOG_FILE = "logs/selenium_scraper.log"
+    # chrome settings of the scraper, subclasses select e.g. BrowserProfile.performance().
+    BROWSER_PROFILE = DEFAULT_PROFILE
+    # shared BrowserPool of warm browsers, set with use_browser_pool.
+    BROWSER_POOL = None
 
     def __init__(self, url: str, driver=None):
         super().__init__(url)
-        self.driver = driver if driver else self.create_driver()
+        # a driver leased from BROWSER_POOL goes back to the pool on close_driver instead of quitting.
+        self.pooled = driver is None and self.BROWSER_POOL is not None
+        if driver:
+            self.driver = driver
+        else:
+            self.driver = self.BROWSER_POOL.acquire() if self.pooled else self.create_driver()
         self.logger = Logger.get_logger(self.LOG_NAME, self.LOG_FILE)
 
+    @classmethod
+    def use_browser_pool(cls, size=2, recycle_after=50, warm=True):
+        """
+        makes the scrapers of this class (and its subclasses) lease their browsers from a shared pool of
+        pre-launched browsers with the BROWSER_PROFILE of the class, instead of launching a new one per instance.
+        the pool is closed when the process exits, or when the class switches to a new pool.
+
+        :param size: number of browsers in the pool.
+        :param recycle_after: number of pages after which a browser is launched again.
+        :param warm: launch all the browsers now instead of on first use.
+        """
+        logger = Logger.get_logger(cls.LOG_NAME, cls.LOG_FILE)
+        # a pool inherited from a parent class is left to the parent.
+        previous_pool = cls.__dict__.get("BROWSER_POOL")
+        if previous_pool:
+            atexit.unregister(previous_pool.close)
+            previous_pool.close()
+
+        profile = cls.BROWSER_PROFILE
+        cls.BROWSER_POOL = BrowserPool(lambda: cls.launch_driver(profile, logger), size, logger,
+                                       recycle_after=recycle_after,
+                                       prepare_driver=lambda driver: profile.apply(driver, logger))
+        atexit.register(cls.BROWSER_POOL.close)
+        if warm:
+            cls.BROWSER_POOL.warm_up()
+
+        return cls.BROWSER_POOL
+
     def create_driver(self):
-        options = webdriver.ChromeOptions()
-        # options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--remote-debugging-port=9222")
-        options.add_argument("--start-maximized")
-
-        service = Service(ChromeDriverManager().install())
+        return self.launch_driver(self.BROWSER_PROFILE, self.logger)
+
+    @staticmethod
+    def launch_driver(profile, logger):
+        """launches chrome with a browser profile, using the cached chromedriver binary."""
+        options = profile.options()
+
+        service = Service(chromedriver_path())
         try:
             driver = webdriver.Chrome(service=service, options=options)
-            self.logger.info("driver initialized successfully.")
+            profile.apply(driver, logger)
+            logger.info(f"driver initialized successfully with the {profile.name} profile.")
             return driver
 
         except Exception as e:
-            self.logger.error(f"Failed to initialized WebDriver: {e}")
+            logger.error(f"Failed to initialized WebDriver: {e}")
             raise
 
     def get_title(self):
@@ -121,8 +185,13 @@ class SeleniumScraper(Scraper):
             return
 
     def close_driver(self):
-        """Closes the WebDriver properly."""
-        if self.driver:
+        """Closes the WebDriver properly, a pooled driver is returned to its pool."""
+        if self.driver and self.pooled:
+            self.BROWSER_POOL.release(self.driver)
+            self.driver = None
+            self.logger.info("driver returned to the browser pool")
+
+        elif self.driver:
             self.logger.info("driver closed")
             self.driver.quit()
 
@@ -150,5 +219,84 @@ class SeleniumScraper(Scraper):
         #
         self.fetch_data()
 
-        # close browser.
-        self.driver.quit()
+        # close browser, or return it to the browser pool.
+        self.close_driver()
+
+
+class RequestsScraper(Scraper):
+    """
+    Scraper for static websites and JSON APIs using the requests library.
+
+    no browser is launched, the "driver" of this scraper is a pooled requests.Session
+    that keeps connections alive between calls.
+    """
+    LOG_NAME = "RequestsScraper"
+    LOG_FILE = "logs/requests_scraper.log"
+    DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; scraping_assignment)"}
+    # keep-alive connections per host, enough for the fetch threads that share the session.
+    POOL_SIZE = 32
+
+    def __init__(self, url: str, session=None, timeout: int = 15):
+        super().__init__(url)
+        self.timeout = timeout
+        self.session = session if session else self.create_driver()
+        self.logger = Logger.get_logger(self.LOG_NAME, self.LOG_FILE)
+
+    def create_driver(self):
+        """creates a requests session, the lightweight equivalent of a WebDriver."""
+        session = requests.Session()
+        session.headers.update(self.DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.logger.info("http session initialized successfully.")
+        return session
+
+    def get_page(self, url: str = None):
+        """
+        returns the text of the given page (the scraper url by default), or None if the request failed.
+        """
+        try:
+            response = self.session.get(url or self.url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.text
+
+        except requests.RequestException as e:
+            self.logger.error(f"failed to get page {url or self.url}: {e}")
+            return None
+
+    def get_title(self):
+        page = self.get_page()
+        match = re.search(r'<title[^>]*>(.*?)</title>', page or "", re.IGNORECASE | re.DOTALL)
+        if match:
+            self.logger.info("website title successfully received.")
+            return match.group(1).strip()
+
+        self.logger.error("no title found in page.")
+        return "No title found"
+
+    def get_element(self, by, value):
+        """
+        static pages have no live DOM to query, so element lookups are not supported.
+        returns an empty list, the same value SeleniumScraper returns when no element is found.
+        """
+        self.logger.warning(f"get_element({by}, {value}) is not supported by {self.__class__.__name__}.")
+        return []
+
+    def close_driver(self):
+        """Closes the http session properly."""
+        if self.session:
+            self.logger.info("http session closed")
+            self.session.close()
+
+    def fetch_data(self):
+        pass
+
+    def scrape_site(self, url: str = None):
+        if url:
+            self.url = url
+
+        self.fetch_data()
+
+        # close http session.
+        self.close_driver()
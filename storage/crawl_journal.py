@@ -0,0 +1,92 @@
+import json
+import os
+from dataclasses import dataclass, field
+from .jsonl_storage import truncate_partial_line
+
+
+@dataclass
+class CrawlState:
+    """state of an interrupted crawl, rebuilt from the journal."""
+    # page id -> items listed on that page, in fetch order.
+    pages: dict = field(default_factory=dict)
+    # item key -> data recorded when the item was processed.
+    done: dict = field(default_factory=dict)
+
+    def pending(self, key):
+        """returns the listed items that were not processed yet, in listing order."""
+        return [item for items in self.pages.values() for item in items if item.get(key) not in self.done]
+
+    @property
+    def is_empty(self):
+        return not self.pages
+
+
+class CrawlJournal:
+    """
+    crash-safe checkpoint journal of a long crawl.
+
+    every event (a listing page with its items, a batch of processed items) is appended as a json line
+    and fsynced, so after a crash the journal tells which pages were fetched, which items were processed
+    and which are still pending. a partially written last line is cut off when the journal is opened,
+    so the first event of the resumed crawl starts on a line of its own.
+    the journal is removed by finish() when the crawl completes.
+    """
+    def __init__(self, file_name, logger):
+        self.file_name = file_name
+        self.logger = logger
+
+        if os.path.exists(self.file_name) and truncate_partial_line(self.file_name):
+            self.logger.warning(f"partially written last line removed from {self.file_name}")
+
+    def start(self):
+        """starts a new crawl, dropping the journal of the previous one."""
+        open(self.file_name, 'w', encoding='utf-8').close()
+
+    def record_page(self, page_id: str, items: list):
+        """records a fetched listing page and the items it lists (they are pending until recorded as done)."""
+        self._append({'event': 'page', 'page': page_id, 'items': items})
+
+    def record_done(self, keys: list, data: dict = None):
+        """
+        records processed items.
+
+        :param keys: keys of the processed items.
+        :param data: optional key -> data produced for the item (e.g. internal product info), restored on resume.
+        """
+        if keys:
+            self._append({'event': 'done', 'keys': keys, 'data': data or {}})
+
+    def load(self):
+        """rebuilds the state of the last crawl, an empty state if there is no journal."""
+        state = CrawlState()
+        try:
+            with open(self.file_name, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+
+                    except json.JSONDecodeError:
+                        self.logger.warning(f"skipping partially written line in {self.file_name}")
+                        continue
+
+                    if event['event'] == 'page':
+                        state.pages[event['page']] = event['items']
+                    elif event['event'] == 'done':
+                        for key in event['keys']:
+                            state.done[key] = event['data'].get(key)
+
+        except FileNotFoundError:
+            self.logger.info("no crawl journal found, nothing to resume.")
+
+        return state
+
+    def finish(self):
+        """marks the crawl as complete by removing the journal."""
+        if os.path.exists(self.file_name):
+            os.remove(self.file_name)
+
+    def _append(self, event: dict):
+        with open(self.file_name, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,209 @@
+import argparse
+import dbm
+import json
+import os
+from .storage_interface import Storage
+
+
+def truncate_partial_line(file_name, block_size=4096):
+    """
+    cuts a partially written last line (a crash in the middle of an append) off a json lines file,
+    so the next append starts on a line of its own instead of being glued onto the broken one.
+
+    :return: number of bytes removed.
+    """
+    with open(file_name, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(end - block_size, 0)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+
+        if end < size:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+
+    return size - end
+
+
+class JsonlArticleStorage(Storage):
+    """
+    append-only article storage, each article is written as a single json line.
+
+    a persistent dbm hash index maps every url to the offset of its line, so checking whether an
+    article already exists is O(1) and nothing has to be reloaded or rewritten when new articles arrive.
+    every chunk is flushed and fsynced before the index is updated.
+    """
+    # index key that stores the size of the data file the index was built for.
+    SIZE_KEY = "__file_size__"
+
+    def __init__(self, file_name, logger, key="url"):
+        self.file_name = file_name
+        self.index_name = f"{file_name}.idx"
+        self.logger = logger
+        self.key = key
+
+        # make sure the data file exists before the index is opened.
+        open(self.file_name, 'a', encoding='utf-8').close()
+        if truncate_partial_line(self.file_name):
+            # the record of the broken line was never indexed, it is fetched again.
+            self.logger.warning(f"partially written last line removed from {self.file_name}")
+        self.index = dbm.open(self.index_name, 'c')
+
+        if self.index.get(self.SIZE_KEY, b"").decode() != str(os.path.getsize(self.file_name)):
+            # the index is missing or older than the data file (e.g. crash after append), rebuild it.
+            self.rebuild_index()
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def contains(self, value):
+        """returns True if a record with the given key value is already stored."""
+        return value in self.index
+
+    def iter_records(self):
+        """yields all stored records, skipping a partially written trailing line."""
+        with open(self.file_name, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+
+                except json.JSONDecodeError:
+                    self.logger.warning(f"skipping corrupted line in {self.file_name}")
+
+    def load_all(self):
+        """returns all stored records as a list, in insertion order."""
+        return list(self.iter_records())
+
+    def add_many(self, records: list):
+        """
+        appends the records whose key is not stored yet and fsyncs the chunk.
+
+        :param records: list of dictionaries.
+        :return: number of records that were written.
+        """
+        offsets = {}
+        with open(self.file_name, 'ab') as f:
+            for record in records:
+                value = record[self.key]
+                if value in offsets or self.contains(value):
+                    continue
+
+                offsets[value] = f.tell()
+                f.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n")
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        for value, offset in offsets.items():
+            self.index[value] = str(offset)
+
+        self._sync_index()
+        self.logger.info(f"{len(offsets)} records appended to {self.file_name}")
+        return len(offsets)
+
+    def rebuild_index(self):
+        """rebuilds the url index from the data file."""
+        self.index.close()
+        self.index = dbm.open(self.index_name, 'n')
+
+        with open(self.file_name, 'rb') as f:
+            offset = f.tell()
+            for line in iter(f.readline, b""):
+                try:
+                    self.index[json.loads(line)[self.key]] = str(offset)
+
+                except (json.JSONDecodeError, KeyError):
+                    self.logger.warning(f"skipping corrupted line in {self.file_name}")
+                offset = f.tell()
+
+        self._sync_index()
+        self.logger.info(f"index of {self.file_name} rebuilt")
+
+    def _sync_index(self):
+        """marks the index as up to date with the data file and writes it to disk."""
+        self.index[self.SIZE_KEY] = str(os.path.getsize(self.file_name))
+        if hasattr(self.index, "sync"):
+            self.index.sync()
+
+    def compact(self):
+        """
+        rewrites the data file without duplicated or corrupted lines and rebuilds the index.
+
+        :return: number of records kept.
+        """
+        temp_file_name = f"{self.file_name}.tmp"
+        seen = set()
+
+        with open(temp_file_name, 'w', encoding='utf-8') as f:
+            for record in self.iter_records():
+                if record.get(self.key) in seen:
+                    continue
+
+                seen.add(record.get(self.key))
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_file_name, self.file_name)
+        self.rebuild_index()
+        self.logger.info(f"{self.file_name} compacted, {len(seen)} records kept.")
+        return len(seen)
+
+    def export_json(self, json_file_name):
+        """exports all records to a json file in the same layout as DataSaver (a single indented array)."""
+        with open(json_file_name, 'w', encoding='utf-8') as f:
+            json.dump(self.load_all(), f, ensure_ascii=False, indent=4)
+
+        self.logger.info(f"{self.file_name} exported to {json_file_name}")
+
+    def import_json(self, json_file_name):
+        """appends the records of an existing json array file, e.g. articles.json."""
+        with open(json_file_name, 'r', encoding='utf-8') as f:
+            return self.add_many(json.load(f))
+
+    def close(self):
+        self.index.close()
+
+
+def main():
+    """command line entry point: python -m storage.jsonl_storage {compact,export,import} ..."""
+    from logger.scraper_logger import Logger
+
+    parser = argparse.ArgumentParser(description="maintenance commands for jsonl article storage.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = subparsers.add_parser("compact", help="remove duplicated and corrupted lines.")
+    compact_parser.add_argument("file_name")
+
+    export_parser = subparsers.add_parser("export", help="export to the json array layout.")
+    export_parser.add_argument("file_name")
+    export_parser.add_argument("json_file_name")
+
+    import_parser = subparsers.add_parser("import", help="import records from a json array file.")
+    import_parser.add_argument("file_name")
+    import_parser.add_argument("json_file_name")
+
+    args = parser.parse_args()
+    storage = JsonlArticleStorage(args.file_name, Logger.get_logger("JsonlStorage", "logs/jsonl_storage.log"))
+    try:
+        if args.command == "compact":
+            storage.compact()
+        elif args.command == "export":
+            storage.export_json(args.json_file_name)
+        else:
+            storage.import_json(args.json_file_name)
+
+    finally:
+        storage.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from .storage_interface import Storage
+from utils import parse_date, parse_price
+
+
+class SqliteStorage(Storage):
+    """
+    base SQLite storage, every record is kept as json in the 'data' column next to its key
+    and a few indexed columns that subclasses extract for queries.
+
+    the database runs in WAL mode, so readers (e.g. the bot or reports) are not blocked while a scraper writes,
+    and every add_many call is a single transaction of batched upserts.
+    """
+    TABLE = None
+    KEY = None
+    # indexed column name -> sql type, filled by subclasses.
+    COLUMNS = {}
+
+    def __init__(self, file_name, logger):
+        self.file_name = file_name
+        self.logger = logger
+        self._lock = threading.Lock()
+
+        self.connection = sqlite3.connect(self.file_name, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+    def create_tables(self):
+        columns = "".join(f", {name} {sql_type}" for name, sql_type in self.COLUMNS.items())
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({self.KEY} TEXT PRIMARY KEY{columns}, data TEXT NOT NULL)"
+            )
+            for name in self.COLUMNS:
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_{name} ON {self.TABLE} ({name})")
+
+    def to_columns(self, record: dict):
+        """returns the values of the indexed columns of a record, in COLUMNS order."""
+        return ()
+
+    def contains(self, value):
+        with self._lock:
+            row = self.connection.execute(f"SELECT 1 FROM {self.TABLE} WHERE {self.KEY} = ?", (value,)).fetchone()
+
+        return row is not None
+
+    def add_many(self, records: list):
+        """
+        upserts the records in one transaction, records without a key are skipped.
+
+        :return: number of records that were written.
+        """
+        rows = []
+        for record in records:
+            if not record.get(self.KEY):
+                self.logger.warning(f"skipping record without {self.KEY}: {record}")
+                continue
+
+            rows.append((record[self.KEY], *self.to_columns(record), json.dumps(record, ensure_ascii=False)))
+
+        names = [self.KEY, *self.COLUMNS, "data"]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names[1:])
+        query = (f"INSERT INTO {self.TABLE} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+                 f"ON CONFLICT({self.KEY}) DO UPDATE SET {updates}")
+
+        with self._lock, self.connection:
+            self.connection.executemany(query, rows)
+
+        self.logger.info(f"{len(rows)} records saved in {self.file_name}")
+        return len(rows)
+
+    def load_all(self):
+        return self.query()
+
+    def query(self, where: str = "", parameters: tuple = (), order_by: str = "rowid"):
+        """
+        returns the records that match a where clause on the indexed columns.
+
+        :param where: sql condition, e.g. "price < ?".
+        :param parameters: values of the condition placeholders.
+        :param order_by: sql order by expression.
+        """
+        condition = f"WHERE {where}" if where else ""
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT data FROM {self.TABLE} {condition} ORDER BY {order_by}", parameters
+            ).fetchall()
+
+        return [json.loads(data) for data, in rows]
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+class SqliteArticleStorage(SqliteStorage):
+    """
+    SQLite storage for news articles, keyed by url and indexed by publish date.
+    """
+    TABLE = "articles"
+    KEY = "url"
+    COLUMNS = {"publish_date": "TEXT"}
+
+    def to_columns(self, record: dict):
+        # dates are stored as ISO strings, so they sort and compare correctly.
+        publish_date = parse_date(record.get("publish_date"))
+        return (publish_date.date().isoformat() if publish_date else None,)
+
+    def published_between(self, start: datetime, end: datetime):
+        """returns the articles published between two dates (inclusive), newest first."""
+        return self.query("publish_date BETWEEN ? AND ?", (start.date().isoformat(), end.date().isoformat()),
+                          order_by="publish_date DESC")
+
+
+class SqliteProductStorage(SqliteStorage):
+    """
+    SQLite storage for paneco products, keyed by product link and indexed by price.
+    """
+    TABLE = "products"
+    KEY = "internal_link"
+    COLUMNS = {"price": "REAL"}
+
+    def to_columns(self, record: dict):
+        # the price that is actually paid: the discounted price if it exists, the regular price otherwise.
+        price = parse_price(record.get("Discounted Price")) or parse_price(record.get("Regular Price"))
+        return (price,)
+
+    def priced_between(self, min_price: float, max_price: float):
+        """returns the products whose price is between two values (inclusive), cheapest first."""
+        return self.query("price BETWEEN ? AND ?", (min_price, max_price), order_by="price")
+
+    def record_snapshot(self, records: list):
+        """saves the complete product list of a crawl."""
+        return self.add_many(records)
+
+
+class SqliteProductHistoryStorage(SqliteProductStorage):
+    """
+    SQLite product storage that keeps the price history of every product.
+
+    the products table holds the latest state of each product. every run is diffed against it by internal_link,
+    only new and changed products are written, and new, removed and price-changed products are appended
+    to the product_changes table with a timestamp, so the price of a product over time is a single indexed query.
+    """
+    CHANGES_TABLE = "product_changes"
+    NEW = "new"
+    PRICE = "price"
+    REMOVED = "removed"
+
+    def create_tables(self):
+        super().create_tables()
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.CHANGES_TABLE} (internal_link TEXT NOT NULL, change TEXT NOT NULL, "
+                f"regular_price REAL, discounted_price REAL, price REAL, changed_at TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.CHANGES_TABLE}_link "
+                f"ON {self.CHANGES_TABLE} (internal_link, changed_at)"
+            )
+
+    @staticmethod
+    def prices(record: dict):
+        """returns the regular price, the discounted price and the paid price of a product."""
+        regular_price = parse_price(record.get("Regular Price"))
+        discounted_price = parse_price(record.get("Discounted Price"))
+        return regular_price, discounted_price, discounted_price or regular_price
+
+    def load_stored(self, links: list):
+        """returns internal_link -> stored product of the given links."""
+        stored = {}
+        with self._lock:
+            # stay below the sqlite limit of host parameters per query.
+            for start in range(0, len(links), 500):
+                batch = links[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT {self.KEY}, data FROM {self.TABLE} WHERE {self.KEY} IN ({', '.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                stored.update((link, json.loads(data)) for link, data in rows)
+
+        return stored
+
+    def add_many(self, records: list, now: datetime = None):
+        """
+        writes the new and changed products, and records the new and price-changed ones in the history.
+        products that did not change are not written.
+
+        :return: number of products that were written.
+        """
+        changed_at = (now or datetime.now()).isoformat(timespec="seconds")
+        records = [record for record in records if record.get(self.KEY)]
+        stored = self.load_stored(list(dict.fromkeys(record[self.KEY] for record in records)))
+
+        changed_records, changes = [], []
+        for record in records:
+            previous = stored.get(record[self.KEY])
+            if previous == record:
+                continue
+
+            changed_records.append(record)
+            stored[record[self.KEY]] = record
+            if previous is None:
+                changes.append((record[self.KEY], self.NEW, *self.prices(record), changed_at))
+            elif self.prices(previous) != self.prices(record):
+                changes.append((record[self.KEY], self.PRICE, *self.prices(record), changed_at))
+
+        self.add_changes(changes)
+        return super().add_many(changed_records) if changed_records else 0
+
+    def add_changes(self, changes: list):
+        with self._lock, self.connection:
+            self.connection.executemany(
+                f"INSERT INTO {self.CHANGES_TABLE} "
+                f"(internal_link, change, regular_price, discounted_price, price, changed_at) "
+                f"VALUES (?, ?, ?, ?, ?, ?)",
+                changes
+            )
+
+    def record_snapshot(self, records: list, now: datetime = None):
+        """
+        saves the complete product list of a crawl, products that are no longer listed are removed
+        from the products table and recorded as removed in the history.
+        """
+        now = now or datetime.now()
+        written = self.add_many(records, now)
+
+        listed = {record.get(self.KEY) for record in records}
+        removed = [product for product in self.load_all() if product.get(self.KEY) not in listed]
+        if removed:
+            changed_at = now.isoformat(timespec="seconds")
+            self.add_changes([(product[self.KEY], self.REMOVED, *self.prices(product), changed_at)
+                              for product in removed])
+            with self._lock, self.connection:
+                self.connection.executemany(f"DELETE FROM {self.TABLE} WHERE {self.KEY} = ?",
+                                            [(product[self.KEY],) for product in removed])
+
+        self.logger.info(f"snapshot of {len(records)} products: {written} written, {len(removed)} removed.")
+        return written
+
+    def price_history(self, internal_link: str):
+        """returns the recorded changes of a product, oldest first."""
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT change, regular_price, discounted_price, price, changed_at FROM {self.CHANGES_TABLE} "
+                f"WHERE internal_link = ? ORDER BY changed_at, rowid", (internal_link,)
+            ).fetchall()
+
+        return [{"change": change, "regular_price": regular_price, "discounted_price": discounted_price,
+                 "price": price, "changed_at": changed_at}
+                for change, regular_price, discounted_price, price, changed_at in rows]
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+
+
+class Storage(ABC):
+    """
+    abstract interface for record storages.
+
+    a storage keeps dictionaries (articles, products) identified by a key field,
+    so savers can add new records without loading or rewriting the whole dataset.
+    """
+    @abstractmethod
+    def contains(self, value):
+        """returns True if a record with the given key value is already stored."""
+        pass
+
+    @abstractmethod
+    def add_many(self, records: list):
+        """stores the records, a record whose key is already stored is never duplicated."""
+        pass
+
+    @abstractmethod
+    def load_all(self):
+        """returns all stored records as a list."""
+        pass
+
+    @abstractmethod
+    def close(self):
+        """closes the storage properly."""
+        pass
+
+    def __contains__(self, value):
+        return self.contains(value)
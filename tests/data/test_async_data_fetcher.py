@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from scrapers.news.news_data.async_data_fetcher import AsyncDataFetcher
+from scrapers.news.news_data.data_fetcher import DataFetcher
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """serves a json body that echoes the requested path, and 404 for /missing."""
+    def do_GET(self):
+        if self.path.startswith("/missing"):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = json.dumps({"results": [{"title": self.path}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    """starts a local json api server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+
+
+@pytest.fixture
+def async_fetcher():
+    """creates an AsyncDataFetcher and closes it after the test."""
+    fetcher = AsyncDataFetcher(MagicMock(), limit_per_host=2)
+    yield fetcher
+
+    fetcher.close()
+
+
+def test_fetch_articles_success(api_server, async_fetcher):
+    """Test successful fetching of articles."""
+    result = async_fetcher.fetch_articles(f"{api_server}/api?CollectorType=news")
+    assert result == {"results": [{"title": "/api?CollectorType=news"}]}
+
+
+def test_fetch_articles_failure(api_server, async_fetcher):
+    """Test fetching articles with a failure status code."""
+    assert async_fetcher.fetch_articles(f"{api_server}/missing") is None
+
+
+def test_fetch_paginated_articles(api_server, async_fetcher):
+    """Test fetching all pages after the first one concurrently."""
+    result = async_fetcher.fetch_paginated_articles(f"{api_server}/api?CollectorType=news", 40, interval=10)
+
+    assert result['total'] == 40
+    assert [article['title'] for article in result['results']] == [
+        f"/api?CollectorType=news&skip={skip}&culture=en" for skip in (10, 20, 30)
+    ]
+
+
+def test_fetch_article_contents(api_server, async_fetcher, monkeypatch):
+    """Test fetching the contents of a batch of articles, in order and with failed articles as None."""
+    monkeypatch.setattr(DataFetcher, "CONTENT_API_URL", f"{api_server}/{{}}")
+
+    result = async_fetcher.fetch_article_contents([f"http://test.com/article/{name}" for name in ("a", "missing", "b")])
+
+    assert result == [{"results": [{"title": "/a"}]}, None, {"results": [{"title": "/b"}]}]
+
+
+def test_fetch_article_contents_bounded_by_limit_per_host(async_fetcher):
+    """Test that no more than limit_per_host content requests of a batch are in flight."""
+    in_flight = []
+    max_in_flight = []
+
+    async def fetch_article_content_async(article_url):
+        in_flight.append(article_url)
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(article_url)
+        return article_url
+
+    async_fetcher.fetch_article_content_async = fetch_article_content_async
+    urls = [f"http://test.com/article/{i}" for i in range(10)]
+
+    assert async_fetcher.fetch_article_contents(urls) == urls
+    assert max(max_in_flight) == async_fetcher.limit_per_host
@@ -1,58 +1,66 @@
+import pytest
 import requests
 from unittest.mock import patch, Mock
 from scrapers.news.news_data.data_fetcher import DataFetcher
+from scrapers.news.gov_news_scraper import NewsSiteScraper
 
 
-def test_fetch_articles_success():
+@pytest.fixture
+def data_fetcher():
+    """creates a DataFetcher without cache, limiter or resilience layer."""
+    return DataFetcher(Mock())
+
+
+def test_fetch_articles_success(data_fetcher):
     """Test successful fetching of articles."""
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"results": [{"title": "Test Article"}]}
 
     with patch('requests.get', return_value=mock_response):
-        result = DataFetcher.fetch_articles("http://test.com/api")
+        result = data_fetcher.fetch_articles("http://test.com/api")
         assert result == {"results": [{"title": "Test Article"}]}
 
 
-def test_fetch_articles_failure():
+def test_fetch_articles_failure(data_fetcher):
     """Test fetching articles with a failure status code."""
     mock_response = Mock()
     mock_response.status_code = 404
 
     with patch('requests.get', return_value=mock_response):
-        result = DataFetcher.fetch_articles("http://test.com/api")
+        result = data_fetcher.fetch_articles("http://test.com/api")
         assert result is None
 
 
-def test_fetch_article_content_success():
+def test_fetch_article_content_success(data_fetcher):
     """Test successful fetching of article content."""
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"content": "Test Content"}
 
     with patch('requests.get', return_value=mock_response):
-        result = DataFetcher.fetch_article_content("http://test.com/article/test-article")
+        result = data_fetcher.fetch_article_content("http://test.com/article/test-article")
         assert result == {"content": "Test Content"}
 
 
-def test_fetch_article_content_failure():
+def test_fetch_article_content_failure(data_fetcher):
     """Test fetching article content with a failure status code."""
     mock_response = Mock()
     mock_response.status_code = 404
 
     with patch('requests.get', return_value=mock_response):
-        result = DataFetcher.fetch_article_content("http://test.com/article/test-article")
+        result = data_fetcher.fetch_article_content("http://test.com/article/test-article")
         assert result is None
 
 
-def test_fetch_article_content_exception():
+def test_fetch_article_content_exception(data_fetcher):
     """Test fetching article content with an exception."""
     with patch('requests.get', side_effect=requests.RequestException("Test Exception")):
-        result = DataFetcher.fetch_article_content("http://test.com/article/test-article")
+        result = data_fetcher.fetch_article_content("http://test.com/article/test-article")
         assert result is None
 
 
-def test_fetch_paginated_articles():
+def test_fetch_paginated_articles(data_fetcher):
     """Test fetching paginated articles."""
     mock_response1 = Mock()
     mock_response1.status_code = 200
@@ -63,8 +71,104 @@ def test_fetch_paginated_articles():
     mock_response2.json.return_value = {"results": [{"title": "Article 2"}]}
 
     with patch('requests.get', side_effect=[mock_response1, mock_response2]):
-        result = DataFetcher.fetch_paginated_articles("http://test.com/api", 20, interval=10)
+        result = data_fetcher.fetch_paginated_articles("http://test.com/api", 20, interval=10)
 
         assert len(result['results']) == 1
         assert result['results'][0]['title'] == "Article 1"
         assert result['total'] == 20
+
+
+def test_iter_paginated_articles(data_fetcher):
+    """Test streaming paginated articles page by page, in order."""
+    responses = {
+        f"http://test.com/api&skip={skip}&culture=en": Mock(status_code=200, **{
+            "json.return_value": {"results": [{"title": f"Article {skip}"}]}
+        })
+        for skip in (10, 20, 30)
+    }
+
+    with patch('requests.get', side_effect=lambda url, headers=None, timeout=None: responses[url]):
+        pages = list(data_fetcher.iter_paginated_articles("http://test.com/api", 40, interval=10, max_in_flight=2))
+
+    assert pages == [[{"title": "Article 10"}], [{"title": "Article 20"}], [{"title": "Article 30"}]]
+
+
+def test_paginated_urls_with_page_size():
+    """Test building page urls with a discovered page size after a first page of 10."""
+    urls = DataFetcher.paginated_urls("http://test.com/api", 120, interval=50, start=10, page_size_param="limit")
+
+    assert urls == [
+        "http://test.com/api&skip=10&limit=50&culture=en",
+        "http://test.com/api&skip=60&limit=50&culture=en",
+        "http://test.com/api&skip=110&limit=50&culture=en",
+    ]
+
+
+def test_discover_page_size(data_fetcher):
+    """Test probing the page size parameters until the API returns a larger page."""
+    def fake_fetch(url):
+        # the API ignores "limit" and caps "take" at 50.
+        if "take=" in url:
+            return {"total": 200, "results": [{}] * 50}
+        return {"total": 200, "results": [{}] * 10}
+
+    with patch.object(data_fetcher, "fetch_articles", side_effect=fake_fetch) as fetch:
+        page_size_param, page_size, first_page = data_fetcher.discover_page_size("http://test.com/api")
+        assert (page_size_param, page_size, len(first_page["results"])) == ("take", 50, 50)
+        assert data_fetcher.discover_page_size("http://test.com/api") == ("take", 50, None)
+
+    # "limit" is dropped after its first probe returned the default page size.
+    assert [call.args[0] for call in fetch.call_args_list] == [
+        "http://test.com/api&skip=0&limit=100&culture=en", "http://test.com/api&skip=0&take=100&culture=en"
+    ]
+
+
+def test_discover_page_size_fallback(data_fetcher):
+    """Test falling back to the default page size when the probes fail."""
+    with patch.object(data_fetcher, "fetch_articles", return_value=None):
+        assert data_fetcher.discover_page_size("http://test.com/api") == (None, 10, None)
+
+
+def test_fetch_layers_are_not_shared_between_scrapers(tmp_path, monkeypatch):
+    """Test that the cache, limiter and resilience layer of one scraper are not used by the next one."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    configured = NewsSiteScraper("http://test.com", cache_dir=str(tmp_path / "cache"), adaptive_limit=True,
+                                 resilient=True)
+    plain = NewsSiteScraper("http://test.com")
+
+    configured_fetcher = configured.data_processor.data_fetcher
+    assert configured_fetcher.cache and configured_fetcher.limiter and configured_fetcher.resilience
+    plain_fetcher = plain.data_processor.data_fetcher
+    assert (plain_fetcher.cache, plain_fetcher.limiter, plain_fetcher.resilience) == (None, None, None)
+    assert plain_fetcher.session is plain.session
+    configured.close_driver()
+    plain.close_driver()
+
+
+def test_requests_go_through_the_session_with_a_timeout():
+    """Test that a given session is reused for every request, with the fetcher timeout."""
+    session = Mock()
+    session.get.return_value = Mock(status_code=200, **{"json.return_value": {"results": []}})
+    data_fetcher = DataFetcher(Mock(), session=session, timeout=5)
+
+    data_fetcher.fetch_articles("http://test.com/api")
+    data_fetcher.fetch_article_content("http://test.com/article/a")
+
+    assert session.get.call_count == 2
+    assert all(call.kwargs["timeout"] == 5 for call in session.get.call_args_list)
+
+
+def test_async_fetch_warns_about_ignored_options(tmp_path, monkeypatch):
+    """Test that the DataFetcher options combined with async_fetch are reported instead of silently ignored."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+    logger = Mock()
+
+    with patch('scrapers.news.gov_news_scraper.Logger.get_logger', return_value=logger):
+        scraper = NewsSiteScraper("http://test.com", async_fetch=True, cache_dir=str(tmp_path / "cache"),
+                                  adaptive_limit=True)
+    scraper.close_driver()
+
+    logger.warning.assert_any_call("cache_dir, adaptive_limit not supported with async_fetch, ignored.")
@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import MagicMock
+from scrapers.news.news_data.data_processor import DataProcessor
+from scrapers.news.news_data.sync_state import SyncState
+from scrapers.news.news_data.resilience import DeadLetterQueue
+
+
+def make_page(urls, total=100, publish_date="01.01.2024"):
+    """builds a GetResults response with the given article urls."""
+    return {
+        "total": total,
+        "results": [{"url": url, "tags": {"metaData": {"Publish Date": [{"title": publish_date}]}}} for url in urls]
+    }
+
+
+@pytest.fixture
+def data_saver():
+    """Creates a mock DataSaver that already saved the articles 'old-1' and 'old-2'."""
+    saver = MagicMock()
+    saver.saved_urls.return_value = {"old-1", "old-2"}
+    saver.dead_letters = None
+    return saver
+
+
+def test_sync_news_data_stops_at_saved_page(data_saver):
+    """Test that the delta sync stops at the first page that is already saved."""
+    data_fetcher = MagicMock()
+    data_fetcher.fetch_articles.side_effect = [
+        make_page(["new-1", "new-2"]),
+        make_page(["new-3", "old-1"]),
+        make_page(["old-2"]),
+        make_page(["never-fetched"]),
+    ]
+    processor = DataProcessor(data_fetcher, data_saver, MagicMock())
+
+    new_items = processor.process_news_data(incremental=True)
+
+    assert [item["url"] for item in new_items] == ["new-1", "new-2", "new-3"]
+    assert data_fetcher.fetch_articles.call_count == 3
+    data_saver.save_data_in_chunks.assert_called_once_with(new_items, journaled=False)
+
+
+def test_sync_news_data_stops_at_watermark(data_saver, tmp_path):
+    """Test that the delta sync stops at a page older than the watermark and moves the watermark."""
+    sync_state = SyncState(str(tmp_path / "state.json"), MagicMock())
+    sync_state.last_publish_date = SyncState.parse_date("10.01.2024")
+
+    data_fetcher = MagicMock()
+    data_fetcher.fetch_articles.side_effect = [
+        make_page(["new-1"], publish_date="12.01.2024"),
+        make_page(["backfill-1"], publish_date="02.01.2024"),
+    ]
+    processor = DataProcessor(data_fetcher, data_saver, MagicMock(), sync_state=sync_state)
+
+    processor.process_news_data(incremental=True)
+
+    assert data_fetcher.fetch_articles.call_count == 2
+    assert SyncState(str(tmp_path / "state.json"), MagicMock()).last_publish_date == \
+        SyncState.parse_date("12.01.2024")
+
+
+def test_retry_dead_letters(data_saver, tmp_path):
+    """Test that pages and articles from dead letters are retried before the run."""
+    data_saver.dead_letters = DeadLetterQueue(str(tmp_path / "dead_letters.json"), MagicMock())
+    data_saver.dead_letters.add("page", "http://test.com/api&skip=10")
+    data_saver.dead_letters.add("article", {"url": "failed-1"})
+
+    data_fetcher = MagicMock()
+    data_fetcher.fetch_page.return_value = make_page(["page-1"])
+    processor = DataProcessor(data_fetcher, data_saver, MagicMock())
+
+    processor.retry_dead_letters()
+
+    saved = data_saver.save_data_in_chunks.call_args.args[0]
+    assert [item["url"] for item in saved] == ["failed-1", "page-1"]
+    assert len(data_saver.dead_letters) == 0
+
+
+def test_page_size_is_reused_and_persisted(data_saver, tmp_path):
+    """Test that the winning probe is the first page and that the next run skips probing."""
+    state_file = str(tmp_path / "state.json")
+    data_fetcher = MagicMock()
+    first_page = make_page([f"article-{index}" for index in range(50)], total=50)
+    data_fetcher.discover_page_size.return_value = ("take", 50, first_page)
+    data_saver.journal = None
+
+    DataProcessor(data_fetcher, data_saver, MagicMock(), sync_state=SyncState(state_file, MagicMock())) \
+        .process_news_data()
+
+    data_fetcher.fetch_articles.assert_not_called()
+    data_saver.save_data_in_chunks.assert_any_call(first_page["results"])
+
+    data_fetcher.reset_mock()
+    data_fetcher.fetch_articles.return_value = first_page
+    DataProcessor(data_fetcher, data_saver, MagicMock(), sync_state=SyncState(state_file, MagicMock())) \
+        .process_news_data()
+
+    data_fetcher.discover_page_size.assert_not_called()
+    assert data_fetcher.fetch_articles.call_args.kwargs["api_url"] == \
+        f"{DataProcessor.BASE_URL}&skip=0&take=50&culture=en"
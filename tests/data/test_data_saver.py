@@ -1,8 +1,12 @@
 import json
 import os
+import time
 import pytest
 from scrapers.news.news_data.data_saver import DataSaver
-from unittest.mock import patch
+from scrapers.news.news_data.article_transformer import ArticleTransformer
+from scrapers.news.news_data.resilience import DeadLetterQueue
+from storage.crawl_journal import CrawlJournal
+from unittest.mock import MagicMock, patch
 from logger.scraper_logger import Logger
 
 
@@ -90,3 +94,133 @@ def test_get_json_format_response(data_saver, temp_json_file):
 
             assert article["title"] == "Test Article"
             assert article["article_content"] == "Content"
+
+
+def test_save_data_in_chunks_keeps_order(data_saver, temp_json_file):
+    """Test that concurrently fetched articles are saved in input order, without duplicates."""
+    items = [{"url": f"http://test.com/article-{i}", "title": f"Article {i}"} for i in range(25)]
+    items.append(items[3])
+
+    def fake_response(item, article_response=None):
+        # later articles finish first.
+        time.sleep((25 - int(item["url"].split("-")[-1])) * 0.001)
+        return {"title": item["title"], "url": item["url"]}
+
+    with patch.object(data_saver, "get_json_format_response", side_effect=fake_response):
+        data_saver.save_data_in_chunks(items, chunk_size=10, workers=4)
+
+    with open(temp_json_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+
+    assert [article["title"] for article in saved] == [f"Article {i}" for i in range(25)]
+
+
+def test_save_stream_saves_full_chunks(data_saver):
+    """Test that a stream of pages is saved in chunks as soon as they are complete."""
+    pages = iter([[{"url": "a"}, {"url": "b"}], [{"url": "c"}], [{"url": "d"}, {"url": "e"}]])
+
+    with patch.object(data_saver, "save_data_in_chunks") as mock_save:
+        assert data_saver.save_stream(pages, chunk_size=2) == 5
+
+    assert [call.args[0] for call in mock_save.call_args_list] == [
+        [{"url": "a"}, {"url": "b"}], [{"url": "c"}, {"url": "d"}], [{"url": "e"}]
+    ]
+
+
+def test_save_data_in_chunks_with_transformer(temp_json_file):
+    """Test that fetched articles are parsed by the process pool transformer."""
+    logger = Logger.get_logger("test_logger", "logs/test.log")
+    transformer = ArticleTransformer(logger, processes=2, chunksize=2)
+    saver = DataSaver(temp_json_file, logger=logger, transformer=transformer)
+    items = [{"url": f"http://test.com/article-{i}", "title": f"Article {i}", "description": "",
+              "tags": {"metaData": {"Publish Date": [{"title": "2023-10-26"}]}}} for i in range(5)]
+
+    with patch('scrapers.news.news_data.data_fetcher.DataFetcher.fetch_article_content',
+               return_value={"contentMain": {"htmlContents": [{"sectionData": "<p>Content &amp; more</p>"}]}}):
+        saver.save_data_in_chunks(items, chunk_size=2)
+
+    transformer.close()
+    with open(temp_json_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+
+    assert [article["title"] for article in saved] == [f"Article {i}" for i in range(5)]
+    assert saved[0]["article_content"] == "Content & more"
+    assert saved[0]["tags"] == {"Publish Date": ["2023-10-26"]}
+
+
+def test_failed_articles_stay_pending_in_journal(temp_json_file, tmp_path):
+    """Test that only the saved articles are recorded as done, so a resumed crawl retries the failed ones."""
+    logger = Logger.get_logger("test_logger", "logs/test.log")
+    journal = CrawlJournal(str(tmp_path / "news.journal"), logger)
+    saver = DataSaver(temp_json_file, logger=logger, journal=journal)
+    items = [{"url": f"http://test.com/article-{i}", "title": f"Article {i}", "description": "",
+              "tags": {"metaData": {"Publish Date": [{"title": "2023-10-26"}]}}} for i in range(3)]
+    journal.start()
+    journal.record_page("listing", items)
+
+    def fetch_article_content(url):
+        return None if url.endswith("-1") else {"contentMain": {"htmlContents": [{"sectionData": "<p>x</p>"}]}}
+
+    with patch('scrapers.news.news_data.data_fetcher.DataFetcher.fetch_article_content',
+               side_effect=fetch_article_content):
+        saver.save_data_in_chunks(items)
+
+    assert [item["url"] for item in journal.load().pending("url")] == ["http://test.com/article-1"]
+
+
+def test_save_data_in_chunks_with_batch_fetcher(temp_json_file):
+    """Test that a fetcher with fetch_article_contents gets the contents of each chunk in one call."""
+    logger = Logger.get_logger("test_logger", "logs/test.log")
+    data_fetcher = MagicMock()
+    data_fetcher.fetch_article_contents.side_effect = lambda urls: [
+        None if url.endswith("-1") else {"contentMain": {"htmlContents": [{"sectionData": f"<p>{url}</p>"}]}}
+        for url in urls
+    ]
+    saver = DataSaver(temp_json_file, logger=logger, data_fetcher=data_fetcher)
+    items = [{"url": f"http://test.com/article-{i}", "title": f"Article {i}", "description": "",
+              "tags": {"metaData": {"Publish Date": [{"title": "2023-10-26"}]}}} for i in range(5)]
+
+    saver.save_data_in_chunks(items, chunk_size=2)
+
+    with open(temp_json_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+
+    assert [article["title"] for article in saved] == ["Article 0", "Article 2", "Article 3", "Article 4"]
+    assert saved[0]["article_content"] == "http://test.com/article-0"
+    assert data_fetcher.fetch_article_contents.call_count == 3
+    data_fetcher.fetch_article_content.assert_not_called()
+
+
+def test_transformer_dead_letters_malformed_items(temp_json_file, tmp_path):
+    """Test that items the process pool cannot transform go to the dead letters, like in the in-process path."""
+    logger = Logger.get_logger("test_logger", "logs/test.log")
+    transformer = ArticleTransformer(logger, processes=1)
+    dead_letters = DeadLetterQueue(str(tmp_path / "dead_letters.json"), MagicMock())
+    saver = DataSaver(temp_json_file, logger=logger, transformer=transformer, dead_letters=dead_letters)
+    items = [{"url": "http://test.com/article-0", "title": "Article 0", "description": "",
+              "tags": {"metaData": {}}},
+             {"url": "http://test.com/malformed"}]
+
+    with patch('scrapers.news.news_data.data_fetcher.DataFetcher.fetch_article_content',
+               return_value={"contentMain": {"htmlContents": [{"sectionData": "<p>x</p>"}]}}):
+        saver.save_data_in_chunks(items)
+
+    transformer.close()
+    with open(temp_json_file, 'r', encoding='utf-8') as f:
+        assert [article["url"] for article in json.load(f)] == ["http://test.com/article-0"]
+    assert dead_letters.drain("article") == [{"url": "http://test.com/malformed"}]
+
+
+def test_unjournaled_save_does_not_grow_journal(temp_json_file, tmp_path):
+    """Test that the saves of a sync are not appended to the crawl journal."""
+    logger = Logger.get_logger("test_logger", "logs/test.log")
+    journal = CrawlJournal(str(tmp_path / "news.journal"), logger)
+    saver = DataSaver(temp_json_file, logger=logger, journal=journal)
+    items = [{"url": "http://test.com/article-0", "title": "Article 0", "description": "",
+              "tags": {"metaData": {}}}]
+
+    with patch('scrapers.news.news_data.data_fetcher.DataFetcher.fetch_article_content',
+               return_value={"contentMain": {"htmlContents": [{"sectionData": "<p>x</p>"}]}}):
+        saver.save_data_in_chunks(items, journaled=False)
+
+    assert not os.path.exists(tmp_path / "news.journal")
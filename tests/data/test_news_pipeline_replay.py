@@ -0,0 +1,30 @@
+import pytest
+from unittest.mock import MagicMock
+from benchmarks.replay_server import ReplayServer, synthetic_fixtures, pipeline_pointed_to
+from scrapers.news.news_data.data_fetcher import DataFetcher
+from scrapers.news.news_data.data_processor import DataProcessor
+from scrapers.news.news_data.data_saver import DataSaver
+
+
+@pytest.fixture
+def replay_server():
+    """starts a replay server with 45 synthetic articles."""
+    server = ReplayServer(synthetic_fixtures(45, paragraphs=2)).start()
+    yield server
+
+    server.stop()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_news_pipeline_against_replay_server(replay_server, tmp_path, stream):
+    """Test the whole news data path offline, including page size discovery."""
+    logger = MagicMock()
+    data_saver = DataSaver(str(tmp_path / "articles.json"), logger)
+
+    with pipeline_pointed_to(replay_server.url):
+        DataProcessor(DataFetcher(logger), data_saver, logger).process_news_data(stream=stream)
+
+    articles = data_saver.load_existing_data()
+    assert len(articles) == 45
+    assert len({article["url"] for article in articles}) == 45
+    assert articles[0]["article_content"].startswith("Paragraph 0 of article 0 & more text.")
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from scrapers.paneco.paneco_data.paneco_data_fetcher import PanecoDataFetcher
+from scrapers.driver_pool import DriverPool
 
 
 @pytest.fixture
@@ -71,4 +72,149 @@ def test_extract_product_data(data_fetcher):
 
     assert result["Name"] == "Test Whiskey"
     assert result["internal_link"] == "https://example.com"
-
+    assert set(result) == {"Name", "Regular Price", "Discounted Price", "Volume", "internal_link"}
+
+def test_product_from_row_defaults():
+    """Test the defaults of the fields that are missing from a listing product."""
+    assert PanecoDataFetcher.product_from_row({"name": "A", "internal_link": None}) == {
+        "Name": "A",
+        "Regular Price": "N/A",
+        "Discounted Price": "not exist",
+        "Volume": "N/A",
+        "internal_link": None
+    }
+
+
+def test_extract_products_bulk(data_fetcher, mock_scraper):
+    """test extracting all products with a single execute_script call."""
+    mock_scraper.driver.execute_script.return_value = [
+        {"name": "Test Whiskey", "regular_price": "100 ₪", "discounted_price": None, "volume": "700 מ\"ל",
+         "internal_link": "https://example.com"}
+    ]
+
+    result = data_fetcher.extract_products_bulk()
+
+    assert mock_scraper.driver.execute_script.call_count == 1
+    assert result == [{
+        "Name": "Test Whiskey",
+        "Regular Price": "100 ₪",
+        "Discounted Price": "not exist",
+        "Volume": "700 מ\"ל",
+        "internal_link": "https://example.com"
+    }]
+
+
+def test_fetch_data_falls_back_to_per_element_extraction(data_fetcher, mock_scraper):
+    """test that per element extraction is used when the bulk script fails."""
+    mock_scraper.driver.execute_script.side_effect = Exception("javascript error")
+    mock_scraper.get_elements.return_value = [MagicMock()]
+
+    with patch("scrapers.paneco.paneco_data.paneco_data_fetcher.WebDriverWait"), \
+         patch.object(PanecoDataFetcher, "extract_product_data", return_value={"Name": "Test Whiskey"}):
+        result = data_fetcher.fetch_data()
+
+    assert result == [{"Name": "Test Whiskey"}]
+
+
+PRODUCT_PAGE = """
+<html><head><meta property="og:image" content="https://example.com/og.jpg"></head>
+<body><div class="page-wrapper">
+<script type="text/x-magento-init">
+{"[data-gallery-role=gallery-placeholder]": {"mage/gallery/gallery": {"data": [
+    {"img": "https://example.com/side.jpg", "isMain": false},
+    {"img": "https://example.com/main.jpg", "isMain": true}
+]}}}
+</script>
+<div id="description"><p>Smoky single malt.</p></div>
+</div></body></html>
+"""
+
+
+def test_parse_internal_product_info(data_fetcher):
+    """test parsing the description and main gallery image from server rendered html."""
+    result = data_fetcher.parse_internal_product_info(PRODUCT_PAGE)
+    assert result == {"description": "Smoky single malt.", "bottle_image": "https://example.com/main.jpg"}
+
+
+def test_parse_internal_product_info_not_a_product_page(data_fetcher):
+    """test that a page without the product layout cannot be parsed."""
+    assert data_fetcher.parse_internal_product_info("<html><body>captcha</body></html>") is None
+
+
+def test_fetch_internal_products_info_falls_back_to_browser(mock_scraper, mock_logger):
+    """test that only the pages that failed over http are opened on the scraper driver."""
+    session = MagicMock()
+    session.get.side_effect = lambda url, timeout: MagicMock(text=PRODUCT_PAGE if url.endswith("a") else "blocked")
+    data_fetcher = PanecoDataFetcher(mock_scraper, mock_logger, http_details=True, session=session)
+
+    with patch.object(PanecoDataFetcher, "fetch_internal_product_info",
+                      return_value={"description": "from browser", "bottle_image": "N/A"}) as browser_fetch:
+        results = data_fetcher.fetch_internal_products_info(["https://example.com/a", "https://example.com/b"])
+
+    browser_fetch.assert_called_once_with("https://example.com/b")
+    assert results["https://example.com/a"]["description"] == "Smoky single malt."
+    assert results["https://example.com/b"]["description"] == "from browser"
+
+
+def listing_page(*names, pager=""):
+    """builds a listing page with one li.item.product per name."""
+    items = "".join(
+        f'<li class="item product"><a href="/{name}"></a><strong class="product-item-name"><a href="/{name}">{name}'
+        f'</a></strong><span class="price-wrapper"><span class="price">100 ₪</span></span>'
+        f'<span class="unit">700ml</span></li>' for name in names
+    )
+    return f'<div class="page-wrapper"><ol>{items}</ol><div class="pages">{pager}</div></div>'
+
+
+def test_fetch_listing_over_http_stops_at_repeated_page(mock_scraper, mock_logger):
+    """test that listing pages are requested until magento repeats the last page."""
+    pages = {"1": listing_page("a", "b"), "2": listing_page("c")}
+    session = MagicMock()
+    session.get.side_effect = lambda url, timeout: MagicMock(text=pages.get(url.rsplit("p=", 1)[1], pages["2"]))
+    mock_scraper.url = "https://example.com/whiskey?product_list_order=name"
+    data_fetcher = PanecoDataFetcher(mock_scraper, mock_logger, http_listing=True, http_workers=2, session=session)
+
+    products = data_fetcher.fetch_data()
+
+    assert [product["Name"] for product in products] == ["a", "b", "c"]
+    assert products[0] == {"Name": "a", "Regular Price": "100 ₪", "Discounted Price": "not exist",
+                           "Volume": "700ml", "internal_link": "https://example.com/a"}
+    mock_scraper.scroll_until_all_loaded.assert_not_called()
+
+
+def test_fetch_listing_over_http_uses_pager(mock_scraper, mock_logger):
+    """test that only the pages of the pager are requested."""
+    pager = '<a href="/whiskey?p=2">2</a><a href="/whiskey?p=3">3</a>'
+    pages = {"1": listing_page("a", pager=pager), "2": listing_page("b"), "3": listing_page("c")}
+    session = MagicMock()
+    session.get.side_effect = lambda url, timeout: MagicMock(text=pages[url.rsplit("p=", 1)[1]])
+    mock_scraper.url = "https://example.com/whiskey"
+    data_fetcher = PanecoDataFetcher(mock_scraper, mock_logger, http_listing=True, session=session)
+
+    products = data_fetcher.fetch_listing_over_http()
+
+    assert [product["Name"] for product in products] == ["a", "b", "c"]
+    assert session.get.call_count == 3
+
+
+def test_pooled_fetch_survives_failed_driver_replacement(mock_logger):
+    """test that a failed driver replacement gives the slot back and only fails its own product."""
+    crashed = MagicMock()
+    type(crashed).current_url = property(lambda self: (_ for _ in ()).throw(Exception("crashed")))
+    healthy = MagicMock()
+    pool = DriverPool(MagicMock(side_effect=[crashed, Exception("chrome failed to start"), healthy]), size=1,
+                      logger=mock_logger)
+    data_fetcher = PanecoDataFetcher(MagicMock(), mock_logger, driver_pool=pool, retries=1)
+
+    def fetch_internal_product_info(product_url, driver=None):
+        if driver is crashed:
+            raise Exception("Timeout")
+        return {"description": product_url}
+
+    data_fetcher.fetch_internal_product_info = fetch_internal_product_info
+    results = data_fetcher.fetch_internal_products_info(["https://example.com/a"])
+    assert results == {"https://example.com/a": None}
+
+    results = data_fetcher.fetch_internal_products_info(["https://example.com/b"])
+    assert results == {"https://example.com/b": {"description": "https://example.com/b"}}
+    crashed.quit.assert_called_once()
@@ -0,0 +1,160 @@
+import pytest
+import threading
+from unittest.mock import MagicMock
+from scrapers.driver_pool import DriverPool
+from scrapers.paneco.paneco_data.paneco_data_fetcher import PanecoDataFetcher
+from scrapers.paneco.paneco_data.paneco_data_processor import PanecoDataProcessor
+from storage.crawl_journal import CrawlJournal
+from scrapers.paneco.paneco_data.paneco_sync_state import PanecoSyncState
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return CrawlJournal(str(tmp_path / "paneco.journal"), MagicMock())
+
+
+def test_process_data_resumes_from_journal(journal):
+    """Test that a resumed crawl skips the listing and the products that were already processed."""
+    journal.start()
+    journal.record_page(PanecoDataProcessor.LISTING_PAGE, [{"internal_link": "a"}, {"internal_link": "b"}])
+    journal.record_done(["a"], {"a": {"description": "A"}})
+
+    data_fetcher = MagicMock(driver_pool=None, http_details=False)
+    data_fetcher.fetch_internal_product_info_with_driver.return_value = {"description": "B"}
+    processor = PanecoDataProcessor(data_fetcher, MagicMock(), MagicMock(), journal=journal)
+
+    products = processor.process_data(resume=True)
+
+    data_fetcher.fetch_data.assert_not_called()
+    data_fetcher.fetch_internal_product_info_with_driver.assert_called_once_with("b")
+    assert [product["description"] for product in products] == ["A", "B"]
+    assert journal.load().is_empty
+
+
+def test_process_data_in_parallel_with_retries():
+    """Test scraping detail pages on a driver pool, retrying failures and merging by internal_link."""
+    pool = DriverPool(MagicMock, size=3, logger=MagicMock())
+    data_fetcher = PanecoDataFetcher(MagicMock(), MagicMock(), driver_pool=pool, retries=1)
+    data_fetcher.fetch_data = MagicMock(return_value=[
+        {"internal_link": f"https://example.com/{index}"} for index in range(12)
+    ])
+    failed_once = set()
+    lock = threading.Lock()
+
+    def fetch_internal_product_info(product_url, driver=None):
+        with lock:
+            if product_url.endswith("/3") and product_url not in failed_once:
+                failed_once.add(product_url)
+                raise Exception("Timeout")
+        return {"description": product_url.split("/")[-1]}
+
+    data_fetcher.fetch_internal_product_info = fetch_internal_product_info
+    data_saver = MagicMock()
+    processor = PanecoDataProcessor(data_fetcher, data_saver, MagicMock())
+
+    products = processor.process_data()
+    pool.close()
+
+    assert [product["description"] for product in products] == [str(index) for index in range(12)]
+    data_saver.save_data.assert_called_once()
+    assert data_saver.save_chunk.call_count == 1
+    assert len(data_saver.save_chunk.call_args.args[0]) == 10
+
+
+def incremental_processor(sync_state=None):
+    """builds a processor whose last run stored products a and b, and whose listing changed b and added c."""
+    row = {"Name": "A", "Regular Price": "100 ₪", "Discounted Price": "not exist", "Volume": "700ml"}
+    data_fetcher = MagicMock(driver_pool=None, http_details=False)
+    data_fetcher.fetch_data.return_value = [
+        {**row, "internal_link": "a"},
+        {**row, "Regular Price": "90 ₪", "internal_link": "b"},
+        {**row, "internal_link": "c"}
+    ]
+    data_fetcher.fetch_internal_product_info_with_driver.side_effect = lambda link: {"description": f"new {link}"}
+    data_saver = MagicMock()
+    data_saver.load_data.return_value = [
+        {**row, "internal_link": "a", "description": "stored a", "bottle_image": "a.jpg"},
+        {**row, "internal_link": "b", "description": "stored b", "bottle_image": "b.jpg"}
+    ]
+    return PanecoDataProcessor(data_fetcher, data_saver, MagicMock(), sync_state=sync_state)
+
+
+def test_process_data_incremental_skips_unchanged_products():
+    """Test that only new products and products whose listing row changed are visited."""
+    processor = incremental_processor()
+
+    products = processor.process_data(incremental=True)
+
+    fetch_internal_product_info = processor.paneco_data_fetcher.fetch_internal_product_info_with_driver
+    visited = [call.args[0] for call in fetch_internal_product_info.call_args_list]
+    assert visited == ["b", "c"]
+    assert [product["description"] for product in products] == ["stored a", "new b", "new c"]
+    assert products[0]["bottle_image"] == "a.jpg"
+
+
+def test_process_data_incremental_full_refresh(tmp_path):
+    """Test that all product pages are visited when a full refresh is due, and that it is recorded."""
+    sync_state = PanecoSyncState(str(tmp_path / "paneco_sync_state.json"), MagicMock())
+    processor = incremental_processor(sync_state)
+
+    processor.process_data(incremental=True, full_refresh_days=7)
+
+    assert processor.paneco_data_fetcher.fetch_internal_product_info_with_driver.call_count == 3
+    assert not PanecoSyncState(sync_state.file_name, MagicMock()).is_full_refresh_due(7)
+
+
+def test_failed_products_stay_pending_in_journal(journal):
+    """Test that products whose internal info could not be fetched are not recorded as done."""
+    data_fetcher = MagicMock(driver_pool=None, http_details=True)
+    data_fetcher.fetch_data.return_value = [{"internal_link": "a"}, {"internal_link": "b"}]
+    data_fetcher.fetch_internal_products_info.side_effect = \
+        lambda links, on_result: [on_result(link, None if link == "b" else {"description": "A"}) for link in links]
+    journal.finish = MagicMock()
+    processor = PanecoDataProcessor(data_fetcher, MagicMock(), MagicMock(), journal=journal)
+
+    processor.process_data()
+
+    assert journal.load().pending("internal_link") == [{"internal_link": "b"}]
+
+
+def test_process_data_in_parallel_keeps_products_without_link():
+    """Test that the final save of the parallel path keeps products that have no internal link."""
+    data_fetcher = MagicMock(driver_pool=None, http_details=True)
+    data_fetcher.fetch_data.return_value = [{"Name": "A", "internal_link": "a"}, {"Name": "B", "internal_link": None}]
+    data_fetcher.fetch_internal_products_info.side_effect = \
+        lambda links, on_result: [on_result(link, {"description": "A"}) for link in links if link]
+    data_saver = MagicMock()
+    processor = PanecoDataProcessor(data_fetcher, data_saver, MagicMock())
+
+    processor.process_data()
+
+    saved = data_saver.save_data.call_args.args[0]
+    assert [product["Name"] for product in saved] == ["A", "B"]
+    assert saved[0]["description"] == "A"
+
+
+def test_process_data_full_run_marks_full_refresh(tmp_path):
+    """Test that a non incremental run counts as a full refresh for the next incremental run."""
+    sync_state = PanecoSyncState(str(tmp_path / "paneco_sync_state.json"), MagicMock())
+    incremental_processor(sync_state).process_data()
+
+    processor = incremental_processor(PanecoSyncState(sync_state.file_name, MagicMock()))
+    processor.process_data(incremental=True, full_refresh_days=7)
+
+    assert processor.paneco_data_fetcher.fetch_internal_product_info_with_driver.call_count == 2
+
+
+def test_process_data_sequentially_survives_failed_page(journal):
+    """Test that a product page that times out does not abort the sequential run and stays pending."""
+    data_fetcher = PanecoDataFetcher(MagicMock(), MagicMock())
+    data_fetcher.fetch_data = MagicMock(return_value=[{"internal_link": "a"}, {"internal_link": "b"}])
+    data_fetcher.fetch_internal_product_info = MagicMock(side_effect=[Exception("Timeout"), {"description": "B"}])
+    journal.finish = MagicMock()
+    data_saver = MagicMock()
+    processor = PanecoDataProcessor(data_fetcher, data_saver, MagicMock(), journal=journal)
+
+    products = processor.process_data()
+
+    assert products[1]["description"] == "B"
+    data_saver.save_data.assert_called_once()
+    assert journal.load().pending("internal_link") == [{"internal_link": "a"}]
@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import MagicMock
+from scrapers.paneco.paneco_whiskey_scraper import PanecoWhiskeyScraper
+
+
+@pytest.fixture
+def scraper():
+    """creates a PanecoWhiskeyScraper with a mocked driver, without launching a browser."""
+    whiskey_scraper = PanecoWhiskeyScraper.__new__(PanecoWhiskeyScraper)
+    whiskey_scraper.driver = MagicMock()
+    whiskey_scraper.logger = MagicMock()
+    return whiskey_scraper
+
+
+def test_scroll_stops_when_no_new_items(scraper):
+    """Test that scrolling stops at the first scroll that loads no new items."""
+    scraper.driver.find_elements.return_value = [MagicMock()] * 2
+    scraper.driver.execute_async_script.side_effect = [4, 6, 6, 8]
+
+    scraper.scroll_until_all_loaded(class_name="amscroll-page", idle_timeout=1)
+
+    assert scraper.driver.execute_async_script.call_count == 3
+    assert scraper.driver.execute_async_script.call_args.args[1:] == ("amscroll-page", 6, 1000, 16000)
+
+
+def test_scroll_respects_max_scrolls(scraper):
+    """Test that scrolling never exceeds max_scrolls."""
+    scraper.driver.find_elements.return_value = []
+    scraper.driver.execute_async_script.side_effect = range(1, 100)
+
+    scraper.scroll_until_all_loaded(max_scrolls=5)
+
+    assert scraper.driver.execute_async_script.call_count == 5
+
+
+def test_scroll_restores_script_timeout(scraper):
+    """Test that the script timeout of a (pooled) driver is restored, also when a scroll fails."""
+    scraper.driver.timeouts.script = 30
+    scraper.driver.find_elements.return_value = []
+    scraper.driver.execute_async_script.side_effect = Exception("script timeout")
+
+    scraper.scroll_until_all_loaded(timeout=20)
+
+    scraper.driver.set_script_timeout.assert_called_with(30)
+    assert scraper.driver.execute_async_script.call_args.args[-1] < 20 * 1000
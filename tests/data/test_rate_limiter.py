@@ -0,0 +1,46 @@
+import time
+from scrapers.news.news_data.rate_limiter import AdaptiveRateLimiter
+
+
+def test_limit_grows_while_latency_is_flat():
+    """Test the additive increase while latency stays flat."""
+    limiter = AdaptiveRateLimiter(initial_limit=2, max_limit=5)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(0.1, 200)
+
+    assert limiter.limit == 5
+
+
+def test_limit_decreases_on_throttling():
+    """Test the multiplicative decrease on 429."""
+    limiter = AdaptiveRateLimiter(initial_limit=8)
+    limiter.acquire()
+    limiter.release(0.1, 429)
+
+    assert limiter.limit == 4
+
+
+def test_limit_holds_when_latency_grows():
+    """Test that the limit stops growing when latency rises above the tolerance."""
+    limiter = AdaptiveRateLimiter(initial_limit=4, smoothing=1.0)
+    limiter.acquire()
+    limiter.release(0.1, 200)
+    limit = limiter.limit
+
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(1.0, 200)
+
+    assert limiter.limit == limit
+
+
+def test_retry_after_pauses_requests():
+    """Test that Retry-After pauses new requests."""
+    limiter = AdaptiveRateLimiter()
+    limiter.acquire()
+    limiter.release(0.01, 429, retry_after="0.2")
+
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
@@ -0,0 +1,76 @@
+import json
+from unittest.mock import MagicMock
+from scrapers.news.news_data.article_record import ArticleRecord
+from scrapers.paneco.paneco_data.paneco_data_saver import PanecoDataSaver
+from scrapers.paneco.paneco_data.product_record import ProductRecord
+
+
+def test_article_record_round_trip():
+    """Test lossless conversion between articles and records."""
+    article = {
+        "title": "Test Article",
+        "url": "http://test.com/article",
+        "publish_date": "26.10.2023",
+        "description": "Test description",
+        "tags": {"Ministry": ["Ministry of Health"], "Topic": ["Health", "Covid"]},
+        "article_content": "Content"
+    }
+    record = ArticleRecord.from_dict(article)
+
+    assert record.to_dict() == article
+    assert list(record.to_dict()) == list(article)
+    assert not hasattr(record, "__dict__")
+
+
+def test_article_record_shares_tag_values():
+    """Test that equal tag values are stored once across records."""
+    first = ArticleRecord.from_dict({"url": "a", "tags": {"Ministry": ["Ministry " + "of Health"]}})
+    second = ArticleRecord.from_dict({"url": "b", "tags": {"Ministry": ["Ministry of " + "Health"]}})
+
+    assert first.tags[0][1] is second.tags[0][1]
+
+
+def test_product_record_round_trip():
+    """Test lossless conversion for listing rows and enriched products."""
+    listing_row = {
+        "Name": "Test Whiskey",
+        "Regular Price": "100 ₪",
+        "Discounted Price": "not exist",
+        "Volume": "700 מ\"ל",
+        "internal_link": "https://example.com"
+    }
+    enriched = dict(listing_row, description="Smoky", bottle_image="https://example.com/image.jpg")
+
+    assert ProductRecord.from_dict(listing_row).to_dict() == listing_row
+    assert ProductRecord.from_dict(enriched).to_dict() == enriched
+
+
+def test_product_record_round_trip_missing_and_none_values():
+    """Test that missing keys stay missing and explicit None values are kept."""
+    partial_row = {"Name": "Test Whiskey", "internal_link": None}
+    no_description = {
+        "Name": "Test Whiskey",
+        "Regular Price": "100 ₪",
+        "Discounted Price": "not exist",
+        "Volume": "N/A",
+        "internal_link": "https://example.com",
+        "description": None,
+        "bottle_image": "https://example.com/image.jpg",
+        "sku": "123"
+    }
+
+    assert ProductRecord.from_dict(partial_row).to_dict() == partial_row
+    assert ProductRecord.from_dict(no_description).to_dict() == no_description
+    assert ProductRecord.from_dict({}).to_dict() == {}
+
+
+def test_paneco_data_saver_load_records(tmp_path):
+    """Test that the saved products are loaded as records that convert back to the saved products."""
+    products = [{"Name": "Test Whiskey", "Regular Price": "100 ₪", "description": None}, {"Name": "Other"}]
+    file_name = tmp_path / "products.json"
+    file_name.write_text(json.dumps(products), encoding="utf-8")
+
+    records = PanecoDataSaver(str(file_name), MagicMock()).load_records()
+
+    assert all(isinstance(record, ProductRecord) for record in records)
+    assert [record.to_dict() for record in records] == products
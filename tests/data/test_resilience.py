@@ -0,0 +1,71 @@
+import pytest
+import requests
+from unittest.mock import Mock, MagicMock, patch
+from scrapers.news.news_data.data_fetcher import DataFetcher
+from scrapers.news.news_data.resilience import (
+    Resilience, RetryPolicy, CircuitBreaker, CircuitOpenError, DeadLetterQueue
+)
+
+
+@pytest.fixture
+def dead_letters(tmp_path):
+    return DeadLetterQueue(str(tmp_path / "dead_letters.json"), MagicMock())
+
+
+@pytest.fixture
+def data_fetcher(dead_letters):
+    """creates a DataFetcher with a Resilience layer without backoff delays."""
+    resilience = Resilience(MagicMock(), RetryPolicy(max_attempts=3, base_delay=0),
+                            dead_letters=dead_letters, failure_threshold=3)
+    return DataFetcher(MagicMock(), resilience=resilience)
+
+
+def test_retries_server_errors(data_fetcher):
+    """Test that a 503 is retried until a successful response arrives."""
+    responses = [Mock(status_code=503), Mock(status_code=200, **{"json.return_value": {"results": []}})]
+
+    with patch('requests.get', side_effect=responses) as mock_get:
+        assert data_fetcher.fetch_articles("http://test.com/api") == {"results": []}
+
+    assert mock_get.call_count == 2
+
+
+def test_circuit_opens_and_fails_fast(data_fetcher):
+    """Test that the circuit opens after repeated failures and rejects further requests."""
+    with patch('requests.get', side_effect=requests.RequestException("down")) as mock_get:
+        assert data_fetcher.fetch_articles("http://test.com/api/1") is None
+        assert data_fetcher.fetch_articles("http://test.com/api/2") is None
+
+    assert mock_get.call_count == 3
+
+
+def test_failed_page_goes_to_dead_letters(data_fetcher, dead_letters):
+    """Test that a page that failed after all retries is kept for the next run."""
+    with patch('requests.get', return_value=Mock(status_code=500)):
+        assert data_fetcher.fetch_page("http://test.com/api&skip=10") is None
+
+    assert dead_letters.drain("page") == ["http://test.com/api&skip=10"]
+    assert len(dead_letters) == 0
+
+
+def test_circuit_half_open_after_timeout():
+    """Test that the circuit lets a trial request through after the reset timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_call_raises_circuit_open_error():
+    """Test that an open circuit raises without sending the request."""
+    resilience = Resilience(MagicMock(), failure_threshold=1, reset_timeout=60)
+    resilience.breaker_for("http://test.com/api").record_failure()
+    send = Mock()
+
+    with pytest.raises(CircuitOpenError):
+        resilience.call("http://test.com/api", send)
+
+    send.assert_not_called()
@@ -0,0 +1,54 @@
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+from scrapers.news.news_data.data_fetcher import DataFetcher
+from scrapers.news.news_data.response_cache import ResponseCache
+
+
+def make_response(status_code, body=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = body
+    return response
+
+
+@pytest.fixture
+def data_fetcher(tmp_path):
+    """creates a DataFetcher with an on-disk ResponseCache."""
+    cache = ResponseCache(str(tmp_path / "cache"), MagicMock(), ttl_overrides={"content-pages": 60})
+    return DataFetcher(MagicMock(), cache=cache)
+
+
+def test_conditional_get_returns_cached_body_on_304(data_fetcher):
+    """Test that a stale entry is revalidated with its ETag and reused on 304."""
+    responses = [make_response(200, {"results": [1]}, {"ETag": '"v1"'}), make_response(304)]
+
+    with patch('requests.get', side_effect=responses) as mock_get:
+        assert data_fetcher.fetch_articles("http://test.com/api") == {"results": [1]}
+        assert data_fetcher.fetch_articles("http://test.com/api") == {"results": [1]}
+
+    assert mock_get.call_args.kwargs['headers'] == {"If-None-Match": '"v1"'}
+
+
+def test_fresh_entry_skips_request(data_fetcher):
+    """Test that an entry inside its ttl is served without a request."""
+    with patch('requests.get', return_value=make_response(200, {"content": "Test Content"})) as mock_get:
+        data_fetcher.fetch_article_content("http://test.com/article/test-article")
+        result = data_fetcher.fetch_article_content("http://test.com/article/test-article")
+
+    assert result == {"content": "Test Content"}
+    assert mock_get.call_count == 1
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache = ResponseCache(str(tmp_path / "cache"), MagicMock(), max_bytes=400)
+    body = {"data": "x" * 100}
+
+    cache.store("http://test.com/a", make_response(200, body))
+    cache.store("http://test.com/b", make_response(200, body))
+    cache.get("http://test.com/a")
+    cache.store("http://test.com/c", make_response(200, body))
+
+    assert cache.get("http://test.com/b") is None
+    assert cache.get("http://test.com/a") is not None
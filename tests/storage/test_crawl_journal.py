@@ -0,0 +1,54 @@
+import pytest
+from unittest.mock import MagicMock
+from storage.crawl_journal import CrawlJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return CrawlJournal(str(tmp_path / "crawl.journal"), MagicMock())
+
+
+def test_load_pending_and_done(journal):
+    """Test rebuilding the crawl state from the journal."""
+    journal.start()
+    journal.record_page("page-1", [{"url": "a"}, {"url": "b"}])
+    journal.record_page("page-2", [{"url": "c"}])
+    journal.record_done(["a"], {"a": {"description": "A"}})
+
+    state = journal.load()
+
+    assert list(state.pages) == ["page-1", "page-2"]
+    assert state.done == {"a": {"description": "A"}}
+    assert state.pending("url") == [{"url": "b"}, {"url": "c"}]
+
+
+def test_partially_written_line_is_ignored(journal):
+    """Test that a line torn by a crash does not break loading."""
+    journal.start()
+    journal.record_page("page-1", [{"url": "a"}])
+    with open(journal.file_name, 'a', encoding='utf-8') as f:
+        f.write('{"event": "done", "keys": ["a"')
+
+    assert journal.load().pending("url") == [{"url": "a"}]
+
+
+def test_finish_removes_journal(journal):
+    """Test that a finished crawl leaves nothing to resume."""
+    journal.start()
+    journal.record_page("page-1", [{"url": "a"}])
+    journal.finish()
+
+    assert journal.load().is_empty
+
+
+def test_event_after_torn_line_is_kept(journal):
+    """Test that the first event written after a crash is not glued onto the torn line."""
+    journal.start()
+    journal.record_page("page-1", [{"url": "a"}, {"url": "b"}])
+    with open(journal.file_name, 'a', encoding='utf-8') as f:
+        f.write('{"event": "done", "keys": ["b"')
+
+    reopened = CrawlJournal(journal.file_name, MagicMock())
+    reopened.record_done(["a"])
+
+    assert reopened.load().pending("url") == [{"url": "b"}]
@@ -0,0 +1,67 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from storage.jsonl_storage import JsonlArticleStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """creates a JsonlArticleStorage in a temporary directory."""
+    jsonl_storage = JsonlArticleStorage(str(tmp_path / "articles.jsonl"), MagicMock())
+    yield jsonl_storage
+
+    jsonl_storage.close()
+
+
+def test_add_many_skips_existing_urls(storage):
+    """Test that only new urls are appended."""
+    assert storage.add_many([{"url": "a", "title": "A"}, {"url": "b", "title": "B"}]) == 2
+    assert storage.add_many([{"url": "a", "title": "A"}, {"url": "c", "title": "C"}]) == 1
+
+    assert "c" in storage
+    assert [article["url"] for article in storage.load_all()] == ["a", "b", "c"]
+
+
+def test_index_persists_and_rebuilds(storage, tmp_path):
+    """Test that the index survives reopening and is rebuilt when the data file changed."""
+    storage.add_many([{"url": "a", "title": "A"}])
+    storage.close()
+
+    # simulate a crash after appending, before the index was updated.
+    with open(tmp_path / "articles.jsonl", 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"url": "b", "title": "B"}) + "\n")
+
+    reopened = JsonlArticleStorage(str(tmp_path / "articles.jsonl"), MagicMock())
+    assert reopened.contains("a")
+    assert reopened.contains("b")
+    reopened.close()
+
+
+def test_compact_and_export(storage, tmp_path):
+    """Test compacting duplicated and corrupted lines and exporting to the json layout."""
+    storage.add_many([{"url": "a", "title": "A"}])
+    with open(tmp_path / "articles.jsonl", 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"url": "a", "title": "A"}) + "\n")
+        f.write('{"url": "broken"')
+
+    assert storage.compact() == 1
+
+    storage.export_json(str(tmp_path / "articles.json"))
+    with open(tmp_path / "articles.json", 'r', encoding='utf-8') as f:
+        assert json.load(f) == [{"url": "a", "title": "A"}]
+
+
+def test_torn_write_is_dropped_on_open(storage, tmp_path):
+    """Test that a partially written last line is removed, so the next record is not glued onto it."""
+    storage.add_many([{"url": "u1", "title": "A"}])
+    storage.close()
+
+    # simulate a crash in the middle of an append.
+    with open(tmp_path / "articles.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"url": "u2", "ti')
+
+    reopened = JsonlArticleStorage(str(tmp_path / "articles.jsonl"), MagicMock())
+    assert not reopened.contains("u2")
+    assert reopened.add_many([{"url": "u2", "title": "B"}]) == 1
+    assert reopened.load_all() == [{"url": "u1", "title": "A"}, {"url": "u2", "title": "B"}]
+    reopened.close()
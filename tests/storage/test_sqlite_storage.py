@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from storage.sqlite_storage import SqliteArticleStorage, SqliteProductStorage, SqliteProductHistoryStorage
+
+
+@pytest.fixture
+def article_storage(tmp_path):
+    """creates a SqliteArticleStorage in a temporary directory."""
+    storage = SqliteArticleStorage(str(tmp_path / "articles.db"), MagicMock())
+    yield storage
+
+    storage.close()
+
+
+@pytest.fixture
+def product_storage(tmp_path):
+    """creates a SqliteProductStorage in a temporary directory."""
+    storage = SqliteProductStorage(str(tmp_path / "products.db"), MagicMock())
+    yield storage
+
+    storage.close()
+
+
+def test_wal_mode(article_storage):
+    """Test that the database runs in WAL mode."""
+    assert article_storage.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_add_many_upserts_by_url(article_storage):
+    """Test that saving an existing url updates it instead of duplicating it."""
+    article_storage.add_many([{"url": "a", "title": "Old", "publish_date": "01.01.2024"}])
+    article_storage.add_many([{"url": "a", "title": "New", "publish_date": "01.01.2024"},
+                              {"url": "b", "title": "B", "publish_date": "05.02.2024"}])
+
+    assert "a" in article_storage
+    assert [article["title"] for article in article_storage.load_all()] == ["New", "B"]
+
+
+def test_published_between(article_storage):
+    """Test querying articles by publish date."""
+    article_storage.add_many([{"url": "a", "publish_date": "01.01.2024"},
+                              {"url": "b", "publish_date": "05.02.2024"},
+                              {"url": "c", "publish_date": "20.03.2024"}])
+
+    articles = article_storage.published_between(datetime(2024, 1, 15), datetime(2024, 3, 20))
+    assert [article["url"] for article in articles] == ["c", "b"]
+
+
+def test_priced_between(product_storage):
+    """Test querying products by their effective price."""
+    product_storage.add_many([
+        {"internal_link": "a", "Regular Price": "1,200.00 ₪", "Discounted Price": "not exist"},
+        {"internal_link": "b", "Regular Price": "300 ₪", "Discounted Price": "250 ₪"},
+        {"internal_link": None, "Regular Price": "10 ₪"},
+    ])
+
+    assert [product["internal_link"] for product in product_storage.priced_between(0, 2000)] == ["b", "a"]
+
+
+def test_history_writes_only_changes(tmp_path):
+    """Test that snapshots write changed products only and record new, price and removed changes."""
+    storage = SqliteProductHistoryStorage(str(tmp_path / "history.db"), MagicMock())
+    storage.record_snapshot([
+        {"internal_link": "a", "Regular Price": "100 ₪", "Discounted Price": "not exist"},
+        {"internal_link": "b", "Regular Price": "50 ₪", "Discounted Price": "not exist"}
+    ], now=datetime(2024, 1, 1))
+
+    written = storage.record_snapshot([
+        {"internal_link": "a", "Regular Price": "100 ₪", "Discounted Price": "80 ₪"}
+    ], now=datetime(2024, 1, 2))
+
+    assert written == 1
+    assert [product["internal_link"] for product in storage.load_all()] == ["a"]
+    assert [(change["change"], change["price"], change["changed_at"]) for change in storage.price_history("a")] == [
+        ("new", 100.0, "2024-01-01T00:00:00"), ("price", 80.0, "2024-01-02T00:00:00")
+    ]
+    assert [change["change"] for change in storage.price_history("b")] == ["new", "removed"]
+
+    assert storage.record_snapshot([
+        {"internal_link": "a", "Regular Price": "100 ₪", "Discounted Price": "80 ₪"}
+    ], now=datetime(2024, 1, 3)) == 0
+    assert len(storage.price_history("a")) == 2
+    storage.close()
@@ -0,0 +1,202 @@
+import atexit
+import requests
+import trio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from scrapers import scraper_interface
+from scrapers.scraper_interface import RequestsScraper, SeleniumScraper
+from scrapers.driver_pool import BrowserPool
+from scrapers.browser_profile import BrowserProfile
+
+
+def test_requests_scraper_get_title():
+    """Test extracting the page title without a browser."""
+    session = MagicMock()
+    session.get.return_value.text = "<html><head><title> Gov News </title></head></html>"
+
+    scraper = RequestsScraper("http://test.com", session=session)
+    assert scraper.get_title() == "Gov News"
+
+
+def test_requests_scraper_get_title_request_failed():
+    """Test the title fallback when the request fails."""
+    session = MagicMock()
+    session.get.side_effect = requests.RequestException("Test Exception")
+
+    scraper = RequestsScraper("http://test.com", session=session)
+    assert scraper.get_title() == "No title found"
+
+
+def test_requests_scraper_close_driver():
+    """Test closing the http session."""
+    session = MagicMock()
+
+    scraper = RequestsScraper("http://test.com", session=session)
+    scraper.close_driver()
+    session.close.assert_called_once()
+
+
+def test_performance_profile_options():
+    """Test that the performance profile runs headless with the eager page load strategy."""
+    options = BrowserProfile.performance().options()
+
+    assert "--headless=new" in options.arguments
+    assert "--start-maximized" not in options.arguments
+    assert options.page_load_strategy == "eager"
+
+
+def paused_request(request_id, url):
+    return MagicMock(request_id=request_id, request=MagicMock(url=url))
+
+
+def fake_bidi_connection(devtools, events):
+    """returns a driver.bidi_connection replacement whose tab pauses the given requests."""
+    @asynccontextmanager
+    async def bidi_connection():
+        sender, receiver = trio.open_memory_channel(len(events))
+        for event in events:
+            sender.send_nowait(event)
+        sender.close()
+
+        session = MagicMock(listen=MagicMock(return_value=receiver), execute=AsyncMock())
+        yield MagicMock(session=session, devtools=devtools)
+
+    return bidi_connection
+
+
+def test_performance_profile_allowlist():
+    """Test that third-party images stay blocked while the allowed product images load."""
+    profile = BrowserProfile.performance(allowed_urls=["https://shop.com/media/catalog/product/*.jpg"])
+    devtools = MagicMock()
+    driver = MagicMock(resource_blocker=None)
+    driver.bidi_connection = fake_bidi_connection(devtools, [
+        paused_request("1", "https://ads.example.com/banner.jpg"),
+        paused_request("2", "https://shop.com/media/catalog/product/bottle.jpg"),
+    ])
+
+    profile.apply(driver)
+    driver.resource_blocker._thread.join()
+
+    devtools.network.ResourceType.assert_any_call("Image")
+    devtools.fetch.fail_request.assert_called_once_with(
+        request_id="1", error_reason=devtools.network.ErrorReason.BLOCKED_BY_CLIENT
+    )
+    devtools.fetch.continue_request.assert_called_once_with(request_id="2")
+    blocked_urls = driver.execute_cdp_cmd.call_args_list[-1].args[1]["urls"]
+    assert "*google-analytics.com*" in blocked_urls
+
+
+def test_browser_pool_resets_and_recycles():
+    """Test that released browsers are reset to a fresh tab and recycled after recycle_after pages."""
+    drivers = []
+
+    def create_driver():
+        drivers.append(MagicMock(window_handles=["old"]))
+        return drivers[-1]
+
+    prepare_driver = MagicMock()
+    pool = BrowserPool(create_driver, size=1, logger=MagicMock(), recycle_after=2, prepare_driver=prepare_driver)
+
+    with pool.lease() as driver:
+        driver.get("http://test.com/1")
+    driver.execute_cdp_cmd.assert_called_with("Network.clearBrowserCookies", {})
+    driver.switch_to.new_window.assert_called_once_with("tab")
+    driver.close.assert_called_once()
+    prepare_driver.assert_called_once_with(driver)
+
+    with pool.lease() as same_driver:
+        assert same_driver is driver
+        driver.get("http://test.com/2")
+    assert len(drivers) == 2
+    driver.quit.assert_called_once()
+    assert pool.acquire() is drivers[1]
+
+
+def test_browser_pool_counts_pages_of_a_long_lease():
+    """Test that a browser leased for a whole crawl moves to a fresh tab every recycle_after pages."""
+    navigate = MagicMock()
+    pool = BrowserPool(lambda: MagicMock(window_handles=["old"], get=navigate), size=1, logger=MagicMock(),
+                       recycle_after=2)
+    driver = pool.acquire()
+
+    for page in range(5):
+        driver.get(f"http://test.com/{page}")
+
+    assert pool.pages_of(driver) == 5
+    assert driver.switch_to.new_window.call_count == 2
+    assert navigate.call_count == 5
+
+
+def test_browser_pool_gives_slot_back_when_recycling_fails():
+    """Test that a browser that cannot be launched again does not abort the release."""
+    driver = MagicMock(window_handles=["old"])
+    pool = BrowserPool(MagicMock(side_effect=[driver, Exception("chrome crashed"), driver]), size=1,
+                       logger=MagicMock(), recycle_after=1)
+
+    with pool.lease():
+        driver.get("http://test.com")
+
+    driver.quit.assert_called_once()
+    assert pool.acquire() is driver
+
+
+def test_browser_pool_replaces_unhealthy_browser():
+    """Test that a browser that does not respond is replaced when it is leased."""
+    broken = MagicMock()
+    type(broken).window_handles = property(lambda self: (_ for _ in ()).throw(Exception("crashed")))
+    healthy = MagicMock()
+    pool = BrowserPool(MagicMock(side_effect=[broken, healthy]), size=1, logger=MagicMock())
+
+    assert pool.acquire() is healthy
+    broken.quit.assert_called_once()
+
+
+def test_selenium_scraper_leases_from_browser_pool():
+    """Test that scrapers share the browsers of the pool and return them on close_driver."""
+    class PooledScraper(SeleniumScraper):
+        pass
+
+    driver = MagicMock(window_handles=["old"])
+    with patch.object(SeleniumScraper, "launch_driver", return_value=driver) as launch_driver:
+        pool = PooledScraper.use_browser_pool(size=1)
+
+        for _ in range(2):
+            scraper = PooledScraper("http://test.com")
+            assert scraper.driver is driver
+            scraper.close_driver()
+
+    launch_driver.assert_called_once()
+    driver.quit.assert_not_called()
+    atexit.unregister(pool.close)
+    pool.close()
+
+
+def test_use_browser_pool_closes_previous_pool():
+    """Test that switching to a new pool quits the browsers of the previous one."""
+    class PooledScraper(SeleniumScraper):
+        pass
+
+    drivers = [MagicMock(window_handles=["old"]), MagicMock(window_handles=["old"])]
+    with patch.object(SeleniumScraper, "launch_driver", side_effect=drivers):
+        first_pool = PooledScraper.use_browser_pool(size=1)
+        second_pool = PooledScraper.use_browser_pool(size=1)
+
+    drivers[0].quit.assert_called_once()
+    assert PooledScraper.BROWSER_POOL is second_pool
+    assert SeleniumScraper.BROWSER_POOL is None
+    atexit.unregister(second_pool.close)
+    second_pool.close()
+    assert first_pool is not second_pool
+
+
+def test_chromedriver_path_is_resolved_once(monkeypatch):
+    """Test that the pinned chromedriver path is used without webdriver_manager and cached."""
+    monkeypatch.setattr(scraper_interface, "_chromedriver_path", None)
+    monkeypatch.setenv("CHROMEDRIVER_PATH", "/opt/chromedriver")
+
+    with patch.object(scraper_interface, "ChromeDriverManager") as manager:
+        assert scraper_interface.chromedriver_path() == "/opt/chromedriver"
+        monkeypatch.delenv("CHROMEDRIVER_PATH")
+        assert scraper_interface.chromedriver_path() == "/opt/chromedriver"
+
+    manager.assert_not_called()
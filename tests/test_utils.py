@@ -0,0 +1,40 @@
+from utils import html_to_text, parse_html, HtmlToTextParser
+
+
+def test_html_to_text_decodes_entities_and_drops_scripts():
+    """Test entity decoding and removal of script/style bodies."""
+    html = "<p>Tom &amp; Jerry&nbsp;&quot;show&quot;</p><script>var x = 1;</script><style>p {}</style>"
+    assert html_to_text(html) == 'Tom & Jerry "show"'
+
+
+def test_html_to_text_block_newlines():
+    """Test that block elements and <br> start new lines and whitespace is normalised."""
+    html = "<div>first\n   line<br/>second</div><ul><li>one</li><li> two </li></ul>"
+    assert html_to_text(html) == "first line\nsecond\none\ntwo"
+
+
+def test_html_to_text_matches_parser():
+    """Test that the regex conversion gives the same text as HtmlToTextParser on tricky markup."""
+    html = ("<DIV class='x'>a &lt;p&gt; b<!-- <p>hidden</p> --><table><tr><th>k</th><td>v</td></tr></table>"
+            "<param name=p>c<noscript><p>no</p></noscript>d<H2>title</H2>x&#10;y<a title=\"x>y\">link</a> text"
+            "<script type='a>b'>unclosed <p>")
+    parser = HtmlToTextParser()
+    parser.feed(html)
+
+    assert html_to_text(html) == parser.get_text() == "a <p> b\nk v\ncd\ntitle\nx ylink text"
+    assert html_to_text('<a title="x>y">link</a> text') == "link text"
+
+
+def test_parse_html_select():
+    """Test descendant and compound selectors on the parsed tree, including unclosed tags."""
+    html = ('<ul><li class="item product"><strong class="product-item-name"><a href="/a">A &amp; B</a></strong>'
+            '<img src="a.png"><span class="unit">700ml</span></li><li class="item product"><p>no name</li></ul>'
+            '<div id="description"><p>first</p><p>second</p></div>')
+    document = parse_html(html)
+
+    products = document.select("li.item.product")
+    assert len(products) == 2
+    assert products[0].select_one("strong.product-item-name a").get("href") == "/a"
+    assert products[0].select_one("strong.product-item-name a").text() == "A & B"
+    assert products[1].select_one("strong.product-item-name a") is None
+    assert document.select_one("#description").text() == "first\nsecond"
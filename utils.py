@@ -1,9 +1,256 @@
 import re
+from datetime import datetime
+from html import unescape
+from html.parser import HTMLParser
+
+DATE_FORMATS = ("%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S")
+
+
+class HtmlToTextParser(HTMLParser):
+    """
+    single pass html to text converter.
+
+    entities are decoded by HTMLParser (convert_charrefs), the content of script/style tags is dropped,
+    block elements start a new line and runs of whitespace inside a line are collapsed to one space.
+    """
+    BLOCK_TAGS = {
+        "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption", "figure", "footer",
+        "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+        "section", "table", "tr", "ul"
+    }
+    SKIP_TAGS = {"script", "style", "noscript", "template", "head"}
+    CELL_TAGS = {"td", "th"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self.current_line = []
+        self.skip_depth = 0
+
+    def new_line(self):
+        line = " ".join("".join(self.current_line).split())
+        if line:
+            self.lines.append(line)
+        self.current_line = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif self.skip_depth:
+            # markup inside a dropped element (e.g. <noscript>) does not break lines either.
+            pass
+        elif tag == "br" or tag in self.BLOCK_TAGS:
+            self.new_line()
+        elif tag in self.CELL_TAGS:
+            self.current_line.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag in self.BLOCK_TAGS and not self.skip_depth:
+            self.new_line()
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.current_line.append(data)
+
+    def get_text(self):
+        self.close()
+        self.new_line()
+        return "\n".join(self.lines)
+
+
+# html_to_text runs on every article, so it tokenizes with a single compiled regex instead of HTMLParser callbacks.
+# quoted attribute values are matched as a whole, so a ">" inside them does not end the tag. like HTMLParser,
+# a quote only starts a value right after "=", and a tag with an unterminated value is kept as text.
+TAG_ATTRIBUTES = r'(?:[^>=]|=\s*"[^"]*"|=\s*\'[^\']*\'|=(?!\s*["\']))*'
+HTML_TOKEN_RE = re.compile(
+    r'<!--.*?(?:-->|$)'
+    r'|<(?P<skipped>%s)(?=[\s/>])%s>.*?(?:</(?P=skipped)\s*>|$)' % ("|".join(HtmlToTextParser.SKIP_TAGS),
+                                                                  TAG_ATTRIBUTES) +
+    r'|<(?P<end>/?)(?P<tag>[a-zA-Z][^\s/>\x00]*)%s>' % TAG_ATTRIBUTES +
+    r'|<[!?][^>]*>',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def replace_html_token(match):
+    """a NUL marks the line break of a block tag, a newline in the html is only whitespace."""
+    tag = match.group("tag")
+    if tag is None:
+        # comment, dropped element or declaration.
+        return ""
+
+    tag = tag.lower()
+    if tag in HtmlToTextParser.BLOCK_TAGS or (tag == "br" and not match.group("end")):
+        return "\x00"
+    if tag in HtmlToTextParser.CELL_TAGS and not match.group("end"):
+        return " "
+    return ""
+
+
+def html_to_text(html_content):
+    """
+    converts html to plain text with decoded entities and one line per block element,
+    gives the same text as HtmlToTextParser in a single regex pass.
+    """
+    text = HTML_TOKEN_RE.sub(replace_html_token, html_content)
+
+    # entities are decoded after the tags are gone, so a decoded "<" is kept as text.
+    lines = (" ".join(line.split()) for line in unescape(text).split("\x00"))
+    return "\n".join(line for line in lines if line)
+
+
+class HtmlNode:
+    """
+    element of the lightweight tree built by parse_html, supports simple css selectors:
+    descendant chains of compound selectors like "li.item.product", "strong.product-item-name a" or "#description".
+    """
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.children = []
+        self.parent = parent
+
+    def get(self, name, default=None):
+        value = self.attrs.get(name)
+        return default if value is None else value
+
+    @property
+    def classes(self):
+        return self.get("class", "").split()
+
+    def iter(self):
+        """yields all descendant elements in document order."""
+        for child in self.children:
+            if isinstance(child, HtmlNode):
+                yield child
+                yield from child.iter()
+
+    def matches(self, compound):
+        """checks a single compound selector: optional tag, classes and id."""
+        parts = re.findall(r'([#.]?)([\w-]+)', compound)
+        node_classes = self.classes
+        for prefix, name in parts:
+            if (prefix == "" and self.tag != name) or (prefix == "." and name not in node_classes) or \
+                    (prefix == "#" and self.get("id") != name):
+                return False
+
+        return True
+
+    def select(self, selector):
+        """returns the descendant elements that match a css selector, in document order."""
+        compounds = selector.split()
+        found = []
+        for node in self.iter():
+            if not node.matches(compounds[-1]):
+                continue
+
+            # the remaining compounds must match ancestors, from the closest one up.
+            remaining = compounds[:-1]
+            ancestor = node.parent
+            while remaining and ancestor is not None and ancestor is not self:
+                if ancestor.matches(remaining[-1]):
+                    remaining.pop()
+                ancestor = ancestor.parent
+
+            if not remaining:
+                found.append(node)
+
+        return found
+
+    def select_one(self, selector):
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    def text(self):
+        """returns the text of the element the same way html_to_text does."""
+        parser = HtmlToTextParser()
+        self._feed_events(parser)
+        parser.new_line()
+        return "\n".join(parser.lines)
+
+    def _feed_events(self, parser):
+        parser.handle_starttag(self.tag, [])
+        for child in self.children:
+            if isinstance(child, HtmlNode):
+                child._feed_events(parser)
+            else:
+                parser.handle_data(child)
+        parser.handle_endtag(self.tag)
+
+
+class HtmlTreeBuilder(HTMLParser):
+    """builds an HtmlNode tree, tolerating unclosed and stray end tags."""
+    VOID_TAGS = {
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlNode("document")
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = HtmlNode(tag, attrs, parent=self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in self.VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.stack[-1].children.append(HtmlNode(tag, attrs, parent=self.stack[-1]))
+
+    def handle_endtag(self, tag):
+        # close up to the matching open element, ignore end tags without one.
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def parse_html(html_content):
+    """
+    parses html into a tree of HtmlNode elements and returns its root.
+    """
+    builder = HtmlTreeBuilder()
+    builder.feed(html_content)
+    builder.close()
+    return builder.root
 
 
 def remove_html_tags(html_content):
     """
     Removes HTML tags from the given content and returns the plain text.
     """
-    clean_text = re.sub(r'<[^>]+>', '', html_content)  # Regular expression to remove HTML tags
-    return clean_text
+    return html_to_text(html_content)
+
+
+
+def parse_date(value):
+    """
+    parses a date string in one of DATE_FORMATS, returns None if the format is unknown.
+    """
+    if not value:
+        return None
+
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), date_format)
+
+        except ValueError:
+            continue
+
+    return None
+
+
+def parse_price(value):
+    """
+    parses a price string like "1,299.90 ₪" to a float, returns None if there is no number in it.
+    """
+    match = re.search(r'\d[\d,]*(?:\.\d+)?', value or "")
+    return float(match.group().replace(",", "")) if match else None